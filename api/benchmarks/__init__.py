@@ -0,0 +1,4 @@
+# api/benchmarks/__init__.py
+# Performance benchmarks for the matching, privacy and extraction hot paths.
+# Run from api/: `python -m benchmarks run --output benchmarks/baselines/<name>.json`, then
+# `python -m benchmarks compare <baseline.json> <current.json>` (see benchmarks/suite.py).
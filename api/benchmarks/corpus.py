@@ -0,0 +1,265 @@
+# api/benchmarks/corpus.py
+# Synthetic resumes and job descriptions for the benchmarks. Everything is generated from a
+# seeded random.Random, so the same seed always gives the same text and byte-identical PDFs
+# (DOCX archives carry a timestamp, but their content is the same).
+# The vocabulary lives here rather than in data/, so baselines do not move when the skill or
+# title ontologies change.
+# Write the corpus out for inspection with `python -m benchmarks corpus --output <dir>` from api/.
+import io
+import os
+import random
+from collections import namedtuple
+
+from docx import Document
+
+DEFAULT_SEED = 1729
+CASES = ("short", "long", "adversarial")
+
+# Shaped like a Presidio RecognizerResult, for feeding privacy_service without the analyzer.
+PiiResult = namedtuple("PiiResult", ["start", "end", "entity_type"])
+
+FIRST_NAMES = ["Alice", "Rahul", "Mei", "Carlos", "Fatima", "Jonas", "Priya", "Kwame", "Elena", "Tomasz"]
+LAST_NAMES = ["Johnson", "Sharma", "Chen", "Garcia", "Okafor", "Lindqvist", "Iyer", "Mensah", "Rossi", "Nowak"]
+CITIES = ["San Francisco, CA", "Austin, TX", "New York, NY", "Seattle, WA", "Bangalore, India", "Berlin, Germany"]
+COMPANIES = ["Tech Solutions Inc.", "Northwind Analytics", "Globex Corporation", "Initech", "Umbrella Health",
+             "Stark Logistics", "Wayne Financial", "Acme Cloud", "Hooli", "Vandelay Industries"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Backend Engineer", "Data Scientist",
+          "Machine Learning Engineer", "DevOps Engineer", "Frontend Developer", "Lead Data Engineer",
+          "Full Stack Developer", "Site Reliability Engineer"]
+SKILLS = ["Python", "Java", "Go", "TypeScript", "React", "Node.js", "Django", "FastAPI", "Flask", "Spring Boot",
+          "AWS", "GCP", "Azure", "Docker", "Kubernetes", "Terraform", "PostgreSQL", "MySQL", "MongoDB", "Redis",
+          "Kafka", "Spark", "Airflow", "TensorFlow", "PyTorch", "scikit-learn", "pandas", "SQL", "GraphQL",
+          "REST APIs", "CI/CD", "Jenkins", "GitHub Actions", "Linux", "Microservices", "Elasticsearch"]
+VERBS = ["Designed", "Built", "Led", "Migrated", "Optimized", "Automated", "Scaled", "Refactored", "Launched",
+         "Maintained"]
+OBJECTS = ["a payments API", "the data ingestion pipeline", "an internal analytics dashboard",
+           "the recommendation service", "a real-time event processing platform", "the CI/CD pipeline",
+           "a customer-facing React application", "the search backend", "a feature store",
+           "the authentication service"]
+OUTCOMES = ["reducing latency by {n}%", "cutting infrastructure costs by {n}%", "serving {n} million users",
+            "improving throughput {n}x", "raising test coverage to {n}%", "saving {n} engineering hours a month"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+DEGREES = ["B.S. in Computer Science", "M.S. in Data Science", "B.Tech in Information Technology",
+           "M.Eng in Software Engineering"]
+UNIVERSITIES = ["State University", "Institute of Technology", "University of Washington", "TU Berlin"]
+
+
+def _bullet(rng: random.Random, skills: list[str]) -> str:
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(2, 90))
+    tools = " and ".join(rng.sample(skills, 2))
+    return f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {tools}, {outcome}."
+
+
+def _contact(rng: random.Random) -> tuple[str, list[str]]:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(" ", ".")
+    lines = [
+        name,
+        f"Email: {handle}@example.com | Phone: ({rng.randint(200, 989)}) {rng.randint(200, 989)}-{rng.randint(1000, 9999)}",
+        f"Location: {rng.choice(CITIES)} | LinkedIn: linkedin.com/in/{handle.replace('.', '')}",
+    ]
+    return name, lines
+
+
+def make_resume(rng: random.Random, roles: int = 2, bullets_per_role: int = 3, skill_count: int = 8) -> str:
+    """
+    A plain-text resume: contact details (PII for the privacy benchmarks), summary, dated roles
+    (for experience extraction), skills and education.
+    """
+    skills = rng.sample(SKILLS, min(skill_count, len(SKILLS)))
+    _, lines = _contact(rng)
+    title = rng.choice(TITLES)
+    lines += ["", "Summary",
+              f"{title} with {roles * 2}+ years of experience building production systems with "
+              f"{', '.join(skills[:4])}."]
+
+    lines += ["", "Experience"]
+    year = 2024
+    for index in range(roles):
+        start_year = year - rng.randint(1, 3)
+        end = "Present" if index == 0 else f"{rng.choice(MONTHS)} {year}"
+        lines.append(f"{rng.choice(TITLES)} | {rng.choice(COMPANIES)} | {rng.choice(MONTHS)} {start_year} - {end}")
+        lines += [_bullet(rng, skills) for _ in range(bullets_per_role)]
+        year = start_year
+
+    lines += ["", "Skills", ", ".join(skills),
+              "", "Education", f"{rng.choice(DEGREES)}, {rng.choice(UNIVERSITIES)}, {year - 4} - {year}"]
+    return "\n".join(lines) + "\n"
+
+
+def make_jd(rng: random.Random, requirements: int = 6, skill_count: int = 8) -> str:
+    """
+    A job description with a title, a stated experience requirement and required skills.
+    """
+    skills = rng.sample(SKILLS, min(skill_count, len(SKILLS)))
+    title = rng.choice(TITLES)
+    lines = [
+        f"{title} - {rng.choice(COMPANIES)}",
+        f"We are looking for a {title} to join our platform team in {rng.choice(CITIES)}.",
+        "",
+        "Responsibilities",
+    ]
+    lines += [_bullet(rng, skills) for _ in range(requirements)]
+    lines += ["", "Requirements", f"- {rng.randint(2, 10)}+ years of experience in software development."]
+    lines += [f"- Strong proficiency in {skill}." for skill in skills]
+    lines += ["", "Nice to have", f"- Experience with {', '.join(rng.sample(SKILLS, 3))}."]
+    return "\n".join(lines) + "\n"
+
+
+def make_adversarial_resume(rng: random.Random) -> str:
+    """
+    A resume built to stress the regexes and tokenizers: a long unbroken token, runs of date-like
+    numbers, placeholder look-alikes, dense PII, punctuation storms and non-Latin text.
+    """
+    parts = [make_resume(rng, roles=3)]
+    parts.append("x" * 20000)
+    parts.append(" ".join(f"{year}-{year + 1} {MONTHS[year % 12]} {year} - Present" for year in range(1950, 2950)))
+    parts.append(" ".join(["__PERSON_0__", "__", "____", "__A_B_C_", "__EMAIL_ADDRESS_", "_"] * 400))
+    parts.append(" ".join(
+        f"{name.lower()}{index}@example.com +1-555-{index % 1000:03d}-{index:04d}"
+        for index, name in enumerate(FIRST_NAMES * 40)
+    ))
+    parts.append("!?.,;:-()[]{}" * 1000)
+    parts.append("Développeur Python à Zürich, naïve façade; 软件工程师; エンジニア; инженер-программист. " * 200)
+    parts.append(" ".join(str(rng.randint(0, 10 ** 12)) for _ in range(3000)))
+    return "\n\n".join(parts) + "\n"
+
+
+def make_adversarial_jd(rng: random.Random) -> str:
+    """
+    A keyword-stuffed job description with an absurd experience requirement.
+    """
+    jd = make_jd(rng, requirements=10, skill_count=12)
+    stuffing = " ".join(rng.choice(SKILLS) for _ in range(5000))
+    return f"{jd}\nRequirements: 99+ years of experience.\n{stuffing}\n"
+
+
+def make_pii_document(entity_count: int, seed: int = 5) -> tuple[str, list]:
+    """
+    A resume-like document with entity_count contacts and their analyzer results; every fourth
+    email also has a URL result nested inside it.
+    """
+    rng = random.Random(seed)
+    parts, results, position = [], [], 0
+    for i in range(entity_count):
+        filler = "worked on distributed systems at scale. "
+        email = f"person{i}@example{rng.randint(0, 999)}.com"
+        parts.extend([filler, email, " "])
+        start = position + len(filler)
+        results.append(PiiResult(start, start + len(email), "EMAIL_ADDRESS"))
+        if i % 4 == 0:
+            results.append(PiiResult(start + email.index("@") + 1, start + len(email), "URL"))
+        position = start + len(email) + 1
+    return "".join(parts), results
+
+
+def make_pathological_experience_text() -> str:
+    """
+    Input that a backtracking experience scan would take quadratic time on: a long run of bare
+    years, a wall of blank lines and many education headings each followed by a date range.
+    """
+    return ("2019 " * 40000) + ("\n" * 20000) + ("education\n2010 - 2012 " * 2000)
+
+
+def build_corpus(seed: int = DEFAULT_SEED) -> dict:
+    """
+    Returns {case: {"resume": text, "jd": text}} for every case in CASES.
+    """
+    rng = random.Random(seed)
+    return {
+        "short": {"resume": make_resume(rng, roles=1, bullets_per_role=3), "jd": make_jd(rng, requirements=4)},
+        "long": {
+            "resume": make_resume(rng, roles=12, bullets_per_role=12, skill_count=20),
+            "jd": make_jd(rng, requirements=25, skill_count=14),
+        },
+        "adversarial": {"resume": make_adversarial_resume(rng), "jd": make_adversarial_jd(rng)},
+    }
+
+
+def make_resume_variants(count: int, seed: int = DEFAULT_SEED) -> list[str]:
+    """
+    `count` distinct short-to-medium resumes, so end-to-end runs do not just hit caches.
+    """
+    rng = random.Random(seed + 1)
+    return [make_resume(rng, roles=rng.randint(1, 5), bullets_per_role=rng.randint(2, 5)) for _ in range(count)]
+
+
+def _pdf_escape(line: str) -> str:
+    # The built-in Helvetica font only covers Latin-1 (WinAnsi); anything else becomes "?".
+    line = line.encode("latin-1", errors="replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap(text: str, width: int) -> list[str]:
+    lines = []
+    for line in text.splitlines():
+        lines += [line[i:i + width] for i in range(0, len(line), width)] or [""]
+    return lines
+
+
+def make_pdf(text: str, lines_per_page: int = 55, width: int = 95) -> bytes:
+    """
+    A minimal text-only PDF (one Helvetica content stream per page), written by hand so the
+    benchmarks need nothing beyond PyPDF2 to read it back.
+    """
+    lines = _wrap(text, width)
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then a (page, content) pair per page.
+    objects = {3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"}
+    page_ids = []
+    for index, page_lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * index, 5 + 2 * index
+        page_ids.append(page_id)
+        body = "BT /F1 10 Tf 13 TL 50 780 Td\n" + "".join(f"({_pdf_escape(line)}) Tj T*\n" for line in page_lines) + "ET"
+        stream = body.encode("latin-1")
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        objects[page_id] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+    objects[1] = b"<< /Type /Catalog /Pages 2 0 R >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = out.tell()
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (object_id, objects[object_id]))
+    xref_offset = out.tell()
+    count = max(objects) + 1
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % count)
+    for object_id in range(1, count):
+        out.write(b"%010d 00000 n \n" % offsets[object_id])
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (count, xref_offset))
+    return out.getvalue()
+
+
+def make_docx(text: str) -> bytes:
+    """
+    A DOCX with one paragraph per line of text.
+    """
+    document = Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def write_corpus(directory: str, seed: int = DEFAULT_SEED) -> list[str]:
+    """
+    Writes every case as .txt, .pdf and .docx files (resume and JD) and returns their paths.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for case, documents in build_corpus(seed).items():
+        for kind, text in documents.items():
+            stem = os.path.join(directory, f"{case}_{kind}")
+            for extension, data in ((".txt", text.encode("utf-8")), (".pdf", make_pdf(text)), (".docx", make_docx(text))):
+                with open(stem + extension, "wb") as f:
+                    f.write(data)
+                paths.append(stem + extension)
+    return paths
@@ -0,0 +1,109 @@
+# api/benchmarks/stub_gemini.py
+# A local stand-in for the Gemini generateContent and streamGenerateContent endpoints, shared by
+# tests/test_llm_client.py and the end-to-end benchmarks. Point an LLMClientManager at base_url.
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubGemini:
+    """
+    A stand-in for the Gemini API. Each request takes the next scripted status code (200 once
+    the script runs out) after `delay_s`, and the stub records concurrency and client ports.
+    Streaming requests get `stream_chunks` as server-sent events, `chunk_delay_s` apart; the
+    stream is cut off after `fail_stream_after` chunks when that is set.
+    """
+
+    def __init__(self, statuses=(), delay_s: float = 0.0, stream_chunks=(), chunk_delay_s: float = 0.0,
+                 fail_stream_after: int = None):
+        self.statuses = list(statuses)
+        self.delay_s = delay_s
+        self.stream_chunks = list(stream_chunks)
+        self.chunk_delay_s = chunk_delay_s
+        self.fail_stream_after = fail_stream_after
+        self.requests = 0
+        self.active = 0
+        self.peak_active = 0
+        self.client_ports = set()
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with stub.lock:
+                    stub.requests += 1
+                    stub.active += 1
+                    stub.peak_active = max(stub.peak_active, stub.active)
+                    stub.client_ports.add(self.client_address[1])
+                    status = stub.statuses.pop(0) if stub.statuses else 200
+                time.sleep(stub.delay_s)
+                if status == 200 and "streamGenerateContent" in self.path:
+                    with stub.lock:
+                        stub.active -= 1
+                    self._stream()
+                    return
+                if status == 200:
+                    body = {"candidates": [{"content": {"role": "model", "parts": [{"text": "optimized __PERSON_0__"}]}}]}
+                else:
+                    body = {"error": {"code": status, "message": "stub failure", "status": "UNAVAILABLE"}}
+                payload = json.dumps(body).encode()
+                with stub.lock:
+                    stub.active -= 1
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def _stream(self):
+                events = [
+                    b"data: " + json.dumps({"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}).encode() + b"\r\n\r\n"
+                    for text in stub.stream_chunks
+                ]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                if stub.fail_stream_after is None:
+                    self.send_header("Content-Length", str(sum(len(event) for event in events)))
+                else:
+                    # Promise more than is sent, then hang up: the client sees a broken stream.
+                    events = events[:stub.fail_stream_after]
+                    self.send_header("Content-Length", str(sum(len(event) for event in events) + 1000))
+                self.end_headers()
+                try:
+                    for event in events:
+                        self.wfile.write(event)
+                        self.wfile.flush()
+                        time.sleep(stub.chunk_delay_s)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                if stub.fail_stream_after is not None:
+                    self.close_connection = True
+
+        return Handler
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
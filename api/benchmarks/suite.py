@@ -0,0 +1,494 @@
+# api/benchmarks/suite.py
+# Times the matching, privacy and extraction hot paths on the synthetic corpus (benchmarks/corpus.py)
+# and measures /analyze/ and /optimize/ throughput in-process, with Gemini replaced by a local stub.
+#
+# Each micro-benchmark is warmed up once, then timed `repeat` times; fast operations are looped
+# until one sample takes at least `min_sample_ms`. The fastest sample is the value compared (as
+# with timeit, slower samples measure interference from the rest of the machine). Operations that go through the embedding cache
+# clear it before every call, so they measure the model rather than the cache. Results are JSON:
+#   {"schema": 1, "settings": {...}, "environment": {...},
+#    "results": {name: {"value": ..., "unit": "ms" | "req/s", "better": "lower" | "higher", ...}}}
+# A benchmark whose model could not be loaded is recorded as {"skipped": reason}, one that raised
+# as {"error": message}. Neither has a timing to compare, but a benchmark that had one in the
+# baseline and now errors, is skipped or is gone fails the comparison.
+#
+# From api/:
+#   python -m benchmarks run --output benchmarks/baselines/<name>.json [--quick] [--only 'match.*']
+#   python -m benchmarks compare <baseline.json> <current.json> [--threshold 0.2]
+# compare exits with status 1 when any benchmark is slower than its baseline by more than the
+# threshold, or has no result where the baseline had one.
+import argparse
+import asyncio
+import fnmatch
+import functools
+import gc
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from benchmarks import corpus
+
+SCHEMA_VERSION = 1
+# Baselines are only comparable with runs on the same machine; even there, shared CPUs make
+# timings wobble by 10% or so between runs.
+DEFAULT_THRESHOLD = 0.20
+# Timing differences below this many milliseconds are noise, whatever their relative size.
+DEFAULT_MIN_DELTA_MS = 0.05
+
+
+@dataclass
+class Benchmark:
+    """
+    One timed operation. `setup` runs before every call and is not timed.
+    """
+    name: str
+    run: callable
+    setup: callable = None
+    requires: tuple = ()
+    chars: int = 0
+
+
+def _configure_caches():
+    # Persistent caches would turn repeated runs into disk reads; the LLM cache would turn every
+    # optimization after the first into a cache hit. Set before the services are imported.
+    os.environ["EMBEDDING_CACHE_DIR"] = ""
+    os.environ["EXTRACTION_CACHE_DIR"] = ""
+    os.environ["LLM_CACHE_SIZE"] = "0"
+
+
+@functools.lru_cache(maxsize=None)
+def _unavailable(requirement: str) -> str:
+    """
+    Returns why a requirement is not met, or None if it is.
+    """
+    if requirement == "sentence_model":
+        from services import match_service
+        slot = match_service.sentence_model_slot
+        return None if match_service.get_sentence_model() is not None else f"sentence model unavailable: {slot.error}"
+    if requirement == "pii_analyzer":
+        from services import privacy_service
+        slot = privacy_service.analyzer_slot
+        return None if slot.get() is not None else f"PII analyzer unavailable: {slot.error}"
+    raise ValueError(f"Unknown requirement: {requirement}")
+
+
+def _mask_every_nth_word(text: str, n: int = 20) -> tuple[str, dict]:
+    # Synthetic placeholders for the unmasking benchmark, so it does not depend on the PII analyzer.
+    from services.privacy_service import mask_spans
+
+    spans = [(m.start(), m.end(), "PERSON") for i, m in enumerate(re.finditer(r"\S+", text)) if i % n == 0]
+    return mask_spans(text, spans)
+
+
+def _pii_round_trip(text: str, results: list):
+    from services.privacy_service import mask_spans, resolve_overlaps, unmask_text
+
+    masked_text, pii_map = mask_spans(text, resolve_overlaps(results))
+    unmask_text(masked_text, pii_map)
+
+
+def build_benchmarks(seed: int = corpus.DEFAULT_SEED) -> list[Benchmark]:
+    """
+    The micro-benchmarks: every hot-path function on every corpus case.
+    """
+    from services import match_service, privacy_service, text_extraction_service
+
+    clear_embeddings = match_service.embedding_cache.clear
+    benchmarks = []
+    for case, documents in corpus.build_corpus(seed).items():
+        resume, jd = documents["resume"], documents["jd"]
+        masked, pii_map = _mask_every_nth_word(resume)
+        benchmarks += [
+            Benchmark(f"match.check_mismatch_and_threshold[{case}]",
+                      functools.partial(match_service.check_mismatch_and_threshold, resume, jd),
+                      setup=clear_embeddings, requires=("sentence_model",), chars=len(resume) + len(jd)),
+            Benchmark(f"match.preprocess_text[{case}]",
+                      functools.partial(match_service.preprocess_text, resume), chars=len(resume)),
+            Benchmark(f"match.calculate_semantic_similarity[{case}]",
+                      functools.partial(match_service.calculate_semantic_similarity, resume, jd),
+                      setup=clear_embeddings, requires=("sentence_model",), chars=len(resume) + len(jd)),
+            Benchmark(f"match.get_keyword_suggestions[{case}]",
+                      functools.partial(match_service.get_keyword_suggestions, resume, jd), chars=len(resume) + len(jd)),
+            Benchmark(f"match.extract_experience[{case}]",
+                      functools.partial(match_service.extract_experience, resume), chars=len(resume)),
+            Benchmark(f"privacy.mask_text[{case}]",
+                      functools.partial(privacy_service.mask_text, resume), requires=("pii_analyzer",), chars=len(resume)),
+            Benchmark(f"privacy.unmask_text[{case}]",
+                      functools.partial(privacy_service.unmask_text, masked, pii_map), chars=len(masked)),
+            Benchmark(f"extraction.pdf[{case}]",
+                      functools.partial(text_extraction_service.extract_text_from_pdf, corpus.make_pdf(resume)),
+                      chars=len(resume)),
+            Benchmark(f"extraction.docx[{case}]",
+                      functools.partial(text_extraction_service.extract_text_from_docx, corpus.make_docx(resume)),
+                      chars=len(resume)),
+        ]
+    # Scaling checks: a linear path stays linear here, and a regression to quadratic shows up as a
+    # jump far beyond the compare threshold.
+    for entity_count in (1000, 16000):
+        text, results = corpus.make_pii_document(entity_count)
+        benchmarks.append(Benchmark(f"privacy.round_trip[entities={entity_count}]",
+                                    functools.partial(_pii_round_trip, text, results), chars=len(text)))
+    pathological = corpus.make_pathological_experience_text()
+    benchmarks.append(Benchmark("match.extract_experience[pathological]",
+                                functools.partial(match_service.extract_experience, pathological), chars=len(pathological)))
+    return benchmarks
+
+
+def _time_calls(benchmark: Benchmark, number: int) -> float:
+    if benchmark.setup is not None:
+        benchmark.setup()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            benchmark.run()
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def measure(benchmark: Benchmark, repeat: int, min_sample_s: float) -> dict:
+    """
+    Times a benchmark and returns its result entry (times per call, in milliseconds).
+    """
+    for requirement in benchmark.requires:
+        reason = _unavailable(requirement)
+        if reason:
+            return {"skipped": reason}
+
+    # The warm-up call pays for lazy imports and first-use compilation, which are not the hot path.
+    _time_calls(benchmark, 1)
+    number = 1
+    if benchmark.setup is None:
+        while number < 1_000_000 and _time_calls(benchmark, number) < min_sample_s:
+            number *= 2
+    samples_ms = [_time_calls(benchmark, number) / number * 1000 for _ in range(repeat)]
+    return {
+        "value": round(min(samples_ms), 4),
+        "median_ms": round(statistics.median(samples_ms), 4),
+        "unit": "ms",
+        "better": "lower",
+        "min_ms": round(min(samples_ms), 4),
+        "mean_ms": round(statistics.fmean(samples_ms), 4),
+        "max_ms": round(max(samples_ms), 4),
+        "stdev_ms": round(statistics.stdev(samples_ms), 4) if len(samples_ms) > 1 else 0.0,
+        "runs": repeat,
+        "calls_per_run": number,
+        "chars": benchmark.chars,
+    }
+
+
+async def _measure_endpoint(client, path: str, make_request, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = []
+
+    async def send(index: int, record: bool = True):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(path, **make_request(index))
+            elapsed = time.perf_counter() - start
+        if record:
+            latencies.append(elapsed)
+            if response.status_code != 200:
+                failures.append(f"HTTP {response.status_code}: {response.text[:200]}")
+
+    # One warm-up request per concurrent client, with inputs the timed requests do not reuse.
+    await asyncio.gather(*(send(requests + index, record=False) for index in range(concurrency)))
+    start = time.perf_counter()
+    await asyncio.gather(*(send(index) for index in range(requests)))
+    wall_s = time.perf_counter() - start
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    result = {
+        "value": round(requests / wall_s, 3),
+        "unit": "req/s",
+        "better": "higher",
+        "p50_ms": round(statistics.median(latencies_ms), 2),
+        "p95_ms": round(latencies_ms[min(len(latencies_ms) - 1, int(0.95 * len(latencies_ms)))], 2),
+        "requests": requests,
+        "concurrency": concurrency,
+        "failed": len(failures),
+    }
+    if failures:
+        result["error"] = f"{len(failures)} of {requests} requests failed; first: {failures[0]}"
+    return result
+
+
+def run_end_to_end(names: list[str], seed: int, requests: int, concurrency: int, gemini_latency_ms: float) -> dict:
+    """
+    Measures /analyze/ ("e2e.analyze") and /optimize/ ("e2e.optimize") throughput in-process.
+    Every request uploads a different PDF resume against the same JD, so the embedding and
+    extraction caches only help with the JD, as in real traffic. Gemini is a local stub that
+    answers after `gemini_latency_ms`.
+    """
+    import httpx
+
+    import main
+    from benchmarks.stub_gemini import StubGemini
+    from services import llm_client
+
+    jd = corpus.build_corpus(seed)["short"]["jd"].encode("utf-8")
+    resumes = [corpus.make_pdf(text) for text in corpus.make_resume_variants(requests + concurrency, seed)]
+
+    def upload(index: int, form: dict) -> dict:
+        files = {
+            "resume_file": (f"resume_{index}.pdf", resumes[index], "application/pdf"),
+            "jd_file": ("jd.txt", jd, "text/plain"),
+        }
+        return {"files": files, "data": form}
+
+    endpoints = {
+        "e2e.analyze": ("/analyze/", {"min_match_percentage": "0.4"}, ("sentence_model",)),
+        "e2e.optimize": ("/optimize/", {"required_match_for_optimization": "0"}, ("sentence_model", "pii_analyzer")),
+    }
+    # One access-log line per request would dominate the output.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    results = {}
+    with StubGemini(delay_s=gemini_latency_ms / 1000) as stub:
+        llm_client.gemini_client.base_url = stub.base_url
+        main.GEMINI_API_KEY = "benchmark-key"
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=main.app)
+            try:
+                async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=300) as client:
+                    for name in names:
+                        path, form, requires = endpoints[name]
+                        reasons = [reason for reason in map(_unavailable, requires) if reason]
+                        if reasons:
+                            results[name] = {"skipped": reasons[0]}
+                            continue
+                        results[name] = await _measure_endpoint(
+                            client, path, lambda index: upload(index, form), requests, concurrency
+                        )
+            finally:
+                await main.shutdown_inference_pool()
+
+        asyncio.run(scenario())
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, timeout=10).stdout.strip()
+    except Exception:
+        return None
+
+
+def describe_environment() -> dict:
+    from services import match_service, model_loader, tokenization_service
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "embedding_backend": match_service.EMBEDDING_BACKEND,
+        "tokenizer": tokenization_service.TOKENIZER,
+        # Models the selected benchmarks never needed stay "pending" and are left out.
+        "models": {
+            name: model["state"] for name, model in model_loader.status()["models"].items() if model["state"] != "pending"
+        },
+        "git_commit": _git_commit(),
+    }
+
+
+def _print_result(name: str, result: dict):
+    if "value" in result:
+        line = f"{name:<52} {result['value']:>12.4f} {result['unit']}"
+        if "error" in result:
+            line += f"  ERROR: {result['error']}"
+    else:
+        line = f"{name:<52} {'skipped' if 'skipped' in result else 'ERROR'}: {result.get('skipped') or result.get('error')}"
+    print(line, flush=True)
+
+
+def run(args) -> dict:
+    _configure_caches()
+    from services import text_extraction_service
+
+    def selected(name: str) -> bool:
+        return not args.only or any(fnmatch.fnmatchcase(name, pattern) for pattern in args.only)
+
+    results = {}
+    try:
+        for benchmark in build_benchmarks(args.seed):
+            if not selected(benchmark.name):
+                continue
+            try:
+                results[benchmark.name] = measure(benchmark, args.repeat, args.min_sample_ms / 1000)
+            except Exception as e:
+                results[benchmark.name] = {"error": f"{type(e).__name__}: {e}"}
+            _print_result(benchmark.name, results[benchmark.name])
+
+        endpoints = [name for name in ("e2e.analyze", "e2e.optimize") if selected(name)]
+        if endpoints and not args.skip_e2e:
+            try:
+                end_to_end = run_end_to_end(endpoints, args.seed, args.requests, args.concurrency, args.gemini_latency_ms)
+            except Exception as e:
+                end_to_end = {name: {"error": f"{type(e).__name__}: {e}"} for name in endpoints}
+            for name, result in end_to_end.items():
+                results[name] = result
+                _print_result(name, result)
+    finally:
+        text_extraction_service.shutdown_pdf_pool()
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "settings": {
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "min_sample_ms": args.min_sample_ms,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "gemini_latency_ms": args.gemini_latency_ms,
+        },
+        "environment": describe_environment(),
+        "results": results,
+    }
+
+
+def _comparable(result: dict) -> bool:
+    return result is not None and "value" in result and "error" not in result
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD,
+            min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> list[dict]:
+    """
+    Compares two result files benchmark by benchmark. Each row has a status: "regression" (worse
+    than the baseline by more than `threshold`, as a fraction), "improved", "ok", "failed" when
+    the baseline has a result and the current run does not (it raised, was skipped or is absent),
+    or "missing" when the baseline has nothing to compare against.
+    """
+    rows = []
+    for name in sorted(set(baseline["results"]) | set(current["results"])):
+        before, after = baseline["results"].get(name), current["results"].get(name)
+        row = {"name": name, "baseline": before.get("value") if before else None,
+               "current": after.get("value") if after else None, "change": None, "status": "missing"}
+        if _comparable(before) and not _comparable(after):
+            row["status"] = "failed"
+            row["reason"] = (after or {}).get("error") or (after or {}).get("skipped") or "no result"
+            rows.append(row)
+            continue
+        if not _comparable(before) or before["unit"] != after["unit"] or before["value"] <= 0:
+            rows.append(row)
+            continue
+
+        change = (after["value"] - before["value"]) / before["value"]
+        # Positive when the current run is worse: slower for times, lower for throughput.
+        worse_by = change if before["better"] == "lower" else -change
+        row["change"] = round(change, 4)
+        noise = before["unit"] == "ms" and abs(after["value"] - before["value"]) < min_delta_ms
+        if not noise and worse_by > threshold:
+            row["status"] = "regression"
+        elif not noise and worse_by < -threshold:
+            row["status"] = "improved"
+        else:
+            row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def environment_differences(baseline: dict, current: dict) -> list[tuple]:
+    """
+    (key, baseline value, current value) for every setting that differs, other than the commit.
+    Models are compared only where both runs loaded them.
+    """
+    differences = []
+    for key in sorted(set(baseline) | set(current)):
+        before, after = baseline.get(key), current.get(key)
+        if key == "git_commit" or before == after:
+            continue
+        if key == "models":
+            differences += [
+                (f"models.{name}", before[name], after[name])
+                for name in sorted(set(before or {}) & set(after or {})) if before[name] != after[name]
+            ]
+        else:
+            differences.append((key, before, after))
+    return differences
+
+
+def _print_comparison(rows: list[dict], threshold: float):
+    print(f"{'benchmark':<52} {'baseline':>12} {'current':>12} {'change':>9}  status (threshold {threshold:.0%})")
+    for row in rows:
+        baseline = "-" if row["baseline"] is None else f"{row['baseline']:.4f}"
+        current = "-" if row["current"] is None else f"{row['current']:.4f}"
+        change = "-" if row["change"] is None else f"{row['change']:+.1%}"
+        print(f"{row['name']:<52} {baseline:>12} {current:>12} {change:>9}  {row['status']}")
+
+
+def _load_results(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        results = json.load(f)
+    if results.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"{path} has schema {results.get('schema')}, expected {SCHEMA_VERSION}.")
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks for the matching, privacy and extraction hot paths.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks and write the results as JSON.")
+    run_parser.add_argument("--output", required=True)
+    run_parser.add_argument("--seed", type=int, default=corpus.DEFAULT_SEED)
+    run_parser.add_argument("--repeat", type=int, default=15)
+    run_parser.add_argument("--min-sample-ms", type=float, default=20.0)
+    run_parser.add_argument("--only", action="append", help="Glob of benchmark names to run; repeatable.")
+    run_parser.add_argument("--skip-e2e", action="store_true", help="Skip the in-process endpoint benchmarks.")
+    run_parser.add_argument("--requests", type=int, default=64)
+    run_parser.add_argument("--concurrency", type=int, default=8)
+    run_parser.add_argument("--gemini-latency-ms", type=float, default=50.0)
+    run_parser.add_argument("--quick", action="store_true", help="Fewer repeats and requests, for a fast smoke run.")
+    compare_parser = subparsers.add_parser("compare", help="Compare results against a baseline; exit 1 on regressions or failures.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare_parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS)
+    corpus_parser = subparsers.add_parser("corpus", help="Write the synthetic corpus as .txt, .pdf and .docx files.")
+    corpus_parser.add_argument("--output", required=True)
+    corpus_parser.add_argument("--seed", type=int, default=corpus.DEFAULT_SEED)
+    args = parser.parse_args(argv)
+
+    if args.command == "corpus":
+        print(f"Wrote {len(corpus.write_corpus(args.output, args.seed))} files to {args.output}.")
+        return 0
+
+    if args.command == "compare":
+        baseline, current = _load_results(args.baseline), _load_results(args.current)
+        for key, before, after in environment_differences(baseline["environment"], current["environment"]):
+            print(f"WARNING: environment differs from the baseline: {key} {before!r} -> {after!r}")
+        rows = compare(baseline, current, args.threshold, args.min_delta_ms)
+        _print_comparison(rows, args.threshold)
+        failed = [row for row in rows if row["status"] == "failed"]
+        for row in failed:
+            print(f"FAILED: {row['name']}: {row['reason']}")
+        regressions = [row["name"] for row in rows if row["status"] == "regression"]
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1 if regressions or failed else 0
+
+    if args.quick:
+        args.repeat, args.requests = min(args.repeat, 5), min(args.requests, 16)
+    results = run(args)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {len(results['results'])} results to {args.output}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
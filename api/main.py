@@ -1,17 +1,44 @@
 import logging
+import time
 
+_import_start = time.perf_counter()
+_import_timings = {}
+
+def _timed_import(name: str, start: float):
+    _import_timings[name] = time.perf_counter() - start
+
+_t = time.perf_counter()
 from fastapi import FastAPI, File, UploadFile, HTTPException, Form
-from fastapi.responses import JSONResponse, FileResponse
-import shutil
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
+_timed_import("fastapi", _t)
+import json
 import os
 from dotenv import load_dotenv
-import uuid
+_t = time.perf_counter()
 from services import match_service
-from google import genai
-from google.genai import types
+_timed_import("services.match_service", _t)
 from fastapi.middleware.cors import CORSMiddleware
+_t = time.perf_counter()
 import nltk.data
+_timed_import("nltk", _t)
+_t = time.perf_counter()
 from services import privacy_service
+_timed_import("services.privacy_service", _t)
+from services import jd_profile_service
+from services import job_search_service
+from services import inference_scheduler
+from services import llm_client
+from services import optimization_jobs
+from services.output_store import output_store
+from services import model_loader
+from services import text_extraction_service
+from services.analysis_pipeline import AnalysisPipeline
+from utils import file_operations
+from routers import downloads
+
+_timed_import("main (total)", _import_start)
+for _name, _seconds in _import_timings.items():
+    model_loader.record_import_time(_name, _seconds)
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -49,6 +76,8 @@ origins = [
 
 
 origins = list(set(origins)) 
+# Added first so it runs inside CORSMiddleware and its 413s carry CORS headers.
+app.add_middleware(file_operations.RequestSizeLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -57,99 +86,314 @@ app.add_middleware(
     allow_headers=["*"], 
 )
 
+app.include_router(downloads.router)
 
-async def read_file_content(upload_file: UploadFile) -> str:
-    temp_path = f"temp_{uuid.uuid4()}_{upload_file.filename}"
-    try:
-      
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(upload_file.file, buffer)
 
-        # Attempt to read content with utf-8, fall back if necessary
-        try:
-            with open(temp_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            return content
-        except UnicodeDecodeError:
-            print(f"DEBUG: UnicodeDecodeError for {upload_file.filename}. Trying latin-1...")
-            # Fallback for common encoding issues (e.g., some older .doc files converted to text)
-            with open(temp_path, "r", encoding="latin-1") as f:
-                content = f.read()
-            return content
-        except Exception as e:
-            print(f"ERROR: Failed to read file {upload_file.filename} content: {e}")
-            raise HTTPException(status_code=400, detail=f"Could not read content from {upload_file.filename}: {e}")
+@app.on_event("startup")
+async def start_model_loading():
+    # Models load in background threads so startup returns immediately and uvicorn can bind.
+    # Requests that need a model before it is ready wait for it on a worker thread.
+    model_loader.start_all()
+    output_store.start_sweeper()
+
+
+@app.on_event("shutdown")
+async def shutdown_inference_pool():
+    inference_scheduler.shutdown()
+    text_extraction_service.shutdown_pdf_pool()
+    await optimization_jobs.job_manager.shutdown()
+    await output_store.stop_sweeper()
+    await llm_client.gemini_client.aclose()
 
+
+async def read_upload_bytes(upload_file: UploadFile) -> bytes:
+    """
+    Reads an upload into memory (no temp files), mapping size and read errors to HTTP errors.
+    """
+    try:
+        return await file_operations.read_upload(upload_file)
+    except file_operations.UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         print(f"ERROR: File processing failed for {upload_file.filename}: {e}")
         raise HTTPException(status_code=400, detail=f"File processing failed for {upload_file.filename}: {e}")
-    finally:
-        # Ensure temporary file is removed
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+
+
+async def read_file_content(upload_file: UploadFile) -> str:
+    """
+    Reads an upload into memory (no temp files) and returns its text.
+    PDF and DOCX content is handed straight to the extractors; anything else is decoded as text.
+    """
+    data = await read_upload_bytes(upload_file)
+    ext = text_extraction_service.get_file_extension(upload_file.filename or "")
+    if ext in (".pdf", ".docx"):
+        # Document parsing is CPU-bound, so it runs on the worker pool.
+        return await inference_scheduler.run_in_worker(
+            text_extraction_service.extract_text_from_bytes, data, upload_file.filename
+        )
+    return file_operations.decode_text(data)
+
+
+async def resolve_jd_profile(jd_file: UploadFile | None, jd_id: str | None) -> match_service.JDProfile:
+    """
+    Returns the JD profile for a request, either from a registered jd_id or by profiling an uploaded JD file.
+    """
+    if jd_id:
+        return lookup_jd_profile(jd_id)
+    if jd_file is None:
+        raise HTTPException(status_code=400, detail="Either jd_file or jd_id must be provided.")
+    return await profile_jd_text(await read_file_content(jd_file))
+
+
+def lookup_jd_profile(jd_id: str) -> match_service.JDProfile:
+    profile = jd_profile_service.get_jd_profile(jd_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Job description '{jd_id}' not found. Register it via POST /jd/ first.")
+    return profile
+
+
+async def profile_jd_text(jd_content: str) -> match_service.JDProfile:
+    """
+    Builds the profile of an uploaded JD's text.
+    """
+    if not jd_content:
+        raise HTTPException(status_code=400, detail="Could not read content from the job description file.")
+    await inference_scheduler.prefetch_embeddings([jd_content])
+    return await inference_scheduler.run_in_worker(match_service.build_jd_profile, jd_content)
+
+
+async def start_analysis(
+    resume_file: UploadFile,
+    jd_file: UploadFile | None,
+    jd_id: str | None,
+    min_match_percentage: float = 0.40
+) -> AnalysisPipeline:
+    """
+    Reads the uploads, resolves the JD profile and returns the request's analysis pipeline
+    with the resume text already extracted. Later stages are computed only when asked for.
+    """
+    resume_bytes = await read_upload_bytes(resume_file)
+    jd_profile = await resolve_jd_profile(jd_file, jd_id)
+    return await analyze_resume_bytes(resume_bytes, resume_file.filename, jd_profile, min_match_percentage)
+
+
+async def analyze_resume_bytes(
+    resume_bytes: bytes,
+    filename: str,
+    jd_profile: match_service.JDProfile,
+    min_match_percentage: float = 0.40
+) -> AnalysisPipeline:
+    pipeline = AnalysisPipeline(
+        jd_profile,
+        resume_bytes=resume_bytes,
+        filename=filename,
+        min_match_percentage=min_match_percentage
+    )
+    resume_content = await inference_scheduler.run_in_worker(pipeline.get, "extract")
+
+    if not resume_content or not jd_profile.jd_text:
+        raise HTTPException(status_code=400, detail="Could not read content from both files.")
+    # Queued now so the embeddings are computed in a coalesced batch before the "embed" stage needs them.
+    # Long resumes are scored by chunk, so their chunks are prefetched rather than the whole text.
+    await inference_scheduler.prefetch_embeddings(match_service.similarity_texts(resume_content, jd_profile))
+    return pipeline
 
 
 @app.get("/")
 async def read_root():
     return {"message": "Welcome to the Resume-JD Matcher API. Go to /docs for API documentation."}
 
+@app.get("/healthz")
+async def healthz():
+    """
+    Liveness probe. Always 200 while the process is serving; reports per-model load state and import timings.
+    """
+    return model_loader.status()
+
+@app.get("/readyz")
+async def readyz():
+    """
+    Readiness probe. Returns 503 until every model has finished loading.
+    """
+    status = model_loader.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+@app.get("/stats/")
+async def read_stats():
+    """
+    Reports runtime counters for the API's caches.
+    """
+    return {
+        "embedding_cache": match_service.embedding_cache.stats(),
+        "jd_profiles": jd_profile_service.stats(),
+        "job_index": job_search_service.stats(),
+        "inference": inference_scheduler.stats(),
+        "extraction_cache": text_extraction_service.extraction_cache.stats(),
+        "pdf_extraction": text_extraction_service.pdf_stats(),
+        "term_stats": match_service.term_stats.stats(),
+        "llm": llm_client.gemini_client.stats(),
+        "llm_cache": match_service.llm_cache.stats(),
+        "optimization_jobs": optimization_jobs.job_manager.stats(),
+        "outputs": output_store.stats(),
+    }
+
+@app.post("/jd/")
+async def register_jd(jd_file: UploadFile = File(...)):
+    """
+    Registers a job description and precomputes everything about it that does not depend on the resume.
+    The returned jd_id can be passed to /analyze/, /optimize/ and /rank/ instead of uploading the JD again.
+    """
+    jd_content = await read_file_content(jd_file)
+    if not jd_content:
+        raise HTTPException(status_code=400, detail="Could not read content from the job description file.")
+
+    jd_id, profile = await inference_scheduler.run_in_worker(jd_profile_service.register_jd, jd_content)
+    return JSONResponse(content={
+        "message": "Job description registered successfully!",
+        **jd_profile_service.describe_jd_profile(jd_id, profile)
+    })
+
+@app.get("/jd/{jd_id}")
+async def read_jd(jd_id: str):
+    profile = jd_profile_service.get_jd_profile(jd_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Job description '{jd_id}' not found.")
+    return jd_profile_service.describe_jd_profile(jd_id, profile)
+
+@app.delete("/jd/{jd_id}")
+async def delete_jd(jd_id: str):
+    if not jd_profile_service.delete_jd_profile(jd_id):
+        raise HTTPException(status_code=404, detail=f"Job description '{jd_id}' not found.")
+    return {"message": f"Job description '{jd_id}' deleted."}
+
+@app.post("/jobs/")
+async def index_jobs(jd_files: list[UploadFile] = File(...)):
+    """
+    Adds job descriptions to the job search index. Each file's name is used as its job id,
+    so re-uploading a file replaces the indexed posting.
+    """
+    jobs = []
+    for jd_file in jd_files:
+        jd_content = await read_file_content(jd_file)
+        jobs.append((jd_file.filename, os.path.splitext(jd_file.filename)[0], jd_content))
+
+    try:
+        indexed = await inference_scheduler.run_in_worker(job_search_service.add_jobs, jobs)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    await inference_scheduler.run_in_worker(job_search_service.save_index)
+
+    return {"message": f"Indexed {indexed} jobs.", "total_jobs": job_search_service.stats()["vectors"]}
+
+@app.delete("/jobs/{job_id}")
+async def delete_job(job_id: str):
+    if not job_search_service.delete_jobs([job_id]):
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    await inference_scheduler.run_in_worker(job_search_service.save_index)
+    return {"message": f"Job '{job_id}' deleted."}
+
+@app.post("/jobs/search/")
+async def search_jobs_for_resume(
+    resume_file: UploadFile = File(...),
+    top_k: int = Form(10)
+):
+    """
+    Recommends the best matching indexed jobs for a resume.
+    """
+    resume_content = await read_file_content(resume_file)
+    if not resume_content:
+        raise HTTPException(status_code=400, detail="Could not read content from the resume file.")
+
+    await inference_scheduler.prefetch_embeddings([resume_content])
+    results = await inference_scheduler.run_in_worker(job_search_service.search_jobs, resume_content, top_k=top_k)
+    return JSONResponse(content={
+        "message": f"Found {len(results)} matching jobs.",
+        "jobs": results
+    })
+
 @app.post("/analyze/")
 async def analyze_resume_jd(
     resume_file: UploadFile = File(...), 
-    jd_file: UploadFile = File(...),
+    jd_file: UploadFile | None = File(None),
+    jd_id: str | None = Form(None),
     min_match_percentage: float = Form(0.40)
 ):
     """
     Analyzes the resume against the job description and provides a match score and suggestions.
+    The JD is either uploaded as jd_file or referenced by a jd_id from POST /jd/.
     Does NOT perform AI optimization.
     """
-    resume_content = await read_file_content(resume_file)
-    jd_content = await read_file_content(jd_file)
-
-    if not resume_content or not jd_content:
-        raise HTTPException(status_code=400, detail="Could not read content from both files.")
-
-    match_result = match_service.check_mismatch_and_threshold(
-        resume_content, 
-        jd_content, 
-        min_match_percentage=min_match_percentage
-    )
+    pipeline = await start_analysis(resume_file, jd_file, jd_id, min_match_percentage)
+    match_result = await inference_scheduler.run_in_worker(pipeline.get, "match")
 
     return JSONResponse(content={
         "message": "Files analyzed successfully!",
         **match_result,
         "extracted_text_debug": {
-            "resume_text": resume_content,
-            "jd_text": jd_content
+            "resume_text": pipeline.get("extract"),
+            "jd_text": pipeline.jd_profile.jd_text
         }
     })
 
-@app.post("/optimize/")
-async def optimize_resume(
-    resume_file: UploadFile = File(...), 
-    jd_file: UploadFile = File(...),
-    required_match_for_optimization: float = Form(0.40)
+@app.post("/rank/")
+async def rank_resumes_against_jd(
+    resume_files: list[UploadFile] = File(...),
+    jd_file: UploadFile | None = File(None),
+    jd_id: str | None = Form(None),
+    min_match_percentage: float = Form(0.40)
 ):
     """
-    Optimizes the resume against the job description using AI.
-    Requires a minimum match score from the initial analysis.
-    Returns the optimized resume text and a download link.
+    Ranks many resumes against a single job description.
+    All resumes are scored in one batched embedding pass and returned as a sorted leaderboard.
+    """
+    jd_profile = await resolve_jd_profile(jd_file, jd_id)
+
+    resumes = []
+    for resume_file in resume_files:
+        resume_content = await read_file_content(resume_file)
+        resumes.append((resume_file.filename, resume_content))
+
+    # The pool is already one large batch, so it skips the micro-batcher and goes straight to a worker.
+    leaderboard = await inference_scheduler.run_in_worker(
+        match_service.rank_resumes,
+        resumes,
+        min_match_percentage=min_match_percentage,
+        jd_profile=jd_profile
+    )
+
+    return JSONResponse(content={
+        "message": f"Ranked {len(leaderboard)} resumes successfully!",
+        "leaderboard": leaderboard
+    })
+
+async def prepare_optimization(
+    resume_file: UploadFile,
+    jd_file: UploadFile | None,
+    jd_id: str | None,
+    required_match_for_optimization: float
+) -> tuple[AnalysisPipeline, float, str, dict]:
+    """
+    Shared by /optimize/ and /optimize/stream/: checks the match score against the required
+    minimum and masks the resume. Returns (pipeline, match percentage, masked resume, pii_map).
     """
     if not GEMINI_API_KEY:
         raise HTTPException(status_code=503, detail="AI optimization service is not configured (API Key missing).")
 
-    resume_content = await read_file_content(resume_file)
-    jd_content = await read_file_content(jd_file)
+    pipeline = await start_analysis(resume_file, jd_file, jd_id)
+    current_match_percentage, masked_resume_content, pii_map = await check_and_mask(
+        pipeline, required_match_for_optimization
+    )
+    return pipeline, current_match_percentage, masked_resume_content, pii_map
 
-    if not resume_content or not jd_content:
-        raise HTTPException(status_code=400, detail="Could not read content from both files.")
 
-    analysis_result = match_service.check_mismatch_and_threshold(
-        resume_content, 
-        jd_content, 
-        min_match_percentage=0.0
-    )
-    current_match_percentage = analysis_result["match_percentage"]
+async def check_and_mask(pipeline: AnalysisPipeline, required_match_for_optimization: float) -> tuple[float, str, dict]:
+    """
+    Rejects resumes below the required match (403) and masks the rest.
+    Returns (match percentage, masked resume, pii_map).
+    """
+    # Only the similarity score gates optimization; warnings and suggestions are never computed here.
+    await inference_scheduler.run_in_worker(pipeline.get, "embed")
+    current_match_percentage = pipeline.match_percentage
 
     if current_match_percentage < required_match_for_optimization * 100:
         raise HTTPException(
@@ -159,25 +403,30 @@ async def optimize_resume(
 
     # --- START OF NEW PII MASKING LOGIC ---
     print("INFO: Masking PII from resume content before sending to AI...")
-    masked_resume_content, pii_map = privacy_service.mask_text(resume_content)
+    masked_resume_content, pii_map = await inference_scheduler.run_in_worker(pipeline.get, "mask")
     # If the map is empty, it means nothing was masked. This is fine.
     # --- END OF NEW PII MASKING LOGIC ---
 
-    # Analyze the ORIGINAL resume for an accurate score
-    analysis_result = match_service.check_mismatch_and_threshold(
-        resume_content, 
-        jd_content,
-        min_match_percentage=0.0 
-    )
+    return current_match_percentage, masked_resume_content, pii_map
 
-    current_match_percentage = analysis_result["match_percentage"]
 
-    if current_match_percentage < required_match_for_optimization * 100:
-        raise HTTPException(
-            status_code=403,
-            detail=f"Original match percentage ({current_match_percentage:.2f}%) is below the required {required_match_for_optimization*100:.2f}% for optimization. Resume does not meet the job description requirements."
-        )
-    
+@app.post("/optimize/")
+async def optimize_resume(
+    resume_file: UploadFile = File(...), 
+    jd_file: UploadFile | None = File(None),
+    jd_id: str | None = Form(None),
+    required_match_for_optimization: float = Form(0.40)
+):
+    """
+    Optimizes the resume against the job description using AI.
+    The JD is either uploaded as jd_file or referenced by a jd_id from POST /jd/.
+    Requires a minimum match score from the initial analysis.
+    Returns the optimized resume text and a download link.
+    """
+    pipeline, current_match_percentage, masked_resume_content, pii_map = await prepare_optimization(
+        resume_file, jd_file, jd_id, required_match_for_optimization
+    )
+    jd_content = pipeline.jd_profile.jd_text
 
     logging.info("Calling external AI service for optimization with masked content.")
     # For clarity, let's log the first 200 chars of the masked content
@@ -192,7 +441,8 @@ async def optimize_resume(
 
     if optimization_response["status"] == "error":
         raise HTTPException(
-            status_code=500,
+            # Overload, timeouts and upstream hiccups are worth retrying later; anything else is a failure.
+            status_code=503 if optimization_response.get("retryable") else 500,
             detail=f"AI optimization failed: {optimization_response['message']}"
         )
 
@@ -202,8 +452,6 @@ async def optimize_resume(
     logging.info("Received response from AI. Starting PII unmasking process.")
     final_optimized_text = privacy_service.unmask_text(optimized_masked_text, pii_map)
     logging.info("Unmasking complete. Preparing final response.")
-    
-    final_optimized_text = privacy_service.unmask_text(optimized_masked_text, pii_map)
     # --- END OF NEW PII UNMASKING LOGIC ---
 
     return JSONResponse(content={
@@ -211,4 +459,144 @@ async def optimize_resume(
         "optimization_status": "success",
         "original_match_percentage": current_match_percentage,
         "optimized_resume_text": final_optimized_text, # ### Use the final, unmasked text ###
-    })
\ No newline at end of file
+    })
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/optimize/stream/")
+async def optimize_resume_stream(
+    resume_file: UploadFile = File(...),
+    jd_file: UploadFile | None = File(None),
+    jd_id: str | None = Form(None),
+    required_match_for_optimization: float = Form(0.40)
+):
+    """
+    Streaming /optimize/: the same checks, then the optimized resume as server-sent events while
+    Gemini generates it. Events are "meta" (match percentage), "chunk" ({"text"}, already unmasked),
+    then "done", or "error" ({"message", "retryable"}) if generation fails part way.
+    """
+    pipeline, current_match_percentage, masked_resume_content, pii_map = await prepare_optimization(
+        resume_file, jd_file, jd_id, required_match_for_optimization
+    )
+    jd_content = pipeline.jd_profile.jd_text
+
+    async def events():
+        yield _sse_event("meta", {"original_match_percentage": current_match_percentage})
+        unmasker = privacy_service.StreamingUnmasker(pii_map)
+        try:
+            async for chunk in match_service.optimize_resume_with_ai_stream(
+                masked_resume_content, jd_content, GEMINI_API_KEY
+            ):
+                text = unmasker.feed(chunk)
+                if text:
+                    yield _sse_event("chunk", {"text": text})
+        except Exception as e:
+            print(f"ERROR: AI optimization stream failed: {e}")
+            retryable = isinstance(e, (llm_client.LLMOverloadedError, llm_client.LLMTimeoutError)) or llm_client.is_transient_error(e)
+            yield _sse_event("error", {"message": f"AI optimization failed: {e}", "retryable": retryable})
+            return
+        text = unmasker.flush()
+        if text:
+            yield _sse_event("chunk", {"text": text})
+        yield _sse_event("done", {"optimization_status": "success"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Proxies must pass events through as they are written rather than buffering the response.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def run_optimization_job(
+    job: optimization_jobs.OptimizationJob,
+    resume_bytes: bytes,
+    resume_filename: str,
+    jd_profile: match_service.JDProfile | None,
+    jd_bytes: bytes | None,
+    jd_filename: str | None,
+    required_match_for_optimization: float
+) -> str:
+    """
+    The body of a queued optimization: the same analysis, masking, LLM and unmasking steps as
+    /optimize/, run by a job worker. Returns the optimized, unmasked resume text.
+    """
+    job.stage = "analyzing"
+    if jd_profile is None:
+        jd_content = await inference_scheduler.run_in_worker(
+            text_extraction_service.extract_text_from_bytes, jd_bytes, jd_filename
+        )
+        jd_profile = await profile_jd_text(jd_content)
+    pipeline = await analyze_resume_bytes(resume_bytes, resume_filename, jd_profile)
+
+    job.stage = "masking"
+    current_match_percentage, masked_resume_content, pii_map = await check_and_mask(
+        pipeline, required_match_for_optimization
+    )
+    job.original_match_percentage = current_match_percentage
+
+    job.stage = "optimizing"
+    optimization_response = await match_service.optimize_resume_with_ai(
+        masked_resume_content, jd_profile.jd_text, GEMINI_API_KEY
+    )
+    if optimization_response["status"] == "error":
+        raise HTTPException(
+            status_code=503 if optimization_response.get("retryable") else 500,
+            detail=f"AI optimization failed: {optimization_response['message']}"
+        )
+    return privacy_service.unmask_text(optimization_response["optimized_text"], pii_map)
+
+
+def describe_optimization_job(job: optimization_jobs.OptimizationJob) -> dict:
+    description = job.to_dict()
+    description["status_url"] = f"/optimize/jobs/{job.job_id}"
+    description["download_url"] = f"/download/{job.result_file}" if job.result_file else None
+    return description
+
+
+@app.post("/optimize/jobs", status_code=202)
+async def submit_optimization_job(
+    resume_file: UploadFile = File(...),
+    jd_file: UploadFile | None = File(None),
+    jd_id: str | None = Form(None),
+    required_match_for_optimization: float = Form(0.40)
+):
+    """
+    Queues an optimization and returns its job id at once, instead of holding the connection
+    open for the LLM call. Poll GET /optimize/jobs/{job_id}; when it has succeeded, fetch the
+    optimized resume from its download_url.
+    """
+    if not GEMINI_API_KEY:
+        raise HTTPException(status_code=503, detail="AI optimization service is not configured (API Key missing).")
+
+    # Uploads are only readable during the request, so they are read now; everything else runs in the job.
+    resume_bytes = await read_upload_bytes(resume_file)
+    jd_profile = lookup_jd_profile(jd_id) if jd_id else None
+    jd_bytes = None
+    if jd_profile is None:
+        if jd_file is None:
+            raise HTTPException(status_code=400, detail="Either jd_file or jd_id must be provided.")
+        jd_bytes = await read_upload_bytes(jd_file)
+
+    try:
+        job = optimization_jobs.job_manager.submit(lambda job: run_optimization_job(
+            job, resume_bytes, resume_file.filename, jd_profile, jd_bytes,
+            jd_file.filename if jd_file is not None else None, required_match_for_optimization
+        ))
+    except optimization_jobs.JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return describe_optimization_job(job)
+
+
+@app.get("/optimize/jobs/{job_id}")
+async def read_optimization_job(job_id: str):
+    """
+    Status of a queued optimization: queued, running (with its stage), succeeded or failed.
+    """
+    job = optimization_jobs.job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Optimization job '{job_id}' not found or expired.")
+    return describe_optimization_job(job)
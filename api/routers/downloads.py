@@ -1,12 +1,58 @@
-from fastapi import APIRouter
-from fastapi.responses import FileResponse
-import os
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+import asyncio
+import mimetypes
+from urllib.parse import quote
+
+from services.output_store import choose_encoding, output_store
 
 router = APIRouter()
 
+# Outputs are personal documents: browsers may keep them but must revalidate, which costs a 304.
+CACHE_CONTROL = "private, no-cache"
+
+
+def _etag_matches(if_none_match: str, etags: list[str]) -> bool:
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or any(etag in candidates for etag in etags)
+
+
+def _content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
 @router.get("/download/{filename}")
-def download_output(filename: str):
-    file_path = os.path.join("outputs", filename)
-    if os.path.exists(file_path):
-        return FileResponse(file_path, media_type="text/plain", filename=filename)
-    return {"error": "File not found"}
+async def download_output(filename: str, request: Request):
+    """
+    Serves a generated file with a content-hash ETag. Revalidation (If-None-Match) gets a 304,
+    Range requests get partial content, and text is gzip/brotli-compressed when the client
+    accepts it and no range was asked for.
+    """
+    # Hashing a new file version reads it once, off the event loop.
+    output = await asyncio.to_thread(output_store.resolve, filename)
+    if output is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    encoding = None
+    if output.compressible and "range" not in request.headers:
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    # Each representation has its own ETag, so caches never mix compressed and identity bytes.
+    etag = f'{output.etag[:-1]}-{encoding}"' if encoding else output.etag
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, [output.etag, etag]):
+        return Response(status_code=304, headers=headers)
+
+    media_type = mimetypes.guess_type(output.filename)[0] or "text/plain"
+    if encoding is None:
+        # FileResponse answers Range and If-Range requests itself.
+        return FileResponse(output.path, media_type=media_type, filename=output.filename, headers=headers)
+
+    body = await asyncio.to_thread(output_store.compressed, output, encoding)
+    headers["Content-Encoding"] = encoding
+    headers["Content-Disposition"] = _content_disposition(output.filename)
+    return Response(content=body, media_type=media_type, headers=headers)
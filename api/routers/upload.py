@@ -1,9 +1,8 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from fastapi.responses import JSONResponse
-import os
 
-from utils.file_operations import save_uploaded_file
-from services.text_extraction_service import extract_text_from_file
+from utils.file_operations import read_upload, UploadTooLargeError
+from services.text_extraction_service import extract_text_from_bytes
 from services.match_service import check_mismatch_and_threshold 
 
 router = APIRouter(
@@ -18,7 +17,7 @@ async def upload_resume_and_jd(
 ):
     """
     Endpoint to upload a resume and job description.
-    Saves the files, extracts text, performs a match, and returns results.
+    Reads the files into memory, extracts text, performs a match, and returns results.
     
     Args:
         resume (UploadFile): The user's resume file.
@@ -28,7 +27,6 @@ async def upload_resume_and_jd(
         JSONResponse: Match percentage, warnings, and suggestions.
     """
     
-    uploaded_file_paths = [] # To keep track of saved file paths for cleanup
     extracted_texts = {
         "resume_text": "",
         "jd_text": ""
@@ -42,19 +40,17 @@ async def upload_resume_and_jd(
     }
 
     try:
-        # 1. Save Resume File
-        resume_path = await save_uploaded_file(resume)
-        uploaded_file_paths.append(resume_path)
+        # 1. Read Resume File
+        resume_bytes = await read_upload(resume)
 
         # 2. Extract Text from Resume
-        extracted_texts["resume_text"] = extract_text_from_file(resume_path, resume.filename)
+        extracted_texts["resume_text"] = extract_text_from_bytes(resume_bytes, resume.filename)
 
-        # 3. Save Job Description File
-        jd_path = await save_uploaded_file(job_description)
-        uploaded_file_paths.append(jd_path)
+        # 3. Read Job Description File
+        jd_bytes = await read_upload(job_description)
 
         # 4. Extract Text from Job Description
-        extracted_texts["jd_text"] = extract_text_from_file(jd_path, job_description.filename)
+        extracted_texts["jd_text"] = extract_text_from_bytes(jd_bytes, job_description.filename)
 
         # 5. Perform Matching and Mismatch Checks (UPDATED STEP!)
         match_results = check_mismatch_and_threshold(
@@ -73,12 +69,10 @@ async def upload_resume_and_jd(
             }
         )
 
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         print(f"An unexpected error occurred during processing: {e}") 
-        raise HTTPException(status_code=500, detail=f"Processing failed due to an internal error: {e}")
-    finally:
-        for path in uploaded_file_paths:
-            if os.path.exists(path):
-                os.remove(path)
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Processing failed due to an internal error: {e}")
\ No newline at end of file
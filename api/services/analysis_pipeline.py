@@ -0,0 +1,127 @@
+# api/services/analysis_pipeline.py
+import threading
+import time
+
+from services import experience_service
+from services import match_service
+from services import privacy_service
+from services import skills_service
+from services import text_extraction_service
+from services.tokenization_service import tokenize_document
+
+
+class AnalysisPipeline:
+    """
+    The analysis of one resume against one JD profile, as named stages scoped to a single request.
+
+    Stages are computed lazily, the first time something asks for them, and memoized, so an
+    endpoint only pays for the outputs it needs and nothing is computed twice:
+
+    - extract:    resume text (from the uploaded bytes, unless the text was given directly)
+    - tokenize:   TokenizedDocument of the resume
+    - embed:      semantic similarity, {"score", "section_scores"}
+    - experience: ExperienceSummary of the resume
+    - roles:      canonical job titles and seniority levels in the resume
+    - skills:     skill report against the JD (matched/missing/extra/coverage)
+    - keywords:   keyword suggestions from the JD
+    - mask:       (masked_text, pii_map) for sending the resume to the LLM
+    - match:      the full match result returned by /analyze/
+
+    Stage functions are synchronous and CPU-bound; call get()/require() from a worker thread.
+    """
+
+    STAGES = ("extract", "tokenize", "embed", "experience", "roles", "skills", "keywords", "mask", "match")
+
+    def __init__(
+        self,
+        jd_profile: match_service.JDProfile,
+        resume_text: str = None,
+        resume_bytes: bytes = None,
+        filename: str = None,
+        min_match_percentage: float = 0.40
+    ):
+        self.jd_profile = jd_profile
+        self.resume_bytes = resume_bytes
+        self.filename = filename
+        self.min_match_percentage = min_match_percentage
+        self.timings = {}
+        self._results = {}
+        if resume_text is not None:
+            self._results["extract"] = resume_text
+        # Reentrant: a stage asks for the stages it depends on while holding the lock.
+        self._lock = threading.RLock()
+
+    def get(self, stage: str):
+        """
+        Returns a stage's output, computing it (and the stages it depends on) on first use.
+        """
+        if stage not in self.STAGES:
+            raise ValueError(f"Unknown analysis stage '{stage}'. Choose one of: {', '.join(self.STAGES)}.")
+        with self._lock:
+            if stage not in self._results:
+                start = time.perf_counter()
+                self._results[stage] = getattr(self, f"_compute_{stage}")()
+                self.timings[stage] = round(time.perf_counter() - start, 4)
+            return self._results[stage]
+
+    def require(self, *stages: str) -> dict:
+        """
+        Computes the declared stages and returns them by name.
+        """
+        return {stage: self.get(stage) for stage in stages}
+
+    def computed(self) -> list[str]:
+        with self._lock:
+            return list(self._results)
+
+    @property
+    def match_percentage(self) -> float:
+        return round(self.get("embed")["score"] * 100, 2)
+
+    def _compute_extract(self) -> str:
+        if self.resume_bytes is None:
+            return ""
+        return text_extraction_service.extract_text_from_bytes(self.resume_bytes, self.filename)
+
+    def _compute_tokenize(self):
+        return tokenize_document(self.get("extract"))
+
+    def _compute_embed(self) -> dict:
+        return match_service.calculate_resume_similarity(self.get("extract"), self.jd_profile)
+
+    def _compute_experience(self):
+        return experience_service.scan_experience(self.get("extract"))
+
+    def _compute_roles(self) -> set[str]:
+        return set(match_service.extract_job_title_keywords(self.get("extract")))
+
+    def _compute_skills(self) -> dict:
+        return skills_service.compare_skills(self.get("extract"), self.jd_profile.skills)
+
+    def _compute_keywords(self) -> list[str]:
+        return match_service.get_keyword_suggestions(
+            self.get("extract"),
+            self.jd_profile.jd_text,
+            jd_keyword_scores=self.jd_profile.keyword_scores,
+            resume_document=self.get("tokenize")
+        )
+
+    def _compute_mask(self) -> tuple[str, dict]:
+        return privacy_service.mask_text(self.get("extract"))
+
+    def _compute_match(self) -> dict:
+        similarity = self.get("embed")
+        match_result = match_service.build_match_result(
+            self.get("extract"),
+            self.jd_profile,
+            similarity["score"],
+            min_match_percentage=self.min_match_percentage,
+            skill_report=self.get("skills"),
+            resume_document=self.get("tokenize"),
+            resume_experience=self.get("experience"),
+            resume_roles=self.get("roles"),
+            suggestions=self.get("keywords")
+        )
+        if similarity["section_scores"] is not None:
+            match_result["section_scores"] = similarity["section_scores"]
+        return match_result
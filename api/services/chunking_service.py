@@ -0,0 +1,158 @@
+# api/services/chunking_service.py
+import os
+import re
+
+import numpy as np
+
+# MiniLM truncates input at 256 word pieces, roughly 180 English words. Documents longer than
+# LONG_DOCUMENT_WORDS are scored chunk by chunk instead of as one truncated string.
+LONG_DOCUMENT_WORDS = int(os.getenv("LONG_DOCUMENT_WORDS", "180"))
+CHUNK_MAX_WORDS = int(os.getenv("CHUNK_MAX_WORDS", "150"))
+MAX_CHUNKS_PER_DOCUMENT = int(os.getenv("MAX_CHUNKS_PER_DOCUMENT", "64"))
+
+SECTION_ALIASES = {
+    "summary": ["summary", "professional summary", "profile", "objective", "about me", "about us", "overview"],
+    "experience": ["experience", "work experience", "professional experience", "employment history",
+                   "work history", "employment"],
+    "skills": ["skills", "technical skills", "core competencies", "competencies", "technologies", "tech stack"],
+    "education": ["education", "academic background", "qualifications", "certifications", "courses"],
+    "projects": ["projects", "personal projects", "key projects", "publications"],
+    "responsibilities": ["responsibilities", "what you will do", "what you'll do", "your role", "duties"],
+    "requirements": ["requirements", "what we are looking for", "what we're looking for", "must have",
+                     "nice to have", "preferred qualifications", "minimum qualifications", "who you are"],
+}
+
+_HEADING_TO_SECTION = {alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases}
+_HEADING_PATTERN = re.compile(
+    r"^[ \t]*(?:#+[ \t]*)?(" + "|".join(sorted((re.escape(a) for a in _HEADING_TO_SECTION), key=len, reverse=True))
+    + r")[ \t]*:?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?;])\s+|\n+")
+
+
+def split_sections(text: str) -> list[tuple[str, str]]:
+    """
+    Splits a document into (section name, section text) pairs using common resume/JD headings.
+    Text before the first heading is labelled "general".
+    """
+    sections = []
+    current_name = "general"
+    last_end = 0
+    for match in _HEADING_PATTERN.finditer(text):
+        body = text[last_end:match.start()].strip()
+        if body:
+            sections.append((current_name, body))
+        current_name = _HEADING_TO_SECTION[match.group(1).lower()]
+        last_end = match.end()
+    body = text[last_end:].strip()
+    if body:
+        sections.append((current_name, body))
+    return sections
+
+
+def _windows(section_text: str, max_words: int):
+    window = []
+    for sentence in _SENTENCE_SPLIT_PATTERN.split(section_text):
+        words = sentence.split()
+        while words:
+            room = max_words - len(window)
+            if room <= 0:
+                yield " ".join(window)
+                window = []
+                room = max_words
+            window.extend(words[:room])
+            words = words[room:]
+    if window:
+        yield " ".join(window)
+
+
+def chunk_document(text: str, max_words: int = CHUNK_MAX_WORDS, max_chunks: int = MAX_CHUNKS_PER_DOCUMENT) -> list[tuple[str, str]]:
+    """
+    Splits a document into (section name, chunk text) pairs of at most max_words words,
+    breaking on sentence boundaries where possible.
+    If there are more than max_chunks chunks, an evenly spaced subset is kept so the whole
+    document is still represented while cost stays bounded.
+    """
+    chunks = [
+        (section, window)
+        for section, section_text in split_sections(text)
+        for window in _windows(section_text, max_words)
+    ]
+    if len(chunks) > max_chunks:
+        keep = np.linspace(0, len(chunks) - 1, max_chunks).round().astype(int)
+        chunks = [chunks[i] for i in sorted(set(keep.tolist()))]
+    return chunks
+
+
+def is_long_document(text: str, limit: int = LONG_DOCUMENT_WORDS) -> bool:
+    """
+    True if the text is likely to be truncated by the embedding model.
+    """
+    # Counting stops at the limit, so very large documents are not scanned twice.
+    count = 0
+    for _ in re.finditer(r"\S+", text):
+        count += 1
+        if count > limit:
+            return True
+    return False
+
+
+def normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, np.finfo(np.float32).eps)
+
+
+def encode_chunks(encode_fn, chunks: list[tuple[str, str]], batch_size: int = 32) -> np.ndarray:
+    """
+    Encodes chunk texts batch by batch into one preallocated, L2-normalized matrix.
+    """
+    embeddings = None
+    for start in range(0, len(chunks), batch_size):
+        batch = np.asarray(encode_fn([text for _, text in chunks[start:start + batch_size]]), dtype=np.float32)
+        if embeddings is None:
+            embeddings = np.empty((len(chunks), batch.shape[1]), dtype=np.float32)
+        embeddings[start:start + len(batch)] = batch
+    if embeddings is None:
+        return np.zeros((0, 0), dtype=np.float32)
+    return normalize_rows(embeddings)
+
+
+def chunked_similarity(
+    encode_fn,
+    resume_chunks: list[tuple[str, str]],
+    jd_chunks: list[tuple[str, str]],
+    batch_size: int = 32
+) -> dict:
+    """
+    Scores a resume against a JD chunk by chunk.
+
+    All chunks of both documents are encoded in one pass and compared in a single
+    resume-by-JD similarity matrix. The overall score is the mean, over JD chunks, of the best
+    matching resume chunk (max/mean pooling), i.e. how well the resume covers each part of the JD.
+    Per-section scores apply the same pooling to each resume section.
+    """
+    if not resume_chunks or not jd_chunks:
+        return {"score": 0.0, "section_scores": {}}
+
+    embeddings = encode_chunks(encode_fn, resume_chunks + jd_chunks, batch_size=batch_size)
+    return score_chunks(resume_chunks, embeddings[:len(resume_chunks)], embeddings[len(resume_chunks):])
+
+
+def score_chunks(resume_chunks: list[tuple[str, str]], resume_embeddings: np.ndarray, jd_embeddings: np.ndarray) -> dict:
+    """
+    The pooling step of chunked_similarity, on already encoded, L2-normalized chunks.
+    """
+    if not resume_chunks or len(jd_embeddings) == 0:
+        return {"score": 0.0, "section_scores": {}}
+    similarity_matrix = resume_embeddings @ jd_embeddings.T
+
+    score = float(similarity_matrix.max(axis=0).mean())
+
+    best_per_resume_chunk = similarity_matrix.max(axis=1)
+    sections = np.array([section for section, _ in resume_chunks])
+    section_scores = {
+        section: round(float(best_per_resume_chunk[sections == section].mean()) * 100, 2)
+        for section in dict.fromkeys(sections.tolist())
+    }
+    return {"score": score, "section_scores": section_scores}
@@ -0,0 +1,264 @@
+# api/services/embedding_backend.py
+# Pluggable embedding backends for the local MiniLM model:
+# - "sentence-transformers": the original PyTorch SentenceTransformer path.
+# - "onnx": the same model exported to an ONNX Runtime graph.
+# - "onnx-int8": the ONNX graph with dynamically quantized int8 weights.
+# ONNX graphs are exported on first use into <model dir>/onnx/ and reused afterwards.
+# The ONNX backends need the optional packages in requirements-onnx.txt.
+# Run `python -m services.embedding_backend parity --backend onnx-int8` from api/ to check
+# that a backend's cosine scores stay within tolerance of the fp32 SentenceTransformer model.
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+import numpy as np
+
+BACKENDS = ("sentence-transformers", "onnx", "onnx-int8")
+
+# Maximum allowed absolute difference in cosine similarity against the fp32 model.
+PARITY_TOLERANCE = {
+    "sentence-transformers": 1e-6,
+    "onnx": 1e-4,
+    "onnx-int8": 0.02,
+}
+
+
+def _normalize(embeddings: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+class SentenceTransformerBackend:
+    name = "sentence-transformers"
+
+    def __init__(self, model_path: str):
+        from sentence_transformers import SentenceTransformer
+        # Use local_files_only=True to force loading from the local path ONLY.
+        self.model = SentenceTransformer(model_path, local_files_only=True)
+
+    def encode(self, texts: list[str], batch_size: int = 32) -> np.ndarray:
+        return np.asarray(self.model.encode(texts, batch_size=batch_size), dtype=np.float32)
+
+
+class OnnxBackend:
+    """
+    Runs the exported MiniLM graph with ONNX Runtime and applies the model's
+    mean pooling and L2 normalization in NumPy.
+    """
+
+    def __init__(self, model_path: str, quantized: bool = False):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.name = "onnx-int8" if quantized else "onnx"
+        onnx_path = ensure_onnx_model(model_path, quantized=quantized)
+
+        with open(os.path.join(model_path, "sentence_bert_config.json"), "r", encoding="utf-8") as f:
+            max_seq_length = json.load(f).get("max_seq_length", 256)
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_path, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {graph_input.name for graph_input in self.session.get_inputs()}
+
+    def encode(self, texts: list[str], batch_size: int = 32) -> np.ndarray:
+        outputs = []
+        for start in range(0, len(texts), batch_size):
+            encodings = self.tokenizer.encode_batch(texts[start:start + batch_size])
+            input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+            token_embeddings = self.session.run(None, feeds)[0]
+            mask = attention_mask[:, :, None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            outputs.append(_normalize(pooled.astype(np.float32)))
+        if not outputs:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(outputs)
+
+
+@contextlib.contextmanager
+def _export_lock(onnx_dir: str):
+    # Serializes exports across processes, e.g. several uvicorn workers starting together.
+    os.makedirs(onnx_dir, exist_ok=True)
+    with open(os.path.join(onnx_dir, ".export.lock"), "w") as lock_file:
+        try:
+            import fcntl
+        except ImportError:
+            # No flock on Windows; the atomic rename still keeps partial graphs out of place.
+            yield
+            return
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_atomically(path: str, write):
+    # write(temp_path) produces the file; it only appears at path once complete.
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def ensure_onnx_model(model_path: str, quantized: bool = False) -> str:
+    """
+    Returns the path of the ONNX graph for the model, exporting (and quantizing) it if needed.
+    Graphs are written to a temp file and renamed into place under a lock file, so a crash or a
+    concurrent export never leaves a partial graph at the final path.
+    """
+    onnx_dir = os.path.join(model_path, "onnx")
+    fp32_path = os.path.join(onnx_dir, "model.onnx")
+    int8_path = os.path.join(onnx_dir, "model.int8.onnx")
+    target_path = int8_path if quantized else fp32_path
+    if os.path.exists(target_path):
+        return target_path
+
+    with _export_lock(onnx_dir):
+        # Another process may have finished the export while this one waited for the lock.
+        if not os.path.exists(fp32_path):
+            _write_atomically(fp32_path, lambda temp_path: export_onnx(model_path, temp_path))
+        if quantized and not os.path.exists(int8_path):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            print(f"Quantizing {fp32_path} to int8...")
+            _write_atomically(
+                int8_path, lambda temp_path: quantize_dynamic(fp32_path, temp_path, weight_type=QuantType.QInt8)
+            )
+    return target_path
+
+
+def export_onnx(model_path: str, output_path: str):
+    """
+    Exports the transformer part of the local model to ONNX with dynamic batch and sequence axes.
+    """
+    import torch
+    from transformers import AutoModel
+
+    print(f"Exporting {model_path} to ONNX at {output_path}...")
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    model = AutoModel.from_pretrained(model_path, local_files_only=True)
+    model.eval()
+
+    class _HiddenStates(torch.nn.Module):
+        # Fixes the positional signature and output seen by the exporter across transformers versions.
+        def __init__(self, encoder):
+            super().__init__()
+            self.encoder = encoder
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.encoder(
+                input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids
+            ).last_hidden_state
+
+    dummy = {
+        "input_ids": torch.ones((1, 8), dtype=torch.long),
+        "attention_mask": torch.ones((1, 8), dtype=torch.long),
+        "token_type_ids": torch.zeros((1, 8), dtype=torch.long),
+    }
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in dummy}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            _HiddenStates(model),
+            (dummy["input_ids"], dummy["attention_mask"], dummy["token_type_ids"]),
+            output_path,
+            input_names=list(dummy),
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            dynamo=False,
+        )
+
+
+def load_backend(name: str, model_path: str):
+    """
+    Builds the embedding backend selected by name (one of BACKENDS).
+    """
+    if name == "sentence-transformers":
+        return SentenceTransformerBackend(model_path)
+    if name == "onnx":
+        return OnnxBackend(model_path, quantized=False)
+    if name == "onnx-int8":
+        return OnnxBackend(model_path, quantized=True)
+    raise ValueError(f"Unknown embedding backend '{name}'. Choose one of: {', '.join(BACKENDS)}.")
+
+
+PARITY_PAIRS = [
+    ("Senior Python developer with 6 years of experience building REST APIs in FastAPI and Django.",
+     "We are hiring a backend engineer with 5+ years of Python, FastAPI and PostgreSQL experience."),
+    ("Data scientist skilled in pandas, scikit-learn and deep learning with PyTorch.",
+     "Machine learning engineer to build and deploy PyTorch models to production."),
+    ("Embedded engineer working on C firmware for ARM microcontrollers and RTOS.",
+     "Frontend developer with React, TypeScript and CSS experience."),
+    ("Engineering manager leading a team of 12 across mobile and web.",
+     "Looking for an engineering manager to grow and mentor a product team."),
+    ("Junior accountant familiar with Excel and bookkeeping.",
+     "Staff software engineer to architect distributed systems on Kubernetes."),
+]
+
+
+def check_parity(reference, candidate, pairs: list[tuple[str, str]] = PARITY_PAIRS, tolerance: float = None) -> dict:
+    """
+    Compares cosine scores of a candidate backend against the reference backend on text pairs.
+    """
+    if tolerance is None:
+        tolerance = PARITY_TOLERANCE.get(getattr(candidate, "name", ""), 0.02)
+    texts = [text for pair in pairs for text in pair]
+    reference_embeddings = _normalize(reference.encode(texts))
+    candidate_embeddings = _normalize(candidate.encode(texts))
+
+    reference_scores = np.sum(reference_embeddings[0::2] * reference_embeddings[1::2], axis=1)
+    candidate_scores = np.sum(candidate_embeddings[0::2] * candidate_embeddings[1::2], axis=1)
+    max_difference = float(np.max(np.abs(reference_scores - candidate_scores)))
+    return {
+        "backend": getattr(candidate, "name", "unknown"),
+        "pairs": len(pairs),
+        "max_abs_difference": round(max_difference, 6),
+        "tolerance": tolerance,
+        "passed": max_difference <= tolerance,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Embedding backend utilities.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    parity = subparsers.add_parser("parity", help="Check a backend's cosine scores against the fp32 model.")
+    parity.add_argument("--backend", choices=BACKENDS, required=True)
+    parity.add_argument("--model-path", default=None)
+    parity.add_argument("--tolerance", type=float, default=None)
+    export = subparsers.add_parser("export", help="Export the ONNX graphs (fp32 and int8).")
+    export.add_argument("--model-path", default=None)
+    args = parser.parse_args(argv)
+
+    from services.match_service import MODEL_LOCAL_PATH
+    model_path = args.model_path or MODEL_LOCAL_PATH
+
+    if args.command == "export":
+        print(ensure_onnx_model(model_path, quantized=False))
+        print(ensure_onnx_model(model_path, quantized=True))
+        return 0
+
+    result = check_parity(
+        load_backend("sentence-transformers", model_path),
+        load_backend(args.backend, model_path),
+        tolerance=args.tolerance,
+    )
+    print(json.dumps(result, indent=2))
+    return 0 if result["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+# api/services/embedding_cache.py
+import hashlib
+import json
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes text before hashing so trivially different copies share a cache entry.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_cache_key(text: str, model_id: str) -> str:
+    """
+    Builds a content-addressed key from the model identity and the normalized text.
+    """
+    digest = hashlib.sha256()
+    digest.update(model_id.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class DiskEmbeddingStore:
+    """
+    Append-only on-disk embedding store.
+    Vectors live in a flat memory-mapped file of fixed-width rows; each index line records a key and
+    its row. The store is for a single process: several uvicorn workers sharing one directory would
+    interleave their appends, so give each worker its own directory or leave the disk tier off.
+    """
+
+    DATA_FILE = "embeddings.bin"
+    INDEX_FILE = "index.txt"
+    META_FILE = "meta.json"
+
+    def __init__(self, directory: str, dtype: str = "float16"):
+        self.directory = directory
+        self.dtype = np.dtype(dtype)
+        self.dim = None
+        self._rows = {}
+        self._mmap = None
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @property
+    def _data_path(self) -> str:
+        return os.path.join(self.directory, self.DATA_FILE)
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, self.INDEX_FILE)
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, self.META_FILE)
+
+    def _load(self):
+        if not os.path.exists(self._meta_path):
+            return
+        with open(self._meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("dtype") != self.dtype.name:
+            print(f"WARNING: Embedding cache at {self.directory} uses {meta.get('dtype')}, expected {self.dtype.name}. Ignoring it.")
+            return
+        self.dim = meta["dim"]
+
+        row_bytes = self.dim * self.dtype.itemsize
+        complete_rows = 0
+        if os.path.exists(self._data_path):
+            complete_rows = os.path.getsize(self._data_path) // row_bytes
+            # Drop a half-written row so the next append starts on a row boundary.
+            os.truncate(self._data_path, complete_rows * row_bytes)
+        if os.path.exists(self._index_path):
+            line = ""
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    row, _, key = line.strip().partition("\t")
+                    # A crash between the two writes leaves a row without an index line (never read) or,
+                    # if the index line is torn, a line that does not parse; neither shifts other keys.
+                    if key and row.isdigit() and int(row) < complete_rows:
+                        self._rows[key] = int(row)
+            if line and not line.endswith("\n"):
+                # End a torn last line so the next key does not join it.
+                with open(self._index_path, "a", encoding="utf-8") as f:
+                    f.write("\n")
+
+    def _write_meta(self):
+        with open(self._meta_path, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "dtype": self.dtype.name}, f)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, key: str):
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        if self._mmap is None or row >= self._mmap.shape[0]:
+            # The file has grown since it was last mapped.
+            self._mmap = np.memmap(self._data_path, dtype=self.dtype, mode="r").reshape(-1, self.dim)
+        return np.asarray(self._mmap[row], dtype=np.float32)
+
+    def put(self, key: str, vector: np.ndarray):
+        if key in self._rows:
+            return
+        if self.dim is None:
+            self.dim = int(vector.shape[0])
+            self._write_meta()
+        elif vector.shape[0] != self.dim:
+            raise ValueError(f"Embedding dimension {vector.shape[0]} does not match cache dimension {self.dim}.")
+
+        row_bytes = self.dim * self.dtype.itemsize
+        with open(self._data_path, "ab") as f:
+            row = f.tell() // row_bytes
+            f.write(np.asarray(vector, dtype=self.dtype).tobytes())
+        with open(self._index_path, "a", encoding="utf-8") as f:
+            f.write(f"{row}\t{key}\n")
+        self._rows[key] = row
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache: a bounded in-memory LRU in front of an optional on-disk store.
+    """
+
+    def __init__(self, max_entries: int = 2048, disk_dir: str = None, disk_dtype: str = "float16"):
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = DiskEmbeddingStore(disk_dir, disk_dtype) if disk_dir else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        """
+        Returns the cached embedding for a key, or None on a miss.
+        """
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return vector
+
+            if self._disk is not None:
+                vector = self._disk.get(key)
+                if vector is not None:
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+                    return vector
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, vector: np.ndarray):
+        """
+        Stores an embedding in memory and, when enabled, on disk.
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._remember(key, vector)
+            if self._disk is not None:
+                try:
+                    self._disk.put(key, vector)
+                except (OSError, ValueError) as e:
+                    print(f"WARNING: Failed to persist embedding to disk cache: {e}")
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        """
+        Clears the in-memory tier and resets the counters. The disk tier is left intact.
+        """
+        with self._lock:
+            self._memory.clear()
+            self.memory_hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "max_memory_entries": self.max_entries,
+                "disk_entries": len(self._disk) if self._disk is not None else None,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
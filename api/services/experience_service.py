@@ -0,0 +1,199 @@
+# api/services/experience_service.py
+import bisect
+import datetime
+import re
+from dataclasses import dataclass, field
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sept?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)(?![a-z])\.?"
+)
+_YEAR = r"(?:19|20)\d{2}"
+_PRESENT = r"(?:present|current|now|today|date)"
+_DASH = r"[ \t]{0,3}(?:-|–|—|to|until|till)[ \t]{0,3}"
+
+# One pass over the document finds both kinds of evidence. Every quantifier is bounded and no
+# repetition is nested, so each start position does constant work and the scan stays linear
+# even on adversarial input (e.g. a megabyte of digits or spaces).
+_EXPERIENCE_PATTERN = re.compile(
+    # "6 years of experience", "5+ yrs", "10 plus years", "3 YOE", "4y"
+    r"(?<![\w.])(?P<count>\d{1,2})(?!\d)[ \t]{0,3}(?:\+|plus)?[ \t]{0,3}"
+    r"(?:(?P<unit>years?|yrs?|yoes?)\b(?P<context>[ \t]{0,3}(?:of[ \t]{1,3})?(?:experience|exp\b))?|(?P<short>y|yr)\b)"
+    # "Jan 2018 - Present", "March 2015 to June 2019", "2015-2019", "03/2018 - 06/2020"
+    rf"|(?<![\w/])(?:(?P<start_month>{_MONTH})[ \t]{{0,3}},?[ \t]{{0,2}}|(?P<start_mm>0?[1-9]|1[0-2])/)?(?P<start_year>{_YEAR})"
+    rf"{_DASH}"
+    rf"(?:(?:(?P<end_month>{_MONTH})[ \t]{{0,3}},?[ \t]{{0,2}}|(?P<end_mm>0?[1-9]|1[0-2])/)?(?P<end_year>{_YEAR})(?!\d)|(?P<present>{_PRESENT})\b)",
+    re.IGNORECASE,
+)
+
+# Date ranges labelled like these are studies, not employment. Only degree and institution
+# names count: bare "master", "MS" or "school" also appear in job titles and employers
+# ("Scrum Master", "MS Office team", "Lincoln High School").
+_EDUCATION_PATTERN = re.compile(
+    r"\b(?:universit(?:y|ies)|college|institute[ \t]of[ \t]technology|polytechnic|bachelor(?:'?s)?"
+    r"|masters?(?:'s)?[ \t]{1,3}(?:of|in|degree)|doctorate|ph\.?[ \t]?d|mba|bsc|msc|b\.?tech|m\.?tech"
+    r"|degree|diploma|gpa|graduated|thesis)\b"
+    r"|\b[bm]\.[ \t]?(?:sc?|a|e|eng)\b",
+    re.IGNORECASE,
+)
+
+# Lines that are nothing but a section heading. Date ranges under an education heading are
+# studies whatever their own line says; any other heading ends the education section.
+_SECTION_HEADER_PATTERN = re.compile(
+    r"^[ \t]{0,8}(?:(?P<education>education(?:al)?(?:[ \t]{1,3}(?:background|history|qualifications|(?:&|and)[ \t]{1,3}training))?"
+    r"|academics?(?:[ \t]{1,3}(?:background|history|qualifications))?)"
+    r"|(?:(?:work|professional|employment|career|relevant)[ \t]{1,3})?(?:experience|history)|employment(?:[ \t]{1,3}history)?"
+    r"|projects|(?:technical[ \t]{1,3})?skills|certifications?|summary|profile|awards|publications)[ \t]{0,3}:?[ \t]{0,8}$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_LABEL_CONTEXT = 120
+
+
+@dataclass
+class RoleSpan:
+    """
+    One employment date range and its label: the text on the same line (usually title and
+    company), or the line above when the dates stand on their own line.
+    """
+    label: str
+    start: str
+    end: str
+    months: int
+
+
+@dataclass
+class ExperienceSummary:
+    # Largest "N years of experience" phrase, and largest bare "N years"/"Ny" phrase.
+    stated_years: int = 0
+    loose_years: int = 0
+    # Total of the employment date ranges, with overlapping ranges counted once.
+    range_months: int = 0
+    roles: list[RoleSpan] = field(default_factory=list)
+
+    @property
+    def years(self) -> int:
+        """
+        Best single estimate: an explicit experience statement, else the employment
+        history, else any bare year count.
+        """
+        if self.stated_years:
+            return self.stated_years
+        if self.range_months:
+            return self.range_months // 12
+        return self.loose_years
+
+
+def _month_index(month_name: str, month_number: str, year: str, default_month: int) -> int:
+    if month_name:
+        month = _MONTHS[month_name[:3].lower()]
+    elif month_number:
+        month = int(month_number)
+    else:
+        month = default_month
+    return int(year) * 12 + month - 1
+
+
+def _line_label(text: str, start: int, end: int) -> str:
+    line_start = text.rfind("\n", max(0, start - _LABEL_CONTEXT), start) + 1
+    line_end = text.find("\n", end, end + _LABEL_CONTEXT)
+    if line_end == -1:
+        line_end = min(len(text), end + _LABEL_CONTEXT)
+    if line_start == 0 and start > _LABEL_CONTEXT:
+        line_start = start - _LABEL_CONTEXT
+    # The role is usually written before the dates ("Engineer, Acme | 2018 - 2020"); the text
+    # after them is only used when the dates open the line, and the line above when the dates
+    # are alone on theirs ("Engineer, Acme\n2018 - 2020").
+    label = _clean_label(text[line_start:start]) or _clean_label(text[end:line_end])
+    if not label and line_start > 0:
+        previous_start = text.rfind("\n", max(0, line_start - 1 - _LABEL_CONTEXT), line_start - 1) + 1
+        label = _clean_label(text[previous_start:line_start - 1])
+    return label
+
+
+def _clean_label(fragment: str) -> str:
+    return " ".join(fragment.replace("|", " ").split()).strip(" ,;:.()-–—")
+
+
+def merge_intervals(intervals: list[tuple[int, int]]) -> int:
+    """
+    Total length of half-open [start, end) month intervals, counting overlaps once.
+    """
+    total = 0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def _format_month(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def scan_experience(text: str, today: datetime.date = None) -> ExperienceSummary:
+    """
+    Scans the text once for experience statements and employment date ranges.
+    Ranges ending in "Present" run to the current month; ranges without months run
+    from January to January ("2015-2019" is four years).
+    """
+    today = today or datetime.date.today()
+    now_index = today.year * 12 + today.month - 1
+    summary = ExperienceSummary()
+    intervals = []
+    headers = [(header.start(), header.group("education") is not None)
+               for header in _SECTION_HEADER_PATTERN.finditer(text)]
+    header_positions = [position for position, _ in headers]
+
+    for match in _EXPERIENCE_PATTERN.finditer(text):
+        if match.group("count") is not None:
+            years = int(match.group("count"))
+            if match.group("context") or (match.group("unit") or "").lower().startswith("yoe"):
+                summary.stated_years = max(summary.stated_years, years)
+            else:
+                summary.loose_years = max(summary.loose_years, years)
+            continue
+
+        start_index = _month_index(match.group("start_month"), match.group("start_mm"), match.group("start_year"), 1)
+        if match.group("present"):
+            # The current month counts as worked.
+            end_index = now_index + 1
+        else:
+            explicit_month = match.group("end_month") or match.group("end_mm")
+            end_index = _month_index(match.group("end_month"), match.group("end_mm"), match.group("end_year"), 1)
+            if explicit_month:
+                end_index += 1
+        end_index = min(end_index, now_index + 1)
+        if end_index <= start_index or end_index - start_index > 50 * 12:
+            continue
+
+        label = _line_label(text, match.start(), match.end())
+        section = bisect.bisect_right(header_positions, match.start()) - 1
+        if (section >= 0 and headers[section][1]) or _EDUCATION_PATTERN.search(label):
+            continue
+        intervals.append((start_index, end_index))
+        summary.roles.append(RoleSpan(
+            label=label,
+            start=_format_month(start_index),
+            end="present" if match.group("present") else _format_month(end_index - 1),
+            months=end_index - start_index,
+        ))
+
+    summary.range_months = merge_intervals(intervals)
+    return summary
+
+
+def extract_experience(text: str) -> int:
+    """
+    Years of experience stated or implied by the text (see ExperienceSummary.years).
+    """
+    return scan_experience(text).years
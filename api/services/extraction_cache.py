@@ -0,0 +1,137 @@
+# api/services/extraction_cache.py
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def make_extraction_key(data: bytes, extractor_version: str) -> str:
+    """
+    Content-addressed key: SHA-256 of the uploaded bytes plus the extractor version,
+    so changing the extractor (or its budgets) never serves stale text.
+    """
+    digest = hashlib.sha256()
+    digest.update(extractor_version.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Extracted-text cache: a bounded in-memory LRU in front of an optional on-disk tier.
+    Disk entries are plain UTF-8 files named by key and expire ttl_seconds after they were written.
+    """
+
+    def __init__(self, max_entries: int = 256, disk_dir: str = None, ttl_seconds: int = 7 * 24 * 3600,
+                 sweep_interval_seconds: int = 3600):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.txt")
+
+    def get(self, key: str):
+        """
+        Returns the cached text for a key, or None on a miss.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                text, stored_at = entry
+                if time.time() - stored_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return text
+                del self._memory[key]
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                stored_at = os.path.getmtime(path)
+                if time.time() - stored_at <= self.ttl_seconds:
+                    with open(path, "r", encoding="utf-8") as f:
+                        text = f.read()
+                    with self._lock:
+                        self._remember(key, text, stored_at)
+                        self.disk_hits += 1
+                    return text
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"WARNING: Failed to read extraction cache entry {key}: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, text: str):
+        """
+        Stores extracted text in memory and, when enabled, on disk.
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, text, now)
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        # Written to a temporary name and renamed, so readers never see a partial file.
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"WARNING: Failed to persist extraction cache entry {key}: {e}")
+        if now - self._last_sweep >= self.sweep_interval_seconds:
+            self._last_sweep = now
+            self.sweep()
+
+    def _remember(self, key: str, text: str, stored_at: float):
+        self._memory[key] = (text, stored_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def sweep(self) -> int:
+        """
+        Deletes expired disk entries. Returns how many were removed.
+        """
+        if not self.disk_dir:
+            return 0
+        removed = 0
+        cutoff = time.time() - self.ttl_seconds
+        for entry in os.scandir(self.disk_dir):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "max_memory_entries": self.max_entries,
+                "disk_enabled": bool(self.disk_dir),
+                "ttl_seconds": self.ttl_seconds,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
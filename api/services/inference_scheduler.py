@@ -0,0 +1,152 @@
+# api/services/inference_scheduler.py
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from services import match_service
+
+# Model inference, Presidio and NLTK are CPU-bound and synchronous. Running them on this pool
+# keeps the asyncio event loop free to serve other connections. PyTorch releases the GIL
+# during inference, so threads are enough here.
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", str(min(4, os.cpu_count() or 1))))
+ENCODE_BATCH_MAX_ITEMS = int(os.getenv("ENCODE_BATCH_MAX_ITEMS", "32"))
+ENCODE_BATCH_MAX_WAIT_MS = float(os.getenv("ENCODE_BATCH_MAX_WAIT_MS", "5"))
+
+executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+
+
+async def run_in_worker(func, *args, **kwargs):
+    """
+    Runs a synchronous, CPU-bound function on the inference pool and awaits its result.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+class EncodeBatcher:
+    """
+    Dynamic micro-batcher for embedding requests.
+
+    Concurrent callers enqueue their texts; a single consumer task gathers requests until either
+    `max_batch_items` texts are waiting or `max_wait_ms` has passed since the first one arrived,
+    runs one batched encode on the worker pool, and hands each caller its own slice of the result.
+    """
+
+    def __init__(self, encode_fn, max_batch_items: int = 32, max_wait_ms: float = 5.0):
+        self.encode_fn = encode_fn
+        self.max_batch_items = max_batch_items
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = None
+        self._task = None
+        self._loop = None
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def encode(self, texts: list[str]) -> np.ndarray:
+        """
+        Encodes texts as part of the next micro-batch.
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        self._ensure_started()
+        future = self._loop.create_future()
+        await self._queue.put((list(texts), future))
+        return await future
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        count = len(batch[0][0])
+        deadline = self._loop.time() + self.max_wait
+        while count < self.max_batch_items:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            count += len(item[0])
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            # Callers that gave up (e.g. client disconnected) are dropped before encoding.
+            batch = [(texts, future) for texts, future in batch if not future.done()]
+            if not batch:
+                continue
+            all_texts = [text for texts, _ in batch for text in texts]
+
+            try:
+                embeddings = await self._loop.run_in_executor(executor, self.encode_fn, all_texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for texts, future in batch:
+                if not future.done():
+                    future.set_result(embeddings[offset:offset + len(texts)])
+                offset += len(texts)
+
+            with self._stats_lock:
+                self.batches += 1
+                self.items += len(all_texts)
+                self.largest_batch = max(self.largest_batch, len(all_texts))
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "average_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "largest_batch": self.largest_batch,
+                "max_batch_items": self.max_batch_items,
+                "max_wait_ms": self.max_wait * 1000.0,
+            }
+
+
+encode_batcher = EncodeBatcher(
+    match_service.encode_texts,
+    max_batch_items=ENCODE_BATCH_MAX_ITEMS,
+    max_wait_ms=ENCODE_BATCH_MAX_WAIT_MS,
+)
+
+
+async def prefetch_embeddings(texts: list[str]):
+    """
+    Encodes texts through the micro-batcher so they land in the embedding cache.
+    The synchronous analysis that follows on the worker pool then finds them already encoded.
+    """
+    texts = [text for text in texts if text]
+    # Never wait for the model on the event loop: until it is ready, the worker loads or waits for it.
+    if not texts or match_service.sentence_model_slot.state != "ready":
+        return
+    await encode_batcher.encode(texts)
+
+
+def shutdown():
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def stats() -> dict:
+    return {
+        "workers": INFERENCE_WORKERS,
+        "encode_batcher": encode_batcher.stats(),
+    }
@@ -0,0 +1,82 @@
+# api/services/jd_profile_service.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from services import match_service
+from services import skills_service
+from services.embedding_cache import normalize_text
+
+# Registered JD profiles, most recently used last. Bounded so a long-running worker
+# cannot accumulate profiles for every posting it has ever seen.
+MAX_JD_PROFILES = int(os.getenv("JD_PROFILE_LIMIT", "1000"))
+
+_profiles = OrderedDict()
+_lock = threading.Lock()
+
+
+def make_jd_id(jd_text: str) -> str:
+    """
+    Derives a stable id from the JD content, so registering the same JD twice returns the same id.
+    """
+    return hashlib.sha256(normalize_text(jd_text).encode("utf-8")).hexdigest()[:16]
+
+
+def register_jd(jd_text: str) -> tuple[str, match_service.JDProfile]:
+    """
+    Builds (or reuses) the profile for a job description and returns its id and profile.
+    """
+    jd_id = make_jd_id(jd_text)
+    with _lock:
+        profile = _profiles.get(jd_id)
+        if profile is not None:
+            _profiles.move_to_end(jd_id)
+            return jd_id, profile
+
+    # Built outside the lock: it runs the model and TF-IDF weighting.
+    profile = match_service.build_jd_profile(jd_text)
+    match_service.term_stats.add_documents([jd_text])
+    with _lock:
+        _profiles[jd_id] = profile
+        _profiles.move_to_end(jd_id)
+        while len(_profiles) > MAX_JD_PROFILES:
+            _profiles.popitem(last=False)
+    return jd_id, profile
+
+
+def get_jd_profile(jd_id: str):
+    """
+    Returns the registered profile for a JD id, or None if it is unknown or was evicted.
+    """
+    with _lock:
+        profile = _profiles.get(jd_id)
+        if profile is not None:
+            _profiles.move_to_end(jd_id)
+        return profile
+
+
+def delete_jd_profile(jd_id: str) -> bool:
+    """
+    Removes a registered profile. Returns False if the id was not registered.
+    """
+    with _lock:
+        return _profiles.pop(jd_id, None) is not None
+
+
+def describe_jd_profile(jd_id: str, profile: match_service.JDProfile) -> dict:
+    """
+    Summarizes a profile for API responses.
+    """
+    return {
+        "jd_id": jd_id,
+        "required_experience": profile.experience,
+        "roles": sorted(profile.roles),
+        "top_keywords": [word for word, _ in profile.keyword_scores[:10]],
+        "skills": sorted(skills_service.get_skill_ontology().names[skill_id] for skill_id in profile.skills.indices),
+    }
+
+
+def stats() -> dict:
+    with _lock:
+        return {"registered": len(_profiles), "max_registered": MAX_JD_PROFILES}
@@ -0,0 +1,155 @@
+# api/services/job_search_service.py
+import json
+import os
+import threading
+
+from services import match_service
+from services.vector_index import VectorIndex, npz_path
+
+# Set JOB_INDEX_PATH (e.g. "job_index/jobs.npz") to persist the job corpus across restarts.
+# ".npz" is added to the path if it is missing.
+JOB_INDEX_PATH = os.getenv("JOB_INDEX_PATH") or None
+
+job_index = VectorIndex(
+    nprobe=int(os.getenv("JOB_INDEX_NPROBE", "8")),
+    ivf_min_size=int(os.getenv("JOB_INDEX_IVF_MIN_SIZE", "4096")),
+)
+
+# Per-job metadata used to re-rank vector hits with the existing experience and role checks.
+_jobs = {}
+_lock = threading.Lock()
+
+
+def _metadata_path(index_path: str) -> str:
+    return os.path.splitext(npz_path(index_path))[0] + ".meta.json"
+
+
+def load_index(path: str = JOB_INDEX_PATH):
+    """
+    Loads a previously saved job corpus, if one exists.
+    """
+    if not path or not os.path.exists(npz_path(path)):
+        return
+    try:
+        with open(_metadata_path(path), "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        job_index.load(path)
+        with _lock:
+            _jobs.update(metadata)
+        print(f"Loaded {len(job_index)} jobs into the search index from {path}.")
+    except Exception as e:
+        print(f"ERROR: Failed to load job index from {path}: {e}")
+
+
+def save_index(path: str = JOB_INDEX_PATH):
+    """
+    Saves the job corpus so it survives restarts. No-op when no path is configured.
+    """
+    if not path:
+        return
+    job_index.save(path)
+    with _lock:
+        metadata = dict(_jobs)
+    with open(_metadata_path(path), "w", encoding="utf-8") as f:
+        json.dump(metadata, f)
+
+
+def add_jobs(jobs: list[tuple[str, str, str]], batch_size: int = 64) -> int:
+    """
+    Indexes (job_id, title, jd_text) triples. Existing job ids are replaced.
+    Returns the number of jobs indexed.
+    """
+    jobs = [(job_id, title, jd_text) for job_id, title, jd_text in jobs if jd_text]
+    if not jobs:
+        return 0
+    if match_service.get_sentence_model() is None:
+        raise RuntimeError("Semantic similarity model not loaded; jobs cannot be indexed.")
+
+    for start in range(0, len(jobs), batch_size):
+        batch = jobs[start:start + batch_size]
+        embeddings = match_service.encode_texts([jd_text for _, _, jd_text in batch], batch_size=batch_size)
+        metadata = {
+            job_id: {
+                "title": title,
+                "experience": match_service.extract_experience(jd_text),
+                "roles": sorted(match_service.extract_job_title_keywords(jd_text)),
+            }
+            for job_id, title, jd_text in batch
+        }
+        with _lock:
+            _jobs.update(metadata)
+        job_index.add([job_id for job_id, _, _ in batch], embeddings)
+        match_service.term_stats.add_documents([jd_text for _, _, jd_text in batch])
+    return len(jobs)
+
+
+def delete_jobs(job_ids: list[str]) -> int:
+    """
+    Removes jobs from the index. Returns the number of jobs that were present.
+    """
+    removed = job_index.delete(job_ids)
+    with _lock:
+        for job_id in job_ids:
+            _jobs.pop(job_id, None)
+    return removed
+
+
+def search_jobs(
+    resume_text: str,
+    top_k: int = 10,
+    candidate_multiplier: int = 5,
+    experience_diff_tolerance: int = 5,
+    exact: bool = False
+) -> list[dict]:
+    """
+    Recommends the top_k jobs for a resume.
+    Pulls top_k * candidate_multiplier nearest jobs from the vector index, then re-ranks them
+    with the same experience-gap and role-overlap checks used by check_mismatch_and_threshold.
+    """
+    if match_service.get_sentence_model() is None or not resume_text or len(job_index) == 0:
+        return []
+
+    resume_embedding = match_service.encode_texts([resume_text])[0]
+    hits = job_index.search(resume_embedding, top_k=top_k * candidate_multiplier, exact=exact)
+
+    resume_exp = match_service.extract_experience(resume_text)
+    resume_roles = set(match_service.extract_job_title_keywords(resume_text))
+
+    results = []
+    with _lock:
+        for job_id, similarity in hits:
+            job = _jobs.get(job_id)
+            if job is None:
+                continue
+            jd_exp = job["experience"]
+            jd_roles = set(job["roles"])
+
+            experience_gap = jd_exp > 0 and resume_exp > 0 and abs(jd_exp - resume_exp) > experience_diff_tolerance
+            missing_experience = jd_exp > 0 and resume_exp == 0
+            role_overlap = len(resume_roles & jd_roles) / len(jd_roles) if jd_roles and resume_roles else 0.0
+
+            score = similarity + 0.05 * role_overlap
+            if experience_gap:
+                score -= 0.10
+            elif missing_experience:
+                score -= 0.05
+
+            results.append({
+                "job_id": job_id,
+                "title": job["title"],
+                "match_percentage": round(similarity * 100, 2),
+                "score": round(score * 100, 2),
+                "required_experience": jd_exp,
+                "experience_gap": experience_gap,
+                "role_overlap": round(role_overlap, 2),
+            })
+
+    results.sort(key=lambda result: result["score"], reverse=True)
+    return results[:top_k]
+
+
+def stats() -> dict:
+    return job_index.stats()
+
+
+load_index()
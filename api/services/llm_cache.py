@@ -0,0 +1,142 @@
+# api/services/llm_cache.py
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def make_llm_cache_key(model: str, config: dict, prompt: str) -> str:
+    """
+    Content-addressed key for one generation: the model, its sampling parameters and the full
+    prompt. The prompt embeds the masked resume and the JD, so keys never contain raw PII, and
+    changing the prompt template never serves stale output.
+    """
+    digest = hashlib.sha256()
+    digest.update(model.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(json.dumps(config, sort_keys=True).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LLMResultCache:
+    """
+    In-memory LRU of LLM outputs with a TTL, bounded by entry count and total characters.
+
+    Outputs are stored still masked; callers unmask them with their own pii_map. Concurrent
+    misses for the same key are coalesced: one upstream call runs and every caller awaits it.
+    Only successful results are stored, so a failure is retried by the next request.
+    """
+
+    def __init__(self, max_entries: int = 128, max_chars: int = 8_000_000, ttl_seconds: int = 3600):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._chars = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: str):
+        """
+        Returns the cached output for a key, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                text, stored_at = entry
+                if time.time() - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return text
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+        return None
+
+    def put(self, key: str, text: str):
+        """
+        Stores an output, evicting the least recently used entries beyond the size bounds.
+        """
+        if not self.enabled or len(text) > self.max_chars:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (text, time.time())
+            self._chars += len(text)
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        text, _ = self._entries.pop(key)
+        self._chars -= len(text)
+
+    async def get_or_generate(self, key: str, generate) -> str:
+        """
+        Returns the cached output for a key, or awaits generate() to produce and store it.
+        A caller arriving while the same key is being generated shares that call instead of
+        starting another. The call runs as its own task, so it still completes and fills the
+        cache when the caller that started it goes away (e.g. a frontend timeout and retry).
+        """
+        if not self.enabled:
+            return await generate()
+        text = self.get(key)
+        if text is not None:
+            return text
+
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            with self._lock:
+                self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._generate_and_store(key, generate))
+            # Marks a failure as seen even when every caller has gone away.
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _generate_and_store(self, key: str, generate) -> str:
+        try:
+            text = await generate()
+            self.put(key, text)
+            return text
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "chars": self._chars,
+                "max_chars": self.max_chars,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._inflight),
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,310 @@
+# api/services/llm_client.py
+import asyncio
+import contextlib
+import os
+import random
+import threading
+import time
+
+import httpx
+
+GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+# Points the client somewhere other than the public Gemini endpoint, e.g. a local stub server in tests.
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL") or None
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+# Callers allowed to wait for a free slot; beyond this, calls are rejected instead of queued.
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "16"))
+# Deadline for one attempt, and for the whole call including queueing, retries and backoff.
+LLM_ATTEMPT_TIMEOUT_S = float(os.getenv("LLM_ATTEMPT_TIMEOUT_S", "60"))
+LLM_DEADLINE_S = float(os.getenv("LLM_DEADLINE_S", "120"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE_S = float(os.getenv("LLM_BACKOFF_BASE_S", "0.5"))
+LLM_BACKOFF_MAX_S = float(os.getenv("LLM_BACKOFF_MAX_S", "8"))
+LLM_KEEPALIVE_S = float(os.getenv("LLM_KEEPALIVE_S", "30"))
+
+# Rate limiting, overload and gateway failures are worth another attempt; other errors are not.
+TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class LLMOverloadedError(Exception):
+    """
+    Raised when too many calls are already waiting for the LLM.
+    """
+
+
+class LLMTimeoutError(Exception):
+    """
+    Raised when a call does not finish within its deadline.
+    """
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Whether a failed attempt is worth retrying.
+    """
+    from google.genai import errors
+
+    if isinstance(error, errors.APIError):
+        return error.code in TRANSIENT_STATUS_CODES
+    return isinstance(error, (asyncio.TimeoutError, httpx.TransportError))
+
+
+async def _close_quietly(stream):
+    if stream is None:
+        return
+    try:
+        await stream.aclose()
+    except Exception:
+        pass
+
+
+class LLMClientManager:
+    """
+    Process-wide Gemini client with bounded concurrency, deadlines and retries.
+
+    The google.genai client and its pooled HTTP connections are created on first use and shared
+    by every call. At most `max_concurrency` calls are in flight; up to `max_queue` more wait for
+    a slot and anything beyond that fails fast with LLMOverloadedError. Transient failures are
+    retried with full-jitter exponential backoff until `max_retries` or the call deadline runs out.
+    """
+
+    def __init__(
+        self,
+        model: str = GEMINI_MODEL_NAME,
+        base_url: str = GEMINI_BASE_URL,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_queue: int = LLM_MAX_QUEUE,
+        attempt_timeout_s: float = LLM_ATTEMPT_TIMEOUT_S,
+        deadline_s: float = LLM_DEADLINE_S,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base_s: float = LLM_BACKOFF_BASE_S,
+        backoff_max_s: float = LLM_BACKOFF_MAX_S,
+        rng: random.Random = None
+    ):
+        self.model = model
+        self.base_url = base_url
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.attempt_timeout_s = attempt_timeout_s
+        self.deadline_s = deadline_s
+        self.max_retries = max(0, max_retries)
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.rng = rng or random.Random()
+        self._client = None
+        self._http_client = None
+        self._api_key = None
+        self._semaphore = None
+        self._loop = None
+        self._waiting = 0
+        self._in_flight = 0
+        self._stats_lock = threading.Lock()
+        self.clients_created = 0
+        self.calls = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.total_latency = 0.0
+
+    def _ensure_client(self, api_key: str):
+        # The HTTP pool and semaphore belong to one event loop; a new loop (or key) gets new ones.
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._loop is loop and self._api_key == api_key:
+            return
+        from google import genai
+        from google.genai import types
+
+        if self._http_client is not None and self._loop is loop:
+            loop.create_task(self._http_client.aclose())
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+                keepalive_expiry=LLM_KEEPALIVE_S
+            ),
+            follow_redirects=True
+        )
+        self._client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(
+                base_url=self.base_url,
+                timeout=int(self.attempt_timeout_s * 1000),
+                httpx_async_client=self._http_client
+            )
+        )
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._waiting = 0
+            self._in_flight = 0
+        self._loop = loop
+        self._api_key = api_key
+        with self._stats_lock:
+            self.clients_created += 1
+
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        Full-jitter backoff: uniform between 0 and the capped exponential delay for this attempt.
+        """
+        return self.rng.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2 ** attempt))
+
+    @contextlib.asynccontextmanager
+    async def _call(self, api_key: str):
+        """
+        Admits one call: enforces the queue limit, holds a concurrency slot for the duration and
+        records the outcome. Yields the call's deadline on the event loop clock.
+        """
+        self._ensure_client(api_key)
+        start = time.perf_counter()
+        deadline = self._loop.time() + self.deadline_s
+        with self._stats_lock:
+            self.calls += 1
+
+        if self._in_flight + self._waiting >= self.max_concurrency + self.max_queue:
+            with self._stats_lock:
+                self.rejected += 1
+            raise LLMOverloadedError(
+                f"Too many AI optimization requests in progress ({self._in_flight} running, {self._waiting} waiting). Try again shortly."
+            )
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), max(0.0, deadline - self._loop.time()))
+        except asyncio.TimeoutError:
+            self._record_failure(timed_out=True)
+            raise LLMTimeoutError(f"Timed out after {self.deadline_s:.0f}s waiting for a free AI optimization slot.")
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        try:
+            yield deadline
+        except LLMTimeoutError:
+            self._record_failure(timed_out=True)
+            raise
+        except Exception:
+            self._record_failure()
+            raise
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+        with self._stats_lock:
+            self.succeeded += 1
+            self.total_latency += time.perf_counter() - start
+
+    def _attempt_timeout(self, deadline: float) -> float:
+        remaining = deadline - self._loop.time()
+        if remaining <= 0:
+            raise LLMTimeoutError(f"AI optimization did not finish within {self.deadline_s:.0f}s.")
+        return min(self.attempt_timeout_s, remaining)
+
+    def _retry_delay(self, error: Exception, attempt: int, deadline: float) -> float:
+        # Returns how long to back off before retrying, or re-raises when the error is final.
+        delay = self.backoff_delay(attempt)
+        give_up = (
+            attempt >= self.max_retries
+            or not is_transient_error(error)
+            or self._loop.time() + delay >= deadline
+        )
+        if give_up and isinstance(error, asyncio.TimeoutError):
+            raise LLMTimeoutError(f"AI optimization timed out after {attempt + 1} attempt(s).") from error
+        if give_up:
+            raise error
+        print(f"Transient error calling Gemini API (attempt {attempt + 1}): {error}. Retrying in {delay:.2f}s.")
+        with self._stats_lock:
+            self.retries += 1
+        return delay
+
+    async def generate(self, prompt: str, api_key: str, config=None) -> str:
+        """
+        Sends one generate_content call and returns the response text.
+        Raises LLMOverloadedError, LLMTimeoutError, or the last upstream error once retries run out.
+        """
+        async with self._call(api_key) as deadline:
+            attempt = 0
+            while True:
+                try:
+                    response = await asyncio.wait_for(
+                        self._client.aio.models.generate_content(model=self.model, contents=prompt, config=config),
+                        self._attempt_timeout(deadline)
+                    )
+                    return response.text
+                except Exception as e:
+                    await asyncio.sleep(self._retry_delay(e, attempt, deadline))
+                    attempt += 1
+
+    async def generate_stream(self, prompt: str, api_key: str, config=None):
+        """
+        Streams the response text chunk by chunk as generate_content_stream delivers it.
+        Failures before the first chunk are retried like generate(); once text has been yielded
+        the stream cannot be replayed, so later errors propagate. Each chunk must arrive within
+        the attempt timeout and the whole stream within the call deadline.
+        """
+        async with self._call(api_key) as deadline:
+            attempt = 0
+            while True:
+                started = False
+                stream = None
+                try:
+                    stream = await asyncio.wait_for(
+                        self._client.aio.models.generate_content_stream(model=self.model, contents=prompt, config=config),
+                        self._attempt_timeout(deadline)
+                    )
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(anext(stream), self._attempt_timeout(deadline))
+                        except StopAsyncIteration:
+                            return
+                        if chunk.text:
+                            started = True
+                            yield chunk.text
+                except Exception as e:
+                    if started and isinstance(e, asyncio.TimeoutError):
+                        raise LLMTimeoutError("AI optimization stream stalled.") from e
+                    if started:
+                        raise
+                    delay = self._retry_delay(e, attempt, deadline)
+                finally:
+                    # Also runs when the consumer stops early, so the upstream response is released.
+                    await _close_quietly(stream)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def _record_failure(self, timed_out: bool = False):
+        with self._stats_lock:
+            self.failed += 1
+            if timed_out:
+                self.timeouts += 1
+
+    async def aclose(self):
+        """
+        Closes the pooled HTTP connections. The next call opens a fresh client.
+        """
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        self._client = None
+        self._http_client = None
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "model": self.model,
+                "base_url": self.base_url,
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "calls": self.calls,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "retries": self.retries,
+                "timeouts": self.timeouts,
+                "average_latency_s": round(self.total_latency / self.succeeded, 4) if self.succeeded else 0.0,
+                "clients_created": self.clients_created,
+            }
+
+
+gemini_client = LLMClientManager()
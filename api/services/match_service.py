@@ -1,14 +1,23 @@
-import re
-from sklearn.feature_extraction.text import TfidfVectorizer
+from dataclasses import asdict, dataclass
+import numpy as np
+from scipy.sparse import csr_matrix
 from sklearn.metrics.pairwise import cosine_similarity
-from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 import nltk
-from sentence_transformers import SentenceTransformer
-from google import genai
 import textwrap
 import os
-from google.genai import types
+from services.embedding_cache import EmbeddingCache, make_cache_key
+from services import model_loader
+from services import embedding_backend
+from services import chunking_service
+from services import tokenization_service
+from services import title_service
+from services import skills_service
+from services import experience_service
+from services import llm_client
+from services.llm_cache import LLMResultCache, make_llm_cache_key
+from services.tokenization_service import TokenizedDocument, tokenize_document
+from services.term_statistics import DEFAULT_FEATURES, TermStatistics
 
 
 # --- SentenceTransformer Model Loading ---
@@ -18,157 +27,343 @@ MODEL_FOLDER_NAME = "all-MiniLM-L6-v2-local"
 
 MODEL_LOCAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "models", MODEL_FOLDER_NAME)
 
-sentence_model = None
-try:
-    # Use local_files_only=True to force loading from the local path ONLY.
-    # This will prevent any network calls to Hugging Face Hub during loading.
-    sentence_model = SentenceTransformer(MODEL_LOCAL_PATH, local_files_only=True)
-    print(f"SentenceTransformer model loaded successfully from local path: {MODEL_LOCAL_PATH}")
-except Exception as e:
-    # If loading from local path fails with local_files_only=True, it's a critical error.
-    # The application should not try to download from Hugging Face Hub in this production-focused setup.
-    print(f"CRITICAL ERROR: Failed to load SentenceTransformer model from local path ({MODEL_LOCAL_PATH}).")
-    print(f"This indicates an issue with the local model files or path configuration. Error: {e}")
-    print("Semantic similarity functionality will be UNAVAILABLE.")
-    # Set sentence_model to None to clearly indicate failure
-    sentence_model = None
+# Inference backend: "sentence-transformers" (PyTorch), "onnx" or "onnx-int8". See services/embedding_backend.py.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "sentence-transformers")
+
+# "auto" scores documents longer than the model's input limit chunk by chunk; "always" / "never" force it.
+LONG_DOCUMENT_MODE = os.getenv("LONG_DOCUMENT_MODE", "auto")
+
+# Identifies the embedding space in cache keys; backends produce slightly different vectors.
+EMBEDDING_MODEL_ID = f"{MODEL_FOLDER_NAME}:{EMBEDDING_BACKEND}"
+
+
+def _load_sentence_model():
+    try:
+        # Loads from the local path only; no network calls to Hugging Face Hub.
+        model = embedding_backend.load_backend(EMBEDDING_BACKEND, MODEL_LOCAL_PATH)
+        print(f"Embedding model loaded successfully from local path: {MODEL_LOCAL_PATH} (backend: {EMBEDDING_BACKEND})")
+        return model
+    except Exception as e:
+        # If loading from local path fails with local_files_only=True, it's a critical error.
+        # The application should not try to download from Hugging Face Hub in this production-focused setup.
+        print(f"CRITICAL ERROR: Failed to load SentenceTransformer model from local path ({MODEL_LOCAL_PATH}).")
+        print(f"This indicates an issue with the local model files or path configuration. Error: {e}")
+        print("Semantic similarity functionality will be UNAVAILABLE.")
+        raise
+
+
+def _warmup_sentence_model(model):
+    model.encode(["Warmup sentence for the embedding model."])
+
+
+sentence_model_slot = model_loader.register("sentence_model", _load_sentence_model, _warmup_sentence_model)
+
+
+def get_sentence_model():
+    """
+    Returns the embedding model backend, waiting for it to load if necessary.
+    Returns None if the model could not be loaded.
+    """
+    return sentence_model_slot.get()
+
+
+# --- Embedding Cache ---
+# Embeddings are keyed by a hash of the normalized text and the model identity,
+# so a JD scored against thousands of resumes is only encoded once.
+# Set EMBEDDING_CACHE_DIR to persist embeddings across restarts (one directory per worker process).
+embedding_cache = EmbeddingCache(
+    max_entries=int(os.getenv("EMBEDDING_CACHE_SIZE", "2048")),
+    disk_dir=os.getenv("EMBEDDING_CACHE_DIR") or None,
+    disk_dtype=os.getenv("EMBEDDING_CACHE_DTYPE", "float16"),
+)
+
+# Corpus document frequencies behind keyword weighting. Set TERM_STATS_DIR to use a prebuilt
+# corpus (see services/term_statistics.py) and keep the counts of newly registered JDs.
+term_stats = TermStatistics(
+    directory=os.getenv("TERM_STATS_DIR") or None,
+    n_features=int(os.getenv("TERM_STATS_FEATURES", str(DEFAULT_FEATURES))),
+)
+
+# Optimized (still masked) resumes for repeated /optimize/ requests. LLM_CACHE_SIZE=0 disables it.
+llm_cache = LLMResultCache(
+    max_entries=int(os.getenv("LLM_CACHE_SIZE", "128")),
+    max_chars=int(os.getenv("LLM_CACHE_MAX_CHARS", "8000000")),
+    ttl_seconds=int(os.getenv("LLM_CACHE_TTL", "3600")),
+)
+
+
+def encode_texts(texts: list[str], batch_size: int = 32) -> np.ndarray:
+    """
+    Encodes texts with the SentenceTransformer model, serving repeats from the embedding cache.
+    Only cache misses are sent to the model, in a single batched call.
+    """
+    keys = [make_cache_key(text, EMBEDDING_MODEL_ID) for text in texts]
+    embeddings = [embedding_cache.get(key) for key in keys]
+
+    missing = {}
+    for i, (key, embedding) in enumerate(zip(keys, embeddings)):
+        if embedding is None:
+            # Duplicate texts within one call are encoded once.
+            missing.setdefault(key, []).append(i)
+
+    if missing:
+        first_indices = [indices[0] for indices in missing.values()]
+        encoded = np.asarray(
+            get_sentence_model().encode([texts[i] for i in first_indices], batch_size=batch_size),
+            dtype=np.float32
+        )
+        for (key, indices), vector in zip(missing.items(), encoded):
+            embedding_cache.put(key, vector)
+            for i in indices:
+                embeddings[i] = vector
+
+    if not embeddings:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.vstack(embeddings)
+
+
+def _load_nltk_data():
+    # NLTK corpora load lazily on first access; touching them here moves that cost off the first request.
+    tokenization_service.get_stopwords()
+    word_tokenize("warmup")
+    return True
+
+
+model_loader.register("nltk_data", _load_nltk_data)
 
 
 def preprocess_text(text: str, remove_stopwords: bool = True) -> list[str]:
     """
     Cleans and tokenizes text.
+    Callers that need several token views of the same document should use tokenize_document once instead.
     """
-    text = text.lower()
-    text = re.sub(r'[^a-z0-9\s]', ' ', text)
-    word_tokens = word_tokenize(text)
-    filtered_words = [word for word in word_tokens if len(word) > 1]
-    if remove_stopwords:
-        stop_words = set(stopwords.words('english'))
-        filtered_words = [word for word in filtered_words if word not in stop_words]
-    return filtered_words
+    document = tokenize_document(text)
+    return document.content_tokens if remove_stopwords else document.tokens
 
 def calculate_semantic_similarity(text1: str, text2: str) -> float:
     """
     Calculates semantic similarity between two texts using SentenceTransformer embeddings.
     """
-    if sentence_model is None:
+    if get_sentence_model() is None:
         print("Semantic similarity model not loaded. Falling back to 0.0.")
         return 0.0
     if not text1 or not text2:
         return 0.0
-    embeddings = sentence_model.encode([text1, text2])
+    embeddings = encode_texts([text1, text2])
     semantic_sim = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
     return float(semantic_sim)
 
+def calculate_batch_semantic_similarity(
+    jd_text: str,
+    resume_texts: list[str],
+    batch_size: int = 64,
+    jd_embedding: np.ndarray = None
+) -> np.ndarray:
+    """
+    Calculates the semantic similarity of one JD against many resumes in a single vectorized pass.
+    Resumes are encoded in batches and scored with one JD-vs-all cosine product.
+    A precomputed JD embedding can be passed to skip encoding the JD.
+    """
+    scores = np.zeros(len(resume_texts), dtype=np.float32)
+    if get_sentence_model() is None:
+        print("Semantic similarity model not loaded. Falling back to 0.0.")
+        return scores
+    if not jd_text:
+        return scores
+
+    # Empty resumes keep a 0.0 score, matching calculate_semantic_similarity.
+    non_empty = [i for i, text in enumerate(resume_texts) if text]
+    if not non_empty:
+        return scores
+
+    if jd_embedding is None:
+        jd_embedding = encode_texts([jd_text])[0]
+    resume_embeddings = encode_texts([resume_texts[i] for i in non_empty], batch_size=batch_size)
+
+    jd_norm = np.linalg.norm(jd_embedding)
+    resume_norms = np.linalg.norm(resume_embeddings, axis=1)
+    denominators = np.maximum(resume_norms * jd_norm, np.finfo(np.float32).eps)
+    scores[non_empty] = (resume_embeddings @ jd_embedding) / denominators
+    return scores
+
 def calculate_tfidf_similarity(text1_tokens: list[str], text2_tokens: list[str]) -> float:
     """
-    Calculates TF-IDF based cosine similarity between two sets of tokens.
+    Calculates TF-IDF based cosine similarity between two sets of tokens, weighted by corpus IDF.
     """
     if not text1_tokens or not text2_tokens:
         return 0.0
-    str_text1 = " ".join(text1_tokens)
-    str_text2 = " ".join(text2_tokens)
-    corpus = [str_text1, str_text2]
-    vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2))
-    tfidf_matrix = vectorizer.fit_transform(corpus)
-    cosine_sim = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-    return float(cosine_sim)
+    weights1 = term_stats.weigh(text1_tokens)
+    weights2 = term_stats.weigh(text2_tokens)
+    # Both vectors are L2-normalized, so the dot product over shared terms is the cosine.
+    return float(sum(weight * weights2[term] for term, weight in weights1.items() if term in weights2))
 
 def extract_experience(text: str) -> int:
     """
-    Extracts years of experience from text.
+    Extracts years of experience from text: stated years, or the employment date ranges
+    (see services/experience_service.py).
     """
-    matches = re.findall(r'(\d+)\s*(?:year|yr)s?\s*(?:of)?\s*(?:experience|exp|yoes?)', text, re.IGNORECASE)
-    if matches:
-        return max(int(m) for m in matches)
-    matches = re.findall(r'(\d+)\s*\+?\s*(?:plus)?\s*(?:year|yr)s?', text, re.IGNORECASE)
-    if matches:
-        return max(int(m) for m in matches)
-    matches = re.findall(r'(\d+)\s*(?:y|yr)\b', text, re.IGNORECASE)
-    if matches:
-        return max(int(m) for m in matches)
-    return 0
+    return experience_service.extract_experience(text)
 
 def extract_job_title_keywords(text: str) -> list[str]:
     """
-    Extracts common job title keywords from text.
+    Extracts canonical job titles and seniority levels from text (see services/title_service.py).
     """
-    keywords = []
-    text_lower = text.lower()
-    if "software engineer" in text_lower: keywords.append("software engineer")
-    if "engineer" in text_lower: keywords.append("engineer")
-    if "engineering manager" in text_lower: keywords.append("engineering manager")
-    if "embedded engineer" in text_lower: keywords.append("embedded engineer")
-    if "data scientist" in text_lower: keywords.append("data scientist")
-    if "developer" in text_lower: keywords.append("developer")
-    if "architect" in text_lower: keywords.append("architect")
-    if "lead" in text_lower: keywords.append("lead")
-    if "senior" in text_lower: keywords.append("senior")
-    if "junior" in text_lower: keywords.append("junior")
-    return list(set(keywords))
+    roles = title_service.extract_roles(text)
+    return sorted(roles.titles | roles.seniority)
 
-def get_keyword_suggestions(resume_text: str, jd_text: str, top_n: int = 5) -> list[str]:
+def get_jd_keyword_scores(jd_text: str, jd_document: TokenizedDocument = None) -> list[tuple[str, float]]:
+    """
+    Scores the JD's unigrams and bigrams with TF-IDF, sorted from highest to lowest score.
+    IDF weights come from the corpus term statistics, so terms common to most JDs rank lower.
+    """
+    if jd_document is None:
+        jd_document = tokenize_document(jd_text)
+    jd_word_scores = term_stats.weigh(jd_document.tokens)
+    return sorted(jd_word_scores.items(), key=lambda item: item[1], reverse=True)
+
+UNWANTED_SUGGESTIONS = frozenset([
+    'experience', 'responsibilities', 'building', 'looking', 'engineer', 'developer',
+    'software', 'engineer software', 'software engineer', 'engineer developer', 
+    'developer software', 'years', 'plus', 'related', 'field', 'strong', 'proficiency', 
+    'understanding', 'knowledge', 'excellent', 'skills', 'data', 'science', 'team',
+    'solutions', 'products', 'systems', 'design', 'develop', 'maintain', 'corp', 'company',
+    'requirements', 'implement', 'optimize', 'cutting', 'edge', 'involved'
+])
+
+def get_keyword_suggestions(
+    resume_text: str,
+    jd_text: str,
+    top_n: int = 5,
+    jd_keyword_scores: list[tuple[str, float]] = None,
+    resume_document: TokenizedDocument = None
+) -> list[str]:
     """
     Generates keyword suggestions based on TF-IDF difference between JD and resume.
+    Precomputed JD keyword scores (see get_jd_keyword_scores) can be passed to skip the TF-IDF weighting,
+    and an already tokenized resume to skip re-tokenizing it.
     """
-    jd_tokens_for_tfidf = preprocess_text(jd_text, remove_stopwords=False)
-    resume_tokens_for_checking = preprocess_text(resume_text, remove_stopwords=False)
+    if jd_keyword_scores is None:
+        jd_keyword_scores = get_jd_keyword_scores(jd_text)
 
-    if not jd_tokens_for_tfidf:
+    if not jd_keyword_scores:
         return []
 
-    vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2))
-    jd_tfidf_matrix = vectorizer.fit_transform([" ".join(jd_tokens_for_tfidf)])
-
-    feature_names = vectorizer.get_feature_names_out()
-    jd_tfidf_scores = jd_tfidf_matrix.toarray()[0]
-    jd_word_scores = dict(zip(feature_names, jd_tfidf_scores))
+    if resume_document is None:
+        resume_document = tokenize_document(resume_text)
+    resume_ngrams_set = resume_document.ngram_set
 
     suggestions = []
-    resume_unigrams = preprocess_text(resume_text, remove_stopwords=True)
-    resume_bigrams = [ ' '.join(resume_unigrams[i:i+2]) for i in range(len(resume_unigrams)-1) ]
-    resume_ngrams_set = set(resume_unigrams + resume_bigrams)
-    
-    unwanted_suggestions = set([
-        'experience', 'responsibilities', 'building', 'looking', 'engineer', 'developer',
-        'software', 'engineer software', 'software engineer', 'engineer developer', 
-        'developer software', 'years', 'plus', 'related', 'field', 'strong', 'proficiency', 
-        'understanding', 'knowledge', 'excellent', 'skills', 'data', 'science', 'team',
-        'solutions', 'products', 'systems', 'design', 'develop', 'maintain', 'corp', 'company',
-        'requirements', 'implement', 'optimize', 'cutting', 'edge', 'involved'
-    ])
-    
-    sorted_jd_words = sorted(jd_word_scores.items(), key=lambda item: item[1], reverse=True)
-
-    for word, score in sorted_jd_words:
-        if word not in resume_ngrams_set and score > 0.05 and word not in unwanted_suggestions:
+    for word, score in jd_keyword_scores:
+        if word not in resume_ngrams_set and score > 0.05 and word not in UNWANTED_SUGGESTIONS:
             suggestions.append(word)
         if len(suggestions) >= top_n:
             break
             
     return suggestions
 
-# NEW FUNCTION: AI-powered Resume Optimization
-async def optimize_resume_with_ai(masked_resume_content: str, jd_text: str, api_key: str) -> dict:
+@dataclass
+class JDProfile:
     """
-    Uses a Generative AI model (Google Gemini) to optimize a resume for a given job description.
-    Returns a dictionary with 'status' and 'message' or 'optimized_text'.
+    Everything about a job description that does not depend on the resume.
+    Built once per JD and reused for every resume scored against it.
     """
-    if not api_key:
-        return {"status": "error", "message": "AI optimization unavailable (API Key missing)."}
-
-    
-    
-    try:
-        
-        client = genai.Client()
-    except Exception as e:
-        return {"status": "error", "message": f"Failed to initialize Gemini client: {e}. Check API key configuration."}
+    jd_text: str
+    embedding: np.ndarray
+    experience: int
+    roles: set[str]
+    preprocessed_text: str
+    keyword_scores: list[tuple[str, float]]
+    chunks: list[tuple[str, str]]
+    skills: csr_matrix
+
+def build_jd_profile(jd_text: str) -> JDProfile:
+    """
+    Precomputes the JD-side artifacts used by check_mismatch_and_threshold.
+    """
+    embedding = None
+    if get_sentence_model() is not None and jd_text:
+        embedding = encode_texts([jd_text])[0]
+    jd_document = tokenize_document(jd_text)
+    return JDProfile(
+        jd_text=jd_text,
+        embedding=embedding,
+        experience=extract_experience(jd_text),
+        roles=set(extract_job_title_keywords(jd_text)),
+        preprocessed_text=jd_document.content_text,
+        keyword_scores=get_jd_keyword_scores(jd_text, jd_document),
+        chunks=chunking_service.chunk_document(jd_text) if jd_text else [],
+        skills=skills_service.build_jd_skill_vector(jd_text),
+    )
+
+def calculate_profile_similarity(resume_text: str, jd_profile: JDProfile) -> float:
+    """
+    Calculates semantic similarity between a resume and a precomputed JD profile.
+    """
+    if get_sentence_model() is None:
+        print("Semantic similarity model not loaded. Falling back to 0.0.")
+        return 0.0
+    if not resume_text or jd_profile.embedding is None:
+        return 0.0
+    return float(calculate_batch_semantic_similarity(
+        jd_profile.jd_text, [resume_text], jd_embedding=jd_profile.embedding
+    )[0])
 
-    GEMINI_MODEL_NAME = 'gemini-2.5-flash' 
+def use_long_document_mode(resume_text: str, jd_profile: JDProfile) -> bool:
+    """
+    Decides whether a resume/JD pair is scored chunk by chunk (see LONG_DOCUMENT_MODE).
+    """
+    if LONG_DOCUMENT_MODE == "never" or not resume_text or not jd_profile.jd_text:
+        return False
+    if LONG_DOCUMENT_MODE == "always":
+        return True
+    return chunking_service.is_long_document(resume_text) or chunking_service.is_long_document(jd_profile.jd_text)
 
+def calculate_chunked_similarity(resume_text: str, jd_profile: JDProfile) -> dict:
+    """
+    Long-document similarity: splits the resume into section-aware chunks and compares them
+    with the JD's chunks in one batched encode. Returns the overall score and per-section scores.
+    """
+    if get_sentence_model() is None:
+        print("Semantic similarity model not loaded. Falling back to 0.0.")
+        return {"score": 0.0, "section_scores": {}}
+    return chunking_service.chunked_similarity(
+        encode_texts, chunking_service.chunk_document(resume_text), jd_profile.chunks
+    )
+
+def calculate_batch_chunked_similarity(
+    resume_texts: list[str],
+    jd_profile: JDProfile,
+    batch_size: int = 64
+) -> list[dict]:
+    """
+    calculate_chunked_similarity for many resumes: the chunks of every resume and of the JD
+    are encoded in one call, then each resume is scored from its slice of the embeddings.
+    """
+    if get_sentence_model() is None:
+        print("Semantic similarity model not loaded. Falling back to 0.0.")
+        return [{"score": 0.0, "section_scores": {}} for _ in resume_texts]
+    resume_chunks = [chunking_service.chunk_document(text) for text in resume_texts]
+    all_chunks = [chunk for chunks in resume_chunks for chunk in chunks] + jd_profile.chunks
+    if not all_chunks:
+        return [{"score": 0.0, "section_scores": {}} for _ in resume_texts]
+    embeddings = chunking_service.normalize_rows(
+        encode_texts([text for _, text in all_chunks], batch_size=batch_size)
+    )
+    jd_embeddings = embeddings[len(all_chunks) - len(jd_profile.chunks):]
+
+    results = []
+    offset = 0
+    for chunks in resume_chunks:
+        results.append(chunking_service.score_chunks(chunks, embeddings[offset:offset + len(chunks)], jd_embeddings))
+        offset += len(chunks)
+    return results
+
+def build_optimization_prompt(masked_resume_content: str, jd_text: str) -> str:
+    """
+    The Gemini prompt for rewriting a masked resume against a job description.
+    """
     # --- THIS IS THE MODIFIED PROMPT ---
-    prompt_template = textwrap.dedent(f"""
+    return textwrap.dedent(f"""
     You are an expert resume writer. Your task is to rewrite the provided resume to better match the given job description.
 
     **CRITICAL INSTRUCTION: The resume text contains special placeholders for privacy (e.g., __PERSON_0__, __EMAIL_ADDRESS_1__, __PHONE_NUMBER_0__). YOU MUST PRESERVE THESE PLACEHOLDERS EXACTLY AS THEY ARE. Do NOT alter, remove, rephrase, or modify them in any way. Carry them over to the final output in their original form.**
@@ -196,46 +391,146 @@ async def optimize_resume_with_ai(masked_resume_content: str, jd_text: str, api_
     """)
 
 
+# Sampling parameters for optimization; part of the LLM cache key.
+OPTIMIZATION_SAMPLING = {"candidate_count": 1, "temperature": 0.7, "top_p": 0.9, "top_k": 40}
+
+
+def build_optimization_config():
+    # Imported lazily: google.genai is only needed on the /optimize/ path.
+    from google.genai import types
+
+    return types.GenerateContentConfig(**OPTIMIZATION_SAMPLING)
+
+
+def optimization_cache_key(prompt: str) -> str:
+    return make_llm_cache_key(llm_client.gemini_client.model, OPTIMIZATION_SAMPLING, prompt)
+
+
+# NEW FUNCTION: AI-powered Resume Optimization
+async def optimize_resume_with_ai(masked_resume_content: str, jd_text: str, api_key: str) -> dict:
+    """
+    Uses a Generative AI model (Google Gemini) to optimize a resume for a given job description.
+    Returns a dictionary with 'status' and 'message' or 'optimized_text'. Errors carry 'retryable',
+    set when the call was rejected, timed out or failed transiently (see services/llm_client.py).
+    """
+    if not api_key:
+        return {"status": "error", "message": "AI optimization unavailable (API Key missing)."}
+
+    prompt = build_optimization_prompt(masked_resume_content, jd_text)
     try:
-       
-        response = await client.aio.models.generate_content( # <--- CORRECT ASYNC CALL
-            model=GEMINI_MODEL_NAME,        
-            contents=prompt_template,
-            config=types.GenerateContentConfig( # <-- config as named argument
-                candidate_count=1,
-                temperature=0.7,
-                top_p=0.9,
-                top_k=40
-            )
+        # Identical requests (retries, double clicks) share one Gemini call and its cached output.
+        optimized_text = await llm_cache.get_or_generate(
+            optimization_cache_key(prompt),
+            lambda: llm_client.gemini_client.generate(prompt, api_key, config=build_optimization_config())
         )
-        
-        optimized_text = response.text
         return {"status": "success", "optimized_text": optimized_text}
 
+    except (llm_client.LLMOverloadedError, llm_client.LLMTimeoutError) as e:
+        print(f"AI optimization unavailable: {e}")
+        return {"status": "error", "message": str(e), "retryable": True}
     except Exception as e:
         
         error_message = f"Error calling Gemini API: {e}"
         print(error_message) 
-        return {"status": "error", "message": error_message}
+        return {"status": "error", "message": error_message, "retryable": llm_client.is_transient_error(e)}
+
+
+async def optimize_resume_with_ai_stream(masked_resume_content: str, jd_text: str, api_key: str):
+    """
+    Streaming variant of optimize_resume_with_ai: yields the optimized (still masked) text in
+    chunks as Gemini generates it. Errors are raised rather than returned (see llm_client).
+    A cached result is yielded as a single chunk, and a completed stream is cached.
+    """
+    prompt = build_optimization_prompt(masked_resume_content, jd_text)
+    key = optimization_cache_key(prompt)
+    cached = llm_cache.get(key) if llm_cache.enabled else None
+    if cached is not None:
+        yield cached
+        return
+
+    chunks = []
+    async for chunk in llm_client.gemini_client.generate_stream(prompt, api_key, config=build_optimization_config()):
+        chunks.append(chunk)
+        yield chunk
+    llm_cache.put(key, "".join(chunks))
 
 
 def check_mismatch_and_threshold(
     resume_text: str, 
-    jd_text: str, 
+    jd_text: str = None, 
     min_match_percentage: float = 0.40, # 40% threshold
     experience_diff_tolerance: int = 5, # e.g., if JD asks for 15, resume has 2, diff > 5 triggers warning
-    role_mismatch_threshold_words: int = 2 # If 2 or more distinct core role words don't overlap, flag.
+    role_mismatch_threshold_words: int = 2, # If 2 or more distinct core role words don't overlap, flag.
+    jd_profile: JDProfile = None
 ) -> dict:
     """
     Analyzes resume and JD for match percentage, experience, role mismatch, and keyword suggestions.
+    Pass a precomputed jd_profile (see build_jd_profile) instead of jd_text to skip all JD-side work.
+    """
+    if jd_profile is None:
+        jd_profile = build_jd_profile(jd_text)
+
+    similarity = calculate_resume_similarity(resume_text, jd_profile)
+    match_result = build_match_result(
+        resume_text,
+        jd_profile,
+        similarity["score"],
+        min_match_percentage=min_match_percentage,
+        experience_diff_tolerance=experience_diff_tolerance,
+        role_mismatch_threshold_words=role_mismatch_threshold_words
+    )
+    if similarity["section_scores"] is not None:
+        match_result["section_scores"] = similarity["section_scores"]
+    return match_result
+
+
+def similarity_texts(resume_text: str, jd_profile: JDProfile) -> list[str]:
+    """
+    The resume texts calculate_resume_similarity will encode: its chunks for long documents,
+    otherwise the whole resume. Prefetch these, not the whole resume, to warm the cache.
+    """
+    if use_long_document_mode(resume_text, jd_profile):
+        return [text for _, text in chunking_service.chunk_document(resume_text)]
+    return [resume_text]
+
+def calculate_resume_similarity(resume_text: str, jd_profile: JDProfile) -> dict:
+    """
+    Semantic similarity of a resume to a JD profile: chunk by chunk for long documents
+    (with per-section scores), otherwise one embedding per document (section_scores is None).
+    """
+    if use_long_document_mode(resume_text, jd_profile):
+        return calculate_chunked_similarity(resume_text, jd_profile)
+    return {"score": calculate_profile_similarity(resume_text, jd_profile), "section_scores": None}
+
+
+def build_match_result(
+    resume_text: str,
+    jd_profile: JDProfile,
+    similarity_score: float,
+    min_match_percentage: float = 0.40,
+    experience_diff_tolerance: int = 5,
+    role_mismatch_threshold_words: int = 2,
+    skill_report: dict = None,
+    resume_document: TokenizedDocument = None,
+    resume_experience: experience_service.ExperienceSummary = None,
+    resume_roles: set[str] = None,
+    suggestions: list[str] = None
+) -> dict:
+    """
+    Builds the match result (percentage, warnings, suggestions, skills) for an already computed similarity score.
+    Any resume-side artifact that was already computed (tokens, experience, roles, skill report,
+    keyword suggestions) can be passed in to skip recomputing it (see services/analysis_pipeline.py).
     """
     warnings = []
-    
-    similarity_score = calculate_semantic_similarity(resume_text, jd_text)
     match_percentage = round(similarity_score * 100, 2)
+    # Tokenized once and shared by the role and keyword checks below.
+    if resume_document is None:
+        resume_document = tokenize_document(resume_text)
 
-    resume_exp = extract_experience(resume_text)
-    jd_exp = extract_experience(jd_text)
+    if resume_experience is None:
+        resume_experience = experience_service.scan_experience(resume_text)
+    resume_exp = resume_experience.years
+    jd_exp = jd_profile.experience
 
     if jd_exp > 0 and resume_exp > 0:
         if jd_exp > resume_exp + experience_diff_tolerance:
@@ -255,19 +550,18 @@ def check_mismatch_and_threshold(
             f"but no clear experience found in your resume."
         )
 
-    resume_roles = set(extract_job_title_keywords(resume_text))
-    jd_roles = set(extract_job_title_keywords(jd_text))
+    if resume_roles is None:
+        resume_roles = set(extract_job_title_keywords(resume_text))
+    jd_roles = jd_profile.roles
 
     if resume_roles and jd_roles:
         missing_in_resume = jd_roles - resume_roles
         missing_in_jd = resume_roles - jd_roles
-        
-        preprocessed_resume_for_roles = preprocess_text(resume_text, remove_stopwords=True)
-        preprocessed_jd_for_roles = preprocess_text(jd_text, remove_stopwords=True)
 
+        # Roles are canonical and extracted from the whole document, so a JD role that appears
+        # anywhere in the resume (under any synonym) is already in resume_roles.
         if len(missing_in_resume) >= role_mismatch_threshold_words and len(missing_in_jd) >= role_mismatch_threshold_words:
-            if not any(word in " ".join(preprocessed_resume_for_roles) for word in jd_roles) or \
-                not any(word in " ".join(preprocessed_jd_for_roles) for word in resume_roles):
+            if not resume_roles & jd_roles:
                 warnings.append(
                     f"Potential role mismatch. Your resume mentions roles like {', '.join(resume_roles)}, "
                     f"while the JD focuses on {', '.join(jd_roles)}. "
@@ -279,7 +573,20 @@ def check_mismatch_and_threshold(
             f"Your resume might not be a good fit for this job description. "
         )
 
-    suggestions = get_keyword_suggestions(resume_text, jd_text)
+    if skill_report is None:
+        skill_report = skills_service.compare_skills(resume_text, jd_profile.skills)
+    if skill_report["missing"]:
+        warnings.append(
+            f"Skills from the JD not found in your resume: {', '.join(skill_report['missing'][:10])}."
+        )
+
+    if suggestions is None:
+        suggestions = get_keyword_suggestions(
+            resume_text,
+            jd_profile.jd_text,
+            jd_keyword_scores=jd_profile.keyword_scores,
+            resume_document=resume_document
+        )
     if suggestions:
         warnings.append(f"Suggestions: Consider adding/emphasizing these keywords: {', '.join(suggestions)}.")
    
@@ -287,5 +594,72 @@ def check_mismatch_and_threshold(
     return {
         "match_percentage": match_percentage,
         "warnings": warnings,
-        "suggestions": suggestions
-    }
\ No newline at end of file
+        "suggestions": suggestions,
+        "skills": skill_report,
+        "experience": {
+            "years": resume_exp,
+            "employment_months": resume_experience.range_months,
+            "roles": [asdict(role) for role in resume_experience.roles],
+        }
+    }
+
+def rank_resumes(
+    resumes: list[tuple[str, str]],
+    jd_text: str = None,
+    min_match_percentage: float = 0.40,
+    batch_size: int = 64,
+    jd_profile: JDProfile = None
+) -> list[dict]:
+    """
+    Ranks many resumes against one job description.
+    Takes (name, resume_text) pairs and returns a leaderboard sorted by match percentage,
+    with per-resume warnings and suggestions.
+    """
+    if jd_profile is None:
+        jd_profile = build_jd_profile(jd_text)
+    resume_texts = [text for _, text in resumes]
+
+    # Long documents would be truncated in a whole-text encode, so they are scored by chunk
+    # instead; each group is encoded in a single batched call.
+    long_indices = [i for i, text in enumerate(resume_texts) if use_long_document_mode(text, jd_profile)]
+    long_set = set(long_indices)
+    short_indices = [i for i in range(len(resume_texts)) if i not in long_set]
+    similarity_scores = np.zeros(len(resume_texts), dtype=np.float32)
+    section_scores = [None] * len(resume_texts)
+    if short_indices:
+        similarity_scores[short_indices] = calculate_batch_semantic_similarity(
+            jd_profile.jd_text, [resume_texts[i] for i in short_indices],
+            batch_size=batch_size, jd_embedding=jd_profile.embedding
+        )
+    if long_indices:
+        chunked_results = calculate_batch_chunked_similarity(
+            [resume_texts[i] for i in long_indices], jd_profile, batch_size=batch_size
+        )
+        for i, chunked_result in zip(long_indices, chunked_results):
+            similarity_scores[i] = chunked_result["score"]
+            section_scores[i] = chunked_result["section_scores"]
+
+    # Every resume's skill coverage comes from one sparse product against the JD's skill vector.
+    skill_reports = skills_service.compare_skill_matrix(
+        skills_service.build_skill_matrix(resume_texts), jd_profile.skills
+    )
+
+    leaderboard = []
+    for (name, resume_text), similarity_score, resume_section_scores, skill_report in zip(
+        resumes, similarity_scores, section_scores, skill_reports
+    ):
+        match_result = build_match_result(
+            resume_text,
+            jd_profile,
+            float(similarity_score),
+            min_match_percentage=min_match_percentage,
+            skill_report=skill_report
+        )
+        if resume_section_scores is not None:
+            match_result["section_scores"] = resume_section_scores
+        leaderboard.append({"name": name, **match_result})
+
+    leaderboard.sort(key=lambda entry: entry["match_percentage"], reverse=True)
+    for rank, entry in enumerate(leaderboard, start=1):
+        entry["rank"] = rank
+    return leaderboard
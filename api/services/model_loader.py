@@ -0,0 +1,127 @@
+# api/services/model_loader.py
+import os
+import threading
+import time
+
+# Run a tiny inference right after each model loads, so the first real request
+# does not pay for lazy initialization inside the model libraries.
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "1") == "1"
+
+
+class ModelSlot:
+    """
+    One lazily loaded model: its loader, optional warmup, and load state.
+    """
+
+    def __init__(self, name: str, load_fn, warmup_fn=None):
+        self.name = name
+        self.load_fn = load_fn
+        self.warmup_fn = warmup_fn
+        self.state = "pending"
+        self.value = None
+        self.error = None
+        self.load_seconds = None
+        self.warmup_seconds = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            value = self.load_fn()
+            self.load_seconds = round(time.perf_counter() - start, 3)
+            if value is not None and MODEL_WARMUP and self.warmup_fn is not None:
+                warmup_start = time.perf_counter()
+                try:
+                    self.warmup_fn(value)
+                except Exception as e:
+                    print(f"WARNING: Warmup for model '{self.name}' failed: {e}")
+                self.warmup_seconds = round(time.perf_counter() - warmup_start, 3)
+            self.value = value
+            self.state = "ready" if value is not None else "failed"
+        except Exception as e:
+            self.load_seconds = round(time.perf_counter() - start, 3)
+            self.error = str(e)
+            self.state = "failed"
+            print(f"CRITICAL ERROR: Failed to load model '{self.name}': {e}")
+        finally:
+            self._done.set()
+        warmup = f", warmup {self.warmup_seconds}s" if self.warmup_seconds is not None else ""
+        print(f"Model '{self.name}' {self.state} in {self.load_seconds}s{warmup}.")
+
+    def start(self):
+        """
+        Starts loading in a background thread, unless loading already started.
+        """
+        with self._lock:
+            if self.state != "pending":
+                return
+            self.state = "loading"
+        threading.Thread(target=self._load, name=f"load-{self.name}", daemon=True).start()
+
+    def get(self):
+        """
+        Returns the loaded model, loading it on first use. Returns None if loading failed.
+        """
+        with self._lock:
+            load_inline = self.state == "pending"
+            if load_inline:
+                self.state = "loading"
+        if load_inline:
+            self._load()
+        else:
+            self._done.wait()
+        return self.value
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warmup_seconds,
+            "error": self.error,
+        }
+
+
+_slots = {}
+_import_timings = {}
+
+
+def register(name: str, load_fn, warmup_fn=None) -> ModelSlot:
+    """
+    Registers a lazily loaded model. Loading starts on first get() or on start_all().
+    """
+    slot = ModelSlot(name, load_fn, warmup_fn)
+    _slots[name] = slot
+    return slot
+
+
+def get(name: str):
+    return _slots[name].get()
+
+
+def start_all():
+    """
+    Starts loading every registered model in parallel background threads.
+    """
+    for slot in _slots.values():
+        slot.start()
+
+
+def record_import_time(module_name: str, seconds: float):
+    _import_timings[module_name] = round(seconds, 3)
+
+
+def is_ready() -> bool:
+    """
+    True once every registered model has finished loading (successfully or not).
+    """
+    return all(slot.state in ("ready", "failed") for slot in _slots.values())
+
+
+def status() -> dict:
+    return {
+        "ready": is_ready(),
+        "degraded": any(slot.state == "failed" for slot in _slots.values()),
+        "models": {name: slot.status() for name, slot in _slots.items()},
+        "import_seconds": dict(_import_timings),
+    }
@@ -0,0 +1,216 @@
+# api/services/optimization_jobs.py
+import asyncio
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+
+from utils import file_operations
+
+OPTIMIZATION_JOB_WORKERS = int(os.getenv("OPTIMIZATION_JOB_WORKERS", "2"))
+# Jobs allowed to wait for a worker; submissions beyond this are rejected.
+OPTIMIZATION_JOB_QUEUE = int(os.getenv("OPTIMIZATION_JOB_QUEUE", "64"))
+# Finished jobs and their result files are kept this long, then swept.
+OPTIMIZATION_JOB_TTL = int(os.getenv("OPTIMIZATION_JOB_TTL", "3600"))
+OPTIMIZATION_JOB_SWEEP_INTERVAL = int(os.getenv("OPTIMIZATION_JOB_SWEEP_INTERVAL", "60"))
+
+
+class JobQueueFullError(Exception):
+    """
+    Raised when the job queue is at capacity.
+    """
+
+
+@dataclass
+class OptimizationJob:
+    """
+    One queued optimization and its outcome. Failures keep the HTTP status code the synchronous
+    endpoint would have returned, so clients handle both the same way.
+    """
+    job_id: str
+    status: str = "queued"
+    stage: str = None
+    created_at: float = 0.0
+    started_at: float = None
+    finished_at: float = None
+    expires_at: float = None
+    original_match_percentage: float = None
+    result_file: str = None
+    error: str = None
+    status_code: int = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class OptimizationJobManager:
+    """
+    In-process job queue for /optimize/jobs: no broker, state lives in this process.
+
+    submit() enqueues an async callable that produces the optimized resume text; `workers`
+    background tasks run jobs one at a time each, write results to the outputs directory and
+    record status for polling. Finished jobs expire after `ttl_seconds`, taking their result
+    files with them. Jobs do not survive a restart.
+    """
+
+    def __init__(self, outputs_dir: str = file_operations.OUTPUTS_DIR, workers: int = OPTIMIZATION_JOB_WORKERS,
+                 max_queue: int = OPTIMIZATION_JOB_QUEUE, ttl_seconds: int = OPTIMIZATION_JOB_TTL,
+                 sweep_interval_seconds: int = OPTIMIZATION_JOB_SWEEP_INTERVAL):
+        self.outputs_dir = outputs_dir
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._jobs = {}
+        self._queue = None
+        self._tasks = []
+        self._loop = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+        self.expired = 0
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks and not any(task.done() for task in self._tasks):
+            return
+        for task in self._tasks:
+            task.cancel()
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(loop.create_task(self._sweep_periodically()))
+
+    def submit(self, run) -> OptimizationJob:
+        """
+        Queues `run(job)`, a coroutine function returning the optimized text, and returns the job.
+        Raises JobQueueFullError when max_queue jobs are already waiting.
+        """
+        self._ensure_started()
+        job = OptimizationJob(job_id=uuid.uuid4().hex, created_at=time.time())
+        try:
+            self._queue.put_nowait((job, run))
+        except asyncio.QueueFull:
+            with self._lock:
+                self.rejected += 1
+            raise JobQueueFullError(f"Too many optimization jobs queued ({self.max_queue}). Try again shortly.")
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self.submitted += 1
+        return job
+
+    def get(self, job_id: str):
+        """
+        Returns the job, or None if it is unknown or has expired. A succeeded job whose result
+        file is gone (the outputs sweeper enforces its own age and disk quota) has expired too,
+        so it never points at a download that would 404.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or (job.expires_at is not None and time.time() >= job.expires_at):
+            return None
+        if job.result_file and not os.path.exists(os.path.join(self.outputs_dir, job.result_file)):
+            with self._lock:
+                if self._jobs.pop(job_id, None) is not None:
+                    self.expired += 1
+            return None
+        return job
+
+    async def _work(self):
+        while True:
+            job, run = await self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                text = await run(job)
+                job.result_file = await asyncio.to_thread(self._write_result, job.job_id, text)
+                job.status = "succeeded"
+                with self._lock:
+                    self.succeeded += 1
+            except asyncio.CancelledError:
+                job.status = "failed"
+                job.error = "The server shut down before the job finished."
+                raise
+            except Exception as e:
+                job.status = "failed"
+                # HTTPException-style errors keep their status code and detail.
+                job.status_code = getattr(e, "status_code", 500)
+                job.error = str(getattr(e, "detail", e))
+                print(f"ERROR: Optimization job {job.job_id} failed: {job.error}")
+                with self._lock:
+                    self.failed += 1
+            finally:
+                job.stage = None
+                job.finished_at = time.time()
+                job.expires_at = job.finished_at + self.ttl_seconds
+                self._queue.task_done()
+
+    def _write_result(self, job_id: str, text: str) -> str:
+        os.makedirs(self.outputs_dir, exist_ok=True)
+        filename = f"optimized_resume_{job_id}.txt"
+        path = os.path.join(self.outputs_dir, filename)
+        # Written to a temporary name and renamed, so a download never sees a partial file.
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_path, path)
+        return filename
+
+    async def _sweep_periodically(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval_seconds)
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                print(f"WARNING: Optimization job sweep failed: {e}")
+
+    def sweep(self) -> int:
+        """
+        Forgets expired jobs and deletes their result files. Returns how many were removed.
+        """
+        now = time.time()
+        with self._lock:
+            expired = [job for job in self._jobs.values() if job.expires_at is not None and now >= job.expires_at]
+            for job in expired:
+                del self._jobs[job.job_id]
+            self.expired += len(expired)
+        for job in expired:
+            if job.result_file:
+                try:
+                    os.remove(os.path.join(self.outputs_dir, job.result_file))
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"WARNING: Failed to delete result file {job.result_file}: {e}")
+        return len(expired)
+
+    async def shutdown(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict:
+        with self._lock:
+            statuses = {}
+            for job in self._jobs.values():
+                statuses[job.status] = statuses.get(job.status, 0) + 1
+            return {
+                "jobs": len(self._jobs),
+                "by_status": statuses,
+                "queued": self._queue.qsize() if self._queue is not None else 0,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "ttl_seconds": self.ttl_seconds,
+                "submitted": self.submitted,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "expired": self.expired,
+            }
+
+
+job_manager = OptimizationJobManager()
@@ -0,0 +1,264 @@
+# api/services/output_store.py
+import asyncio
+import gzip
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from utils.file_operations import OUTPUTS_DIR
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# OUTPUTS_DIR is swept every OUTPUTS_SWEEP_INTERVAL seconds: files older than OUTPUTS_MAX_AGE are
+# deleted, then the oldest files go until the directory fits in OUTPUTS_MAX_BYTES.
+OUTPUTS_MAX_BYTES = int(os.getenv("OUTPUTS_MAX_BYTES", str(512 * 1024 * 1024)))
+OUTPUTS_MAX_AGE = int(os.getenv("OUTPUTS_MAX_AGE", str(24 * 3600)))
+OUTPUTS_SWEEP_INTERVAL = int(os.getenv("OUTPUTS_SWEEP_INTERVAL", "300"))
+# Compressed copies of text files are kept in memory, up to this many bytes in total.
+OUTPUTS_COMPRESSED_CACHE_BYTES = int(os.getenv("OUTPUTS_COMPRESSED_CACHE_BYTES", str(32 * 1024 * 1024)))
+# ETags of this many file versions are kept; beyond that the least recently served are dropped.
+OUTPUTS_ETAG_CACHE_SIZE = int(os.getenv("OUTPUTS_ETAG_CACHE_SIZE", "4096"))
+# Files smaller than this are sent as they are; compressing them saves less than it costs.
+OUTPUTS_COMPRESS_MIN_BYTES = int(os.getenv("OUTPUTS_COMPRESS_MIN_BYTES", "1024"))
+
+COMPRESSIBLE_EXTENSIONS = frozenset({".txt", ".md", ".json", ".csv", ".html", ".xml"})
+
+
+@dataclass
+class OutputFile:
+    """
+    A servable file and its content-hash ETag.
+    """
+    filename: str
+    path: str
+    size: int
+    mtime_ns: int
+    etag: str
+
+    @property
+    def compressible(self) -> bool:
+        return os.path.splitext(self.filename)[1].lower() in COMPRESSIBLE_EXTENSIONS and self.size >= OUTPUTS_COMPRESS_MIN_BYTES
+
+
+def available_encodings() -> tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> str:
+    """
+    Picks the best content coding the client accepts (br, then gzip), or None for identity.
+    """
+    accepted = {}
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=5)
+    # mtime=0 keeps the output deterministic, so the encoded ETag always describes the same bytes.
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+class OutputStore:
+    """
+    Serving metadata and housekeeping for generated files in one directory.
+
+    ETags are SHA-256 content hashes, computed once per file version (path, size, mtime) and
+    cached, least recently used first out. Compressed copies are cached in memory, bounded by
+    bytes. Both are dropped when a file turns out to be gone, whoever deleted it. sweep() enforces the
+    age limit and the disk quota.
+    """
+
+    def __init__(self, directory: str = OUTPUTS_DIR, max_bytes: int = OUTPUTS_MAX_BYTES,
+                 max_age_seconds: int = OUTPUTS_MAX_AGE, compressed_cache_bytes: int = OUTPUTS_COMPRESSED_CACHE_BYTES,
+                 etag_cache_size: int = OUTPUTS_ETAG_CACHE_SIZE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.compressed_cache_bytes = compressed_cache_bytes
+        self.etag_cache_size = max(1, etag_cache_size)
+        self._etags = OrderedDict()
+        self._compressed = OrderedDict()
+        self._compressed_size = 0
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self.hashes_computed = 0
+        self.compressions = 0
+        self.compressed_hits = 0
+        self.files_removed = 0
+        self.bytes_removed = 0
+
+    def resolve(self, filename: str):
+        """
+        Returns the OutputFile for a filename in the directory, or None if there is no such file.
+        """
+        # basename() keeps the client from reading files outside the directory.
+        filename = os.path.basename(filename)
+        if not filename or filename.startswith(".") or filename.endswith(".tmp"):
+            return None
+        path = os.path.join(self.directory, filename)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._forget(path)
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        version = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._etags.get(path)
+            if cached is not None:
+                self._etags.move_to_end(path)
+        if cached is not None and cached[0] == version:
+            etag = cached[1]
+        else:
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+            etag = f'"{digest.hexdigest()[:32]}"'
+            with self._lock:
+                self._etags[path] = (version, etag)
+                self._etags.move_to_end(path)
+                while len(self._etags) > self.etag_cache_size:
+                    self._etags.popitem(last=False)
+                self.hashes_computed += 1
+        return OutputFile(filename, path, stat.st_size, stat.st_mtime_ns, etag)
+
+    def _forget(self, path: str):
+        """
+        Drops the cached ETag and compressed copies of a file that no longer exists.
+        """
+        with self._lock:
+            cached = self._etags.pop(path, None)
+            if cached is None:
+                return
+            for key in [key for key in self._compressed if key[0] == cached[1]]:
+                self._compressed_size -= len(self._compressed.pop(key))
+
+    def compressed(self, output: OutputFile, encoding: str) -> bytes:
+        """
+        Returns the file's content compressed with `encoding`, compressing it only once per version.
+        """
+        key = (output.etag, encoding)
+        with self._lock:
+            body = self._compressed.get(key)
+            if body is not None:
+                self._compressed.move_to_end(key)
+                self.compressed_hits += 1
+                return body
+        with open(output.path, "rb") as f:
+            body = compress(f.read(), encoding)
+        with self._lock:
+            self.compressions += 1
+            if len(body) <= self.compressed_cache_bytes and key not in self._compressed:
+                self._compressed[key] = body
+                self._compressed_size += len(body)
+                while self._compressed_size > self.compressed_cache_bytes:
+                    _, evicted = self._compressed.popitem(last=False)
+                    self._compressed_size -= len(evicted)
+        return body
+
+    def sweep(self) -> dict:
+        """
+        Deletes files older than max_age_seconds, then the oldest files until the directory
+        fits in max_bytes. Returns what was removed.
+        """
+        if not os.path.isdir(self.directory):
+            return {"removed": 0, "bytes_removed": 0, "bytes_kept": 0}
+        files = []
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.is_file():
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError:
+                continue
+
+        cutoff = time.time() - self.max_age_seconds
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        removed = removed_bytes = 0
+        for mtime, size, path in files:
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            if path.endswith(".tmp") and mtime >= cutoff:
+                # Still being written (see OptimizationJobManager._write_result).
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"WARNING: Failed to delete output file {path}: {e}")
+                continue
+            total -= size
+            removed += 1
+            removed_bytes += size
+            self._forget(path)
+
+        with self._lock:
+            self.files_removed += removed
+            self.bytes_removed += removed_bytes
+        if removed:
+            print(f"Swept {removed} output files ({removed_bytes} bytes) from {self.directory}.")
+        return {"removed": removed, "bytes_removed": removed_bytes, "bytes_kept": total}
+
+    async def _sweep_periodically(self, interval_seconds: int):
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                print(f"WARNING: Output sweep failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    def start_sweeper(self, interval_seconds: int = OUTPUTS_SWEEP_INTERVAL):
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_periodically(interval_seconds))
+
+    async def stop_sweeper(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "max_bytes": self.max_bytes,
+                "max_age_seconds": self.max_age_seconds,
+                "encodings": list(available_encodings()),
+                "etags_cached": len(self._etags),
+                "etag_cache_size": self.etag_cache_size,
+                "hashes_computed": self.hashes_computed,
+                "compressed_entries": len(self._compressed),
+                "compressed_bytes": self._compressed_size,
+                "compressions": self.compressions,
+                "compressed_hits": self.compressed_hits,
+                "files_removed": self.files_removed,
+                "bytes_removed": self.bytes_removed,
+            }
+
+
+output_store = OutputStore()
@@ -1,71 +1,233 @@
 # api/services/privacy_service.py
-from presidio_analyzer import AnalyzerEngine
-from presidio_analyzer.nlp_engine import NlpEngineProvider
+import os
+import re
+
+from services import model_loader
 
 # --- Engine Configuration (This part is correct and remains the same) ---
 config = {"nlp_engine_name": "spacy", "models": [{"lang_code": "en", "model_name": "en_core_web_sm"}]}
-provider = NlpEngineProvider(nlp_configuration=config)
-nlp_engine = provider.create_engine()
-analyzer = AnalyzerEngine(nlp_engine=nlp_engine, supported_languages=["en"])
+
+# A privacy profile picks the entity types to mask and the spaCy components the analyzer can skip.
+PRIVACY_PROFILES = {
+    # Every default Presidio recognizer on the full spaCy pipeline.
+    "full": {"entities": None, "disabled_components": ()},
+    # Everything the full profile masks except crypto wallets, IBANs and medical licences, which
+    # resumes do not contain. Employers and every personal, card and bank id stay masked.
+    # Only the NER component is needed to find these, so the parser, tagger and lemmatizer are skipped.
+    "resume": {
+        "entities": (
+            "PERSON", "ORGANIZATION", "EMAIL_ADDRESS", "PHONE_NUMBER", "URL", "LOCATION", "DATE_TIME", "NRP",
+            "IP_ADDRESS", "MAC_ADDRESS", "CREDIT_CARD", "US_BANK_NUMBER", "US_DRIVER_LICENSE", "US_ITIN",
+            "US_SSN", "US_PASSPORT", "UK_NHS", "IN_PAN", "IN_AADHAAR",
+        ),
+        "disabled_components": ("parser", "senter", "tagger", "morphologizer", "attribute_ruler", "lemmatizer"),
+    },
+}
+PRIVACY_PROFILE = os.getenv("PRIVACY_PROFILE", "resume")
+# Defaults for mask_texts: texts per spaCy batch and worker processes for nlp.pipe.
+PII_BATCH_SIZE = int(os.getenv("PII_BATCH_SIZE", "16"))
+PII_PROCESSES = int(os.getenv("PII_PROCESSES", "1"))
+
+
+def _trim_pipeline(nlp, disabled_components):
+    for name in disabled_components:
+        if name in nlp.pipe_names:
+            nlp.disable_pipe(name)
+    # The shared tok2vec layer is only worth running if a remaining component listens to it.
+    if "tok2vec" in nlp.pipe_names:
+        listeners = getattr(nlp.get_pipe("tok2vec"), "listening_components", [])
+        if not any(name in nlp.pipe_names for name in listeners):
+            nlp.disable_pipe("tok2vec")
+
+
+def build_analyzer(profile_name: str = PRIVACY_PROFILE):
+    """
+    Builds a Presidio AnalyzerEngine for a privacy profile: a trimmed spaCy pipeline and
+    only the recognizers that can produce the profile's entity types.
+    """
+    # Imported here: spaCy and Presidio are slow to import and the engine is built in the background.
+    from presidio_analyzer import AnalyzerEngine, RecognizerRegistry
+    from presidio_analyzer.nlp_engine import NlpEngineProvider
+
+    profile = PRIVACY_PROFILES[profile_name]
+    provider = NlpEngineProvider(nlp_configuration=config)
+    nlp_engine = provider.create_engine()
+    for nlp in nlp_engine.nlp.values():
+        _trim_pipeline(nlp, profile["disabled_components"])
+
+    registry = RecognizerRegistry(supported_languages=["en"])
+    registry.load_predefined_recognizers(languages=["en"], nlp_engine=nlp_engine)
+    if profile["entities"] is not None:
+        entities = set(profile["entities"])
+        registry.recognizers = [
+            recognizer for recognizer in registry.recognizers
+            if entities.intersection(recognizer.supported_entities)
+        ]
+    return AnalyzerEngine(registry=registry, nlp_engine=nlp_engine, supported_languages=["en"])
+
+
+def _load_analyzer():
+    return build_analyzer(PRIVACY_PROFILE)
+
+
+def _profile_entities(profile_name: str = PRIVACY_PROFILE):
+    entities = PRIVACY_PROFILES[profile_name]["entities"]
+    return list(entities) if entities is not None else None
+
+
+def _warmup_analyzer(analyzer):
+    analyzer.analyze(text="Jane Doe, jane.doe@example.com, 555-123-4567", language='en',
+                     entities=_profile_entities())
+
+
+analyzer_slot = model_loader.register("pii_analyzer", _load_analyzer, _warmup_analyzer)
+
+
+def get_analyzer():
+    """
+    Returns the Presidio AnalyzerEngine, waiting for it to load if necessary.
+    """
+    analyzer = analyzer_slot.get()
+    if analyzer is None:
+        raise RuntimeError(f"PII analyzer is unavailable: {analyzer_slot.error}")
+    return analyzer
+
+
+# Placeholders look like __EMAIL_ADDRESS_3__: uppercase words joined by single underscores, so a
+# placeholder never absorbs underscores from the text around it. Bounded repetition keeps the
+# unmasking scan linear.
+PLACEHOLDER_PATTERN = re.compile(r"__[A-Z0-9]{1,40}(?:_[A-Z0-9]{1,40}){0,8}?_\d{1,6}__")
+# Longest text PLACEHOLDER_PATTERN can match, and a tail of text that could still grow into one.
+MAX_PLACEHOLDER_LENGTH = 2 + 40 + 8 * 41 + 1 + 6 + 2
+_PARTIAL_PLACEHOLDER_PATTERN = re.compile(r"__[A-Z0-9_]*\Z|_\Z")
+
 
 def _create_placeholder(entity_type: str, index: int) -> str:
-    return f"__{entity_type.replace(' ', '_')}_{index}__"
+    entity_type = re.sub(r"[^A-Z0-9]+", "_", entity_type.upper()).strip("_") or "PII"
+    return f"__{entity_type}_{index}__"
+
+
+def resolve_overlaps(results: list) -> list[tuple[int, int, str]]:
+    """
+    Turns analyzer results into sorted, non-overlapping (start, end, entity_type) spans with one sort and sweep.
+    Entities contained in a larger one are dropped (e.g. a URL inside an EMAIL_ADDRESS); partially
+    overlapping entities are merged into one span, so no part of either is left unmasked.
+    The merged span keeps the entity type of its longest member.
+    """
+    spans = []
+    for result in sorted(results, key=lambda r: (r.start, -r.end)):
+        if result.end <= result.start:
+            continue
+        if spans and result.start < spans[-1][1]:
+            start, end, entity_type, longest = spans[-1]
+            if result.end - result.start > longest:
+                entity_type, longest = result.entity_type, result.end - result.start
+            spans[-1] = (start, max(end, result.end), entity_type, longest)
+        else:
+            spans.append((result.start, result.end, result.entity_type, result.end - result.start))
+    return [(start, end, entity_type) for start, end, entity_type, _ in spans]
+
 
-def mask_text(text: str) -> tuple[str, dict]:
+def mask_spans(text: str, spans: list[tuple[int, int, str]]) -> tuple[str, dict]:
+    """
+    Replaces sorted, non-overlapping spans with placeholders, assembling the output with a single join.
+    """
+    pii_map = {}
+    parts = []
+    last_end = 0
+    for i, (start, end, entity_type) in enumerate(spans):
+        placeholder = _create_placeholder(entity_type, i)
+        pii_map[placeholder] = text[start:end]
+        parts.append(text[last_end:start])
+        parts.append(placeholder)
+        last_end = end
+    parts.append(text[last_end:])
+    return "".join(parts), pii_map
+
+
+def mask_text(text: str, analyzer=None, profile_name: str = PRIVACY_PROFILE) -> tuple[str, dict]:
     """
     Masks PII in the input text, correctly handling and filtering overlapping entities.
     """
+    # Resolved outside the try below: if the analyzer is unavailable, raise rather than return unmasked text.
+    analyzer = analyzer or get_analyzer()
     try:
-        analyzer_results = analyzer.analyze(text=text, language='en')
-
-        # --- START OF NEW FILTERING LOGIC ---
-        # This is the crucial step to remove smaller entities contained within larger ones.
-        # For example, removing a 'URL' if it's part of a larger 'EMAIL_ADDRESS'.
-        filtered_results = []
-        for res_i in analyzer_results:
-            is_contained = False
-            for res_j in analyzer_results:
-                if res_i == res_j:
-                    continue
-                # Check if res_j is a superset of res_i
-                if res_j.start <= res_i.start and res_j.end >= res_i.end:
-                    is_contained = True
-                    break
-            if not is_contained:
-                filtered_results.append(res_i)
-        # --- END OF NEW FILTERING LOGIC ---
-
-        # Now, proceed with the string building logic using the CLEAN, filtered list.
-        sorted_results = sorted(filtered_results, key=lambda x: x.start)
-        
-        pii_map = {}
-        masked_text = ""
-        last_end = 0
-
-        for i, result in enumerate(sorted_results):
-            placeholder = _create_placeholder(result.entity_type, i)
-            pii_map[placeholder] = text[result.start:result.end]
-            
-            masked_text += text[last_end:result.start]
-            masked_text += placeholder
-            last_end = result.end
-            
-        masked_text += text[last_end:]
-
-        return masked_text, pii_map
-        
+        analyzer_results = analyzer.analyze(text=text, language='en', entities=_profile_entities(profile_name))
+        return mask_spans(text, resolve_overlaps(analyzer_results))
     except Exception as e:
         print(f"Error during PII masking: {e}")
         return text, {}
 
 
+def mask_texts(
+    texts: list[str],
+    batch_size: int = PII_BATCH_SIZE,
+    n_process: int = PII_PROCESSES,
+    analyzer=None,
+    profile_name: str = PRIVACY_PROFILE
+) -> list[tuple[str, dict]]:
+    """
+    Masks many texts at once: spaCy runs over them in batches through nlp.pipe (in n_process
+    worker processes when n_process > 1), then the regex recognizers run per text.
+    Returns one (masked_text, pii_map) pair per input, in order.
+    """
+    from presidio_analyzer import BatchAnalyzerEngine
+
+    analyzer = analyzer or get_analyzer()
+    batch_analyzer = BatchAnalyzerEngine(analyzer_engine=analyzer)
+    all_results = batch_analyzer.analyze_iterator(
+        texts, language='en', batch_size=batch_size, n_process=n_process,
+        entities=_profile_entities(profile_name),
+    )
+    return [mask_spans(text, resolve_overlaps(results)) for text, results in zip(texts, all_results)]
+
+
 def unmask_text(masked_text: str, pii_map: dict) -> str:
     """
-    This function is already correct and does not need to be changed.
+    Restores every placeholder in one regex pass. Placeholders missing from pii_map are left as they are.
     """
     if not pii_map:
         return masked_text
-    unmasked_text = masked_text
-    for placeholder, original_value in pii_map.items():
-        unmasked_text = unmasked_text.replace(placeholder, original_value)
-    return unmasked_text
+    return PLACEHOLDER_PATTERN.sub(lambda match: pii_map.get(match.group(0), match.group(0)), masked_text)
+
+
+class StreamingUnmasker:
+    """
+    Unmasks text that arrives in chunks, e.g. tokens streamed from the LLM.
+
+    A placeholder can be split across chunks ("__PER" + "SON_0__"), so a tail that could still
+    be the start of one is held back until the next chunk decides it. The cut never falls inside a
+    complete placeholder either, so at most about two MAX_PLACEHOLDER_LENGTH of text is kept and
+    nothing half-masked is ever returned. Feeding every chunk and then calling flush() returns the
+    same text as unmask_text on the whole string.
+    """
+
+    def __init__(self, pii_map: dict):
+        self.pii_map = pii_map
+        self._pending = ""
+
+    def feed(self, chunk: str) -> str:
+        """
+        Adds a chunk and returns the unmasked text that is now safe to emit (possibly empty).
+        """
+        buffer = self._pending + chunk
+        window_start = max(0, len(buffer) - MAX_PLACEHOLDER_LENGTH)
+        partial = _PARTIAL_PLACEHOLDER_PATTERN.search(buffer, window_start)
+        hold = partial.start() if partial else len(buffer)
+        # The pending text always starts where unmask_text would resume, so scanning the buffer from
+        # its start finds the same placeholders; move the cut back if it would split one of them.
+        for match in PLACEHOLDER_PATTERN.finditer(buffer, 0, hold + MAX_PLACEHOLDER_LENGTH):
+            if match.start() >= hold:
+                break
+            if match.end() > hold:
+                hold = match.start()
+                break
+        self._pending = buffer[hold:]
+        return unmask_text(buffer[:hold], self.pii_map)
+
+    def flush(self) -> str:
+        """
+        Returns whatever is still held back, unmasked. Call once the stream has ended.
+        """
+        text, self._pending = self._pending, ""
+        return unmask_text(text, self.pii_map)
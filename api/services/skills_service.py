@@ -0,0 +1,147 @@
+# api/services/skills_service.py
+import functools
+import json
+import math
+import os
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+
+from utils.phrase_matcher import PhraseMatcher, select_longest
+
+# JSON ontology of {"category_weights": {category: weight}, "skills": {category: {canonical: [aliases]}}}.
+SKILLS_ONTOLOGY = os.getenv(
+    "SKILLS_ONTOLOGY",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "skills.json"),
+)
+
+
+# Single-letter names ("c") are also ordinary words ("C-suite", "graded C"), so they only count when
+# another skill is listed right next to them ("C/C++", "Python, C, Go").
+MIN_STANDALONE_PHRASE_LENGTH = 2
+
+
+@dataclass
+class SkillOntology:
+    """
+    The compiled ontology: one automaton over every alias, reporting (skill id, needs context).
+    """
+    matcher: PhraseMatcher
+    names: list[str]
+    categories: list[str]
+    weights: np.ndarray
+
+
+@functools.lru_cache(maxsize=1)
+def get_skill_ontology() -> SkillOntology:
+    """
+    Loads and compiles the skills ontology once per process.
+    """
+    with open(SKILLS_ONTOLOGY, "r", encoding="utf-8") as f:
+        ontology = json.load(f)
+    category_weights = ontology.get("category_weights", {})
+
+    matcher = PhraseMatcher()
+    names, categories, weights = [], [], []
+    for category, skills in ontology.get("skills", {}).items():
+        for canonical, aliases in skills.items():
+            skill_id = len(names)
+            names.append(canonical)
+            categories.append(category)
+            weights.append(float(category_weights.get(category, 1.0)))
+            for phrase in [canonical, *aliases]:
+                matcher.add(phrase, (skill_id, len(phrase.strip()) < MIN_STANDALONE_PHRASE_LENGTH))
+    matcher.build()
+    print(f"Compiled {len(matcher)} skill phrases for {len(names)} skills from {SKILLS_ONTOLOGY}.")
+    return SkillOntology(matcher, names, categories, np.asarray(weights, dtype=np.float32))
+
+
+def extract_skill_counts(text: str) -> dict[int, int]:
+    """
+    Counts mentions of each skill id in one pass over the text.
+    Overlapping aliases resolve leftmost-longest, so "react native" is not also "react".
+    """
+    matches = select_longest(get_skill_ontology().matcher.find_all(text))
+    # Word positions where an unambiguous skill mention starts or ends, for the neighbour check.
+    starts = {start for start, _, (_, needs_context) in matches if not needs_context}
+    ends = {end for _, end, (_, needs_context) in matches if not needs_context}
+    counts = {}
+    for start, end, (skill_id, needs_context) in matches:
+        if needs_context and start not in ends and end not in starts:
+            continue
+        counts[skill_id] = counts.get(skill_id, 0) + 1
+    return counts
+
+
+def extract_skills(text: str) -> list[str]:
+    """
+    Canonical names of the skills mentioned in the text.
+    """
+    names = get_skill_ontology().names
+    return sorted(names[skill_id] for skill_id in extract_skill_counts(text))
+
+
+def build_jd_skill_vector(jd_text: str) -> sparse.csr_matrix:
+    """
+    Sparse 1 x n_skills vector of JD skill importance: the category weight, boosted
+    logarithmically for skills the JD mentions repeatedly.
+    """
+    ontology = get_skill_ontology()
+    counts = extract_skill_counts(jd_text)
+    skill_ids = np.fromiter(counts, dtype=np.int64, count=len(counts))
+    values = np.array(
+        [ontology.weights[skill_id] * (1.0 + math.log(counts[skill_id])) for skill_id in skill_ids],
+        dtype=np.float32,
+    )
+    return sparse.csr_matrix(
+        (values, (np.zeros(len(skill_ids), dtype=np.int64), skill_ids)), shape=(1, len(ontology.names))
+    )
+
+
+def build_skill_matrix(texts: list[str]) -> sparse.csr_matrix:
+    """
+    Sparse len(texts) x n_skills matrix with a 1 for every skill each text mentions.
+    """
+    indptr, indices = [0], []
+    for text in texts:
+        indices.extend(sorted(extract_skill_counts(text)))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float32)
+    return sparse.csr_matrix(
+        (data, np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(texts), len(get_skill_ontology().names)),
+    )
+
+
+def compare_skill_matrix(resume_matrix: sparse.csr_matrix, jd_vector: sparse.csr_matrix) -> list[dict]:
+    """
+    Builds a skill report per resume row: matched, missing (most important first) and extra
+    skills, plus coverage, the share of the JD's skill weight the resume covers.
+    All coverages come from one sparse matrix-vector product.
+    """
+    names = get_skill_ontology().names
+    jd_total = float(jd_vector.sum())
+    coverages = np.asarray(resume_matrix @ jd_vector.T.toarray()).ravel()
+
+    jd_ids = jd_vector.indices
+    jd_weights = dict(zip(jd_ids.tolist(), jd_vector.data.tolist()))
+    reports = []
+    for row, coverage in enumerate(coverages):
+        resume_ids = set(resume_matrix.indices[resume_matrix.indptr[row]:resume_matrix.indptr[row + 1]].tolist())
+        missing = sorted((skill_id for skill_id in jd_weights if skill_id not in resume_ids),
+                         key=lambda skill_id: (-jd_weights[skill_id], names[skill_id]))
+        reports.append({
+            "matched": sorted(names[skill_id] for skill_id in resume_ids if skill_id in jd_weights),
+            "missing": [names[skill_id] for skill_id in missing],
+            "extra": sorted(names[skill_id] for skill_id in resume_ids if skill_id not in jd_weights),
+            "coverage": round(float(coverage) / jd_total * 100, 2) if jd_total else None,
+        })
+    return reports
+
+
+def compare_skills(resume_text: str, jd_vector: sparse.csr_matrix) -> dict:
+    """
+    Skill report for a single resume (see compare_skill_matrix).
+    """
+    return compare_skill_matrix(build_skill_matrix([resume_text]), jd_vector)[0]
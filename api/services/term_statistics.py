@@ -0,0 +1,182 @@
+# api/services/term_statistics.py
+# Corpus-level document frequencies for TF-IDF keyword weighting.
+# Terms (unigrams and bigrams) are hashed into a fixed number of buckets, so the model has a
+# constant size no matter how many JDs it has seen. On disk it is a directory holding:
+# - df.u32: one uint32 document frequency per bucket, memory-mapped at load time.
+# - meta.json: bucket count and number of documents counted.
+# - documents.txt: fingerprints of counted documents, so the same JD is never counted twice.
+# Build or extend it offline with `python -m services.term_statistics build --dir <dir> <files or dirs>`
+# from api/; the API also adds newly registered JDs as they arrive.
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import zlib
+
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from services.tokenization_service import tokenize_document
+
+DEFAULT_FEATURES = 2 ** 20
+
+
+def extract_terms(tokens: list[str]) -> list[str]:
+    """
+    Unigrams and bigrams of the tokens after removing English stop words, in document order
+    (the same terms TfidfVectorizer(stop_words='english', ngram_range=(1, 2)) produces).
+    """
+    words = [token for token in tokens if len(token) > 1 and token not in ENGLISH_STOP_WORDS]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def hash_term(term: str, n_features: int) -> int:
+    # crc32 rather than hash(): bucket ids must be stable across processes and restarts.
+    return zlib.crc32(term.encode("utf-8")) % n_features
+
+
+class TermStatistics:
+    """
+    Hashed document-frequency table with smoothed IDF weights, updated incrementally.
+    Without a directory the table lives in memory only.
+    """
+
+    def __init__(self, directory: str = None, n_features: int = DEFAULT_FEATURES):
+        self.directory = directory
+        self.n_features = n_features
+        self.n_documents = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+        if directory:
+            self._open(directory)
+        else:
+            self._df = np.zeros(n_features, dtype=np.uint32)
+
+    def _open(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, "meta.json")
+        df_path = os.path.join(directory, "df.u32")
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            # An existing table decides the bucket count; hashing into a different size would be meaningless.
+            self.n_features = meta["n_features"]
+            self.n_documents = meta["n_documents"]
+        if not os.path.exists(df_path):
+            np.zeros(self.n_features, dtype=np.uint32).tofile(df_path)
+        self._df = np.memmap(df_path, dtype=np.uint32, mode="r+", shape=(self.n_features,))
+        documents_path = os.path.join(directory, "documents.txt")
+        if os.path.exists(documents_path):
+            with open(documents_path, "r", encoding="utf-8") as f:
+                self._seen = {line.strip() for line in f if line.strip()}
+
+    def idf(self, buckets: np.ndarray) -> np.ndarray:
+        """
+        Smoothed IDF, ln((1 + N) / (1 + df)) + 1, for the given buckets.
+        With an empty corpus every weight is 1, i.e. plain term frequency.
+        """
+        df = self._df[buckets].astype(np.float64)
+        return np.log((1.0 + self.n_documents) / (1.0 + df)) + 1.0
+
+    def weigh(self, tokens: list[str]) -> dict[str, float]:
+        """
+        L2-normalized TF-IDF weight of each term of a tokenized document, keyed by term.
+        """
+        counts = {}
+        for term in extract_terms(tokens):
+            counts[term] = counts.get(term, 0) + 1
+        if not counts:
+            return {}
+        terms = sorted(counts)
+        buckets = np.fromiter((hash_term(term, self.n_features) for term in terms), dtype=np.int64, count=len(terms))
+        weights = np.fromiter((counts[term] for term in terms), dtype=np.float64, count=len(terms)) * self.idf(buckets)
+        weights /= np.linalg.norm(weights)
+        return dict(zip(terms, weights.tolist()))
+
+    def add_documents(self, texts: list[str]) -> int:
+        """
+        Counts each new document once in the document frequencies. Returns how many were new.
+        """
+        added = []
+        with self._lock:
+            for text in texts:
+                tokens = tokenize_document(text).tokens
+                fingerprint = hashlib.sha256(" ".join(tokens).encode("utf-8")).hexdigest()[:16]
+                if not tokens or fingerprint in self._seen:
+                    continue
+                self._seen.add(fingerprint)
+                buckets = np.unique(np.fromiter(
+                    (hash_term(term, self.n_features) for term in extract_terms(tokens)), dtype=np.int64
+                ))
+                self._df[buckets] += 1
+                self.n_documents += 1
+                added.append(fingerprint)
+            if added and self.directory:
+                self._persist(added)
+        return len(added)
+
+    def _persist(self, fingerprints: list[str]):
+        try:
+            self._df.flush()
+            with open(os.path.join(self.directory, "documents.txt"), "a", encoding="utf-8") as f:
+                f.write("".join(f"{fingerprint}\n" for fingerprint in fingerprints))
+            meta_path = os.path.join(self.directory, "meta.json")
+            with open(f"{meta_path}.tmp", "w", encoding="utf-8") as f:
+                json.dump({"n_features": self.n_features, "n_documents": self.n_documents}, f)
+            os.replace(f"{meta_path}.tmp", meta_path)
+        except OSError as e:
+            print(f"WARNING: Failed to persist term statistics to {self.directory}: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "documents": self.n_documents,
+            "buckets": self.n_features,
+            "buckets_used": int(np.count_nonzero(self._df)),
+            "persistent": bool(self.directory),
+        }
+
+
+def _iter_text_files(paths: list[str]):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith((".txt", ".md")):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Corpus term statistics for keyword weighting.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Count JD text files (or directories of them) into the corpus.")
+    build.add_argument("--dir", required=True)
+    build.add_argument("--features", type=int, default=DEFAULT_FEATURES)
+    build.add_argument("paths", nargs="+")
+    show = subparsers.add_parser("stats", help="Print corpus statistics.")
+    show.add_argument("--dir", required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "stats":
+        print(json.dumps(TermStatistics(args.dir).stats(), indent=2))
+        return 0
+
+    model = TermStatistics(args.dir, n_features=args.features)
+    added = 0
+    batch = []
+    for path in _iter_text_files(args.paths):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            batch.append(f.read())
+        if len(batch) >= 256:
+            added += model.add_documents(batch)
+            batch = []
+    added += model.add_documents(batch)
+    print(f"Added {added} documents; corpus now has {model.n_documents}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,48 +1,251 @@
 from docx import Document
 import PyPDF2
+import io
+import multiprocessing
 import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+from utils.file_operations import decode_text
+from services.extraction_cache import ExtractionCache, make_extraction_key
+
+# Budgets for PDF extraction. Pages past PDF_MAX_PAGES are skipped, and extraction stops once
+# PDF_MAX_CHARS characters have been produced, so oversized portfolios cannot monopolize a worker.
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "200000"))
+# PDFs with at least this many pages are parsed in parallel across a process pool.
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "4"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Bump when extraction output changes. The page and character budgets are part of the version
+# because they change the extracted text too.
+EXTRACTOR_VERSION = f"2:pages={PDF_MAX_PAGES}:chars={PDF_MAX_CHARS}"
+
+# Parsed PDF/DOCX text keyed by the SHA-256 of the uploaded bytes, so a candidate re-uploading
+# the same file for /analyze/ and /optimize/ only pays for parsing once.
+# Set EXTRACTION_CACHE_DIR to keep entries on disk (expiring after EXTRACTION_CACHE_TTL seconds).
+extraction_cache = ExtractionCache(
+    max_entries=int(os.getenv("EXTRACTION_CACHE_SIZE", "256")),
+    disk_dir=os.getenv("EXTRACTION_CACHE_DIR") or None,
+    ttl_seconds=int(os.getenv("EXTRACTION_CACHE_TTL", str(7 * 24 * 3600))),
+)
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+# In each pool worker: the PDF readers it has opened, by document id, so every page range of a
+# document after the first reuses the parsed document instead of opening it again.
+_worker_readers = OrderedDict()
+_WORKER_READER_LIMIT = 4
+
+# Totals over every PDF parsed by extract_text_from_pdf (cache hits are not parsed).
+_pdf_stats = {"documents": 0, "pages": 0, "truncated": 0, "seconds": 0.0, "slowest_page_seconds": 0.0}
+_pdf_stats_lock = threading.Lock()
+
+def _as_stream(source):
+    """
+    Accepts a file path, raw bytes or a binary file-like object and returns something
+    PyPDF2 and python-docx can read from. In-memory sources never touch disk.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+def _describe(source) -> str:
+    return source if isinstance(source, str) else "<in-memory upload>"
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # "spawn" avoids forking a process that already runs model-loading and inference threads.
+            _pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pdf_pool
+
+def _worker_reader(document_id: str, shm_name: str, size: int) -> PyPDF2.PdfReader:
+    reader = _worker_readers.get(document_id)
+    if reader is None:
+        # The bytes are shared once per document, not pickled into every task.
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            pdf_bytes = bytes(shm.buf[:size])
+        finally:
+            shm.close()
+        reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+        _worker_readers[document_id] = reader
+        while len(_worker_readers) > _WORKER_READER_LIMIT:
+            _worker_readers.popitem(last=False)
+    _worker_readers.move_to_end(document_id)
+    return reader
+
+def _extract_pdf_page_range(document_id: str, shm_name: str, size: int, start: int, end: int) -> list[tuple[int, str, float]]:
+    """
+    Worker task: extracts pages [start, end) and returns (page number, text, seconds) tuples.
+    """
+    reader = _worker_reader(document_id, shm_name, size)
+    pages = []
+    for page_num in range(start, end):
+        page_start = time.perf_counter()
+        page_text = reader.pages[page_num].extract_text() or ""
+        pages.append((page_num, page_text, time.perf_counter() - page_start))
+    return pages
+
+def _read_pdf_bytes(pdf_source) -> bytes:
+    if isinstance(pdf_source, str):
+        with open(pdf_source, 'rb') as file:
+            return file.read()
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        return bytes(pdf_source)
+    return pdf_source.read()
+
+def shutdown_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=False, cancel_futures=True)
+            _pdf_pool = None
+
+def iter_pdf_pages(pdf_source, max_pages: int = PDF_MAX_PAGES, max_chars: int = PDF_MAX_CHARS, parallel: bool = None):
+    """
+    Yields extracted pages in order as dicts with "page", "text" and "seconds" keys.
+
+    Pages are produced as soon as they are parsed, so callers can start work before the last
+    page is done. Large PDFs (PDF_PARALLEL_MIN_PAGES or more) are split into page ranges that are
+    parsed in parallel on a process pool. Extraction stops after max_pages pages or once max_chars
+    characters have been yielded; the final page is cut to fit the character budget.
+    """
+    pdf_bytes = _read_pdf_bytes(pdf_source)
+    yield from _iter_pages(pdf_bytes, PyPDF2.PdfReader(io.BytesIO(pdf_bytes)), max_pages, max_chars, parallel)
+
+def _iter_pages(pdf_bytes: bytes, reader: PyPDF2.PdfReader, max_pages: int, max_chars: int, parallel: bool):
+    page_count = min(len(reader.pages), max_pages)
+    if parallel is None:
+        parallel = page_count >= PDF_PARALLEL_MIN_PAGES and PDF_WORKERS > 1
+
+    remaining_chars = max_chars
+
+    def _budgeted(page_num, page_text, seconds):
+        nonlocal remaining_chars
+        page_text = page_text[:remaining_chars]
+        remaining_chars -= len(page_text)
+        return {"page": page_num + 1, "text": page_text, "seconds": round(seconds, 4)}
+
+    if not parallel:
+        for page_num in range(page_count):
+            if remaining_chars <= 0:
+                return
+            page_start = time.perf_counter()
+            page_text = reader.pages[page_num].extract_text() or ""
+            yield _budgeted(page_num, page_text, time.perf_counter() - page_start)
+        return
+
+    shm = shared_memory.SharedMemory(create=True, size=len(pdf_bytes))
+    shm.buf[:len(pdf_bytes)] = pdf_bytes
+    document_id = uuid.uuid4().hex
+    pool = _get_pdf_pool()
+    futures = [
+        pool.submit(
+            _extract_pdf_page_range, document_id, shm.name, len(pdf_bytes),
+            start, min(start + PDF_PAGES_PER_TASK, page_count)
+        )
+        for start in range(0, page_count, PDF_PAGES_PER_TASK)
+    ]
+    try:
+        for future in futures:
+            for page_num, page_text, seconds in future.result():
+                if remaining_chars <= 0:
+                    return
+                yield _budgeted(page_num, page_text, seconds)
+    finally:
+        for future in futures:
+            future.cancel()
+        # Running tasks may still be reading the shared bytes, so they finish before the block is freed.
+        for future in futures:
+            if not future.cancelled():
+                future.exception()
+        shm.close()
+        shm.unlink()
+
+def extract_pdf_with_timings(pdf_source, max_pages: int = PDF_MAX_PAGES, max_chars: int = PDF_MAX_CHARS) -> dict:
     """
-    Extracts text from a PDF file.
+    Extracts a PDF and reports per-page timings.
+
+    Returns:
+        dict: "text", "pages" (page number, characters and seconds per page), "page_count"
+            and "truncated" (True if a page or character budget cut the document short).
+    """
+    pdf_bytes = _read_pdf_bytes(pdf_source)
+    reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    page_count = len(reader.pages)
+    parts = []
+    pages = []
+    for page in _iter_pages(pdf_bytes, reader, max_pages, max_chars, None):
+        parts.append(page["text"] + "\n")
+        pages.append({"page": page["page"], "chars": len(page["text"]), "seconds": page["seconds"]})
+    return {
+        "text": "".join(parts),
+        "pages": pages,
+        "page_count": page_count,
+        "truncated": len(pages) < page_count or sum(page["chars"] for page in pages) >= max_chars,
+    }
+
+def _record_pdf_timings(result: dict):
+    with _pdf_stats_lock:
+        _pdf_stats["documents"] += 1
+        _pdf_stats["pages"] += len(result["pages"])
+        _pdf_stats["truncated"] += int(result["truncated"])
+        for page in result["pages"]:
+            _pdf_stats["seconds"] += page["seconds"]
+            _pdf_stats["slowest_page_seconds"] = max(_pdf_stats["slowest_page_seconds"], page["seconds"])
+
+def pdf_stats() -> dict:
+    """
+    Per-page PDF parsing counters since startup, for /stats/.
+    """
+    with _pdf_stats_lock:
+        stats = dict(_pdf_stats)
+    stats["seconds"] = round(stats["seconds"], 4)
+    stats["mean_page_seconds"] = round(stats["seconds"] / stats["pages"], 4) if stats["pages"] else 0.0
+    return stats
+
+def extract_text_from_pdf(pdf_source) -> str:
+    """
+    Extracts text from a PDF file, within the PDF_MAX_PAGES / PDF_MAX_CHARS budgets.
 
     Args:
-        pdf_path (str): The full path to the PDF file.
+        pdf_source (str | bytes | BinaryIO): The full path to the PDF file, or its content.
 
     Returns:
         str: The extracted text, or an empty string if an error occurs.
     """
-    text = ""
     try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            for page_num in range(len(reader.pages)):
-                page = reader.pages[page_num]
-                text += page.extract_text() + "\n" 
+        result = extract_pdf_with_timings(pdf_source)
+        _record_pdf_timings(result)
+        return result["text"]
     except Exception as e:
-        print(f"Error extracting text from PDF {pdf_path}: {e}")
-        
-    return text
+        print(f"Error extracting text from PDF {_describe(pdf_source)}: {e}")
+        return ""
 
-def extract_text_from_docx(docx_path: str) -> str:
+def extract_text_from_docx(docx_source) -> str:
     """
     Extracts text from a DOCX file.
 
     Args:
-        docx_path (str): The full path to the DOCX file.
+        docx_source (str | bytes | BinaryIO): The full path to the DOCX file, or its content.
 
     Returns:
         str: The extracted text, or an empty string if an error occurs.
     """
-    text = ""
     try:
-        document = Document(docx_path)
-        for paragraph in document.paragraphs:
-            text += paragraph.text + "\n"
+        document = Document(_as_stream(docx_source))
+        return "".join(paragraph.text + "\n" for paragraph in document.paragraphs)
     except Exception as e:
-        print(f"Error extracting text from DOCX {docx_path}: {e}")
-       
-    return text
+        print(f"Error extracting text from DOCX {_describe(docx_source)}: {e}")
+        return ""
 
 def get_file_extension(filename: str) -> str:
     """
@@ -74,4 +277,31 @@ def extract_text_from_file(file_path: str, filename: str) -> str:
         with open(file_path, 'r', encoding='utf-8') as f:
             return f.read()
     else:
-        raise ValueError(f"Unsupported file type: {ext}")
\ No newline at end of file
+        raise ValueError(f"Unsupported file type: {ext}")
+
+def extract_text_from_bytes(data: bytes, filename: str) -> str:
+    """
+    Extracts text from uploaded file content held in memory, based on the filename's extension.
+    PDF and DOCX go to their extractors, through the extraction cache; any other file is decoded as plain text.
+
+    Args:
+        data (bytes): The file content.
+        filename (str): The original filename (used to determine extension).
+
+    Returns:
+        str: The extracted text.
+    """
+    ext = get_file_extension(filename or "")
+    if ext not in ('.pdf', '.docx'):
+        return decode_text(data)
+
+    key = make_extraction_key(data, f"{ext}:{EXTRACTOR_VERSION}")
+    text = extraction_cache.get(key)
+    if text is not None:
+        return text
+
+    text = extract_text_from_pdf(data) if ext == '.pdf' else extract_text_from_docx(data)
+    # Failed extractions return "" and are not cached, so a retry gets another chance.
+    if text:
+        extraction_cache.put(key, text)
+    return text
@@ -0,0 +1,51 @@
+# api/services/title_service.py
+import functools
+import json
+import os
+from dataclasses import dataclass
+
+from utils.phrase_matcher import PhraseMatcher, select_longest
+
+# JSON taxonomy of {"titles": {canonical: [synonyms]}, "seniority": {level: [synonyms]}}.
+JOB_TITLE_TAXONOMY = os.getenv(
+    "JOB_TITLE_TAXONOMY",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "job_titles.json"),
+)
+
+
+@dataclass
+class RoleMatches:
+    titles: set[str]
+    seniority: set[str]
+
+
+@functools.lru_cache(maxsize=1)
+def get_title_matcher() -> PhraseMatcher:
+    """
+    Compiles the title and seniority taxonomy into one automaton, once per process.
+    """
+    with open(JOB_TITLE_TAXONOMY, "r", encoding="utf-8") as f:
+        taxonomy = json.load(f)
+    matcher = PhraseMatcher()
+    for kind in ("titles", "seniority"):
+        for canonical, synonyms in taxonomy.get(kind, {}).items():
+            for phrase in [canonical, *synonyms]:
+                matcher.add(phrase, (kind, canonical))
+    matcher.build()
+    print(f"Compiled {len(matcher)} job title and seniority phrases from {JOB_TITLE_TAXONOMY}.")
+    return matcher
+
+
+def extract_roles(text: str) -> RoleMatches:
+    """
+    Finds canonical job titles and seniority levels in one pass over the text.
+    Titles and seniority are resolved separately, so "Senior SDE II" yields the title
+    "software engineer" and the levels "senior" and "mid".
+    """
+    matches = get_title_matcher().find_all(text)
+    titles = select_longest([match for match in matches if match[2][0] == "titles"])
+    seniority = select_longest([match for match in matches if match[2][0] == "seniority"])
+    return RoleMatches(
+        titles={canonical for _, _, (_, canonical) in titles},
+        seniority={canonical for _, _, (_, canonical) in seniority},
+    )
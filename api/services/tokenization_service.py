@@ -0,0 +1,68 @@
+# api/services/tokenization_service.py
+import functools
+import os
+import re
+from dataclasses import dataclass
+
+from nltk.corpus import stopwords
+from nltk.tokenize import word_tokenize
+
+# "nltk" uses NLTK's word_tokenize (the original behaviour); "regex" is a much faster
+# split that gives the same tokens on cleaned text in practice.
+TOKENIZER = os.getenv("TOKENIZER", "nltk")
+
+_NON_ALNUM_PATTERN = re.compile(r'[^a-z0-9\s]')
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+@functools.lru_cache(maxsize=1)
+def get_stopwords() -> frozenset:
+    """
+    English stopwords, loaded from NLTK once per process.
+    """
+    return frozenset(stopwords.words('english'))
+
+
+@dataclass
+class TokenizedDocument:
+    """
+    Every token view of a document that the matching checks use, computed in one pass.
+    """
+    lower_text: str
+    tokens: list[str]
+    content_tokens: list[str]
+    bigrams: list[str]
+    ngram_set: set[str]
+    content_text: str
+
+
+def tokenize(clean_text: str, tokenizer: str = None) -> list[str]:
+    """
+    Splits already lowercased, punctuation-free text into tokens.
+    """
+    if (tokenizer or TOKENIZER) == "regex":
+        return _TOKEN_PATTERN.findall(clean_text)
+    return word_tokenize(clean_text)
+
+
+def tokenize_document(text: str, tokenizer: str = None) -> TokenizedDocument:
+    """
+    Lowercases, cleans and tokenizes a document once, and derives the stopword-filtered tokens,
+    bigrams and n-gram set from that single tokenization.
+    """
+    lower_text = text.lower()
+    clean_text = _NON_ALNUM_PATTERN.sub(' ', lower_text)
+    tokens = [word for word in tokenize(clean_text, tokenizer) if len(word) > 1]
+
+    stop_words = get_stopwords()
+    content_tokens = [word for word in tokens if word not in stop_words]
+    bigrams = [f"{first} {second}" for first, second in zip(content_tokens, content_tokens[1:])]
+
+    return TokenizedDocument(
+        lower_text=lower_text,
+        tokens=tokens,
+        content_tokens=content_tokens,
+        bigrams=bigrams,
+        ngram_set=set(content_tokens) | set(bigrams),
+        content_text=" ".join(content_tokens),
+    )
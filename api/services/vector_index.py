@@ -0,0 +1,251 @@
+# api/services/vector_index.py
+import os
+import threading
+
+import numpy as np
+
+
+def npz_path(path: str) -> str:
+    """
+    The path save() writes to: np.savez adds ".npz" to other names, so it is added up front.
+    """
+    return path if path.endswith(".npz") else f"{path}.npz"
+
+
+class VectorIndex:
+    """
+    Cosine-similarity index over unit-normalized embeddings.
+
+    Small corpora are searched exactly. Once the corpus reaches `ivf_min_size` vectors,
+    an IVF (inverted file) layout is trained with NumPy k-means: vectors are bucketed by their
+    nearest centroid and a query only scores the `nprobe` closest buckets.
+    Vectors can be added and deleted incrementally; deletes are tombstones that are
+    compacted away once they make up a large share of the storage.
+    """
+
+    def __init__(self, dim: int = None, nlist: int = None, nprobe: int = 8, ivf_min_size: int = 4096):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.ivf_min_size = ivf_min_size
+
+        self._vectors = np.zeros((0, dim or 0), dtype=np.float32)
+        self._size = 0
+        self._ids = []
+        self._rows = {}
+        self._alive = np.zeros(0, dtype=bool)
+
+        self._centroids = None
+        self._lists = []
+        self._list_of_row = np.zeros(0, dtype=np.int32)
+        self._trained_size = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, np.finfo(np.float32).eps)
+
+    def _ensure_capacity(self, extra: int):
+        needed = self._size + extra
+        if needed <= self._vectors.shape[0]:
+            return
+        capacity = max(needed, 2 * self._vectors.shape[0], 1024)
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        list_of_row = np.full(capacity, -1, dtype=np.int32)
+        list_of_row[:self._size] = self._list_of_row[:self._size]
+        self._vectors, self._alive, self._list_of_row = vectors, alive, list_of_row
+
+    def add(self, ids: list[str], vectors: np.ndarray):
+        """
+        Adds (or replaces) vectors under the given ids.
+        """
+        vectors = self._normalize(np.atleast_2d(vectors))
+        if len(ids) != vectors.shape[0]:
+            raise ValueError("ids and vectors must have the same length.")
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Vector dimension {vectors.shape[1]} does not match index dimension {self.dim}.")
+
+            for item_id in ids:
+                if item_id in self._rows:
+                    self._remove_row(self._rows.pop(item_id))
+
+            self._ensure_capacity(len(ids))
+            start = self._size
+            end = start + len(ids)
+            self._vectors[start:end] = vectors
+            self._alive[start:end] = True
+            self._size = end
+            for offset, item_id in enumerate(ids):
+                self._ids.append(item_id)
+                self._rows[item_id] = start + offset
+
+            if self._centroids is not None:
+                self._assign(np.arange(start, end))
+            self._maybe_retrain()
+
+    def delete(self, ids: list[str]) -> int:
+        """
+        Deletes vectors by id. Returns the number of ids that were present.
+        """
+        removed = 0
+        with self._lock:
+            for item_id in ids:
+                row = self._rows.pop(item_id, None)
+                if row is not None:
+                    self._remove_row(row)
+                    removed += 1
+            # Compact once tombstones dominate, so scans and memory stay proportional to live vectors.
+            if self._size and len(self._rows) < self._size // 2:
+                self._compact()
+        return removed
+
+    def _remove_row(self, row: int):
+        self._alive[row] = False
+        list_id = self._list_of_row[row]
+        if list_id >= 0:
+            self._lists[list_id].discard(row)
+            self._list_of_row[row] = -1
+
+    def _compact(self):
+        live_rows = np.flatnonzero(self._alive[:self._size])
+        self._vectors = self._vectors[live_rows].copy()
+        self._alive = np.ones(len(live_rows), dtype=bool)
+        self._ids = [self._ids[row] for row in live_rows]
+        self._rows = {item_id: row for row, item_id in enumerate(self._ids)}
+        self._size = len(live_rows)
+        self._list_of_row = np.full(self._size, -1, dtype=np.int32)
+        if self._centroids is not None:
+            self._lists = [set() for _ in range(len(self._centroids))]
+            self._assign(np.arange(self._size))
+
+    def _maybe_retrain(self):
+        live = len(self._rows)
+        if live < self.ivf_min_size:
+            return
+        # Retrain when the corpus has doubled since the last training, keeping clusters balanced.
+        if self._centroids is None or live >= 2 * self._trained_size:
+            self.train()
+
+    def train(self, iterations: int = 10, sample_size: int = 65536, seed: int = 0):
+        """
+        Trains IVF centroids with spherical k-means on a sample of the live vectors.
+        """
+        with self._lock:
+            live_rows = np.flatnonzero(self._alive[:self._size])
+            if len(live_rows) == 0:
+                return
+            nlist = self.nlist or max(1, int(np.sqrt(len(live_rows))))
+            nlist = min(nlist, len(live_rows))
+
+            rng = np.random.default_rng(seed)
+            sample_rows = live_rows if len(live_rows) <= sample_size else rng.choice(live_rows, sample_size, replace=False)
+            sample = self._vectors[sample_rows]
+            centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+            for _ in range(iterations):
+                assignment = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignment, sample)
+                counts = np.bincount(assignment, minlength=nlist)
+                empty = counts == 0
+                # Re-seed empty clusters with random samples instead of letting them die.
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+                centroids = self._normalize(sums)
+
+            self._centroids = centroids
+            self._lists = [set() for _ in range(nlist)]
+            self._list_of_row[:] = -1
+            self._assign(live_rows)
+            self._trained_size = len(live_rows)
+
+    def _assign(self, rows: np.ndarray):
+        rows = rows[self._alive[rows]]
+        if len(rows) == 0:
+            return
+        assignment = np.argmax(self._vectors[rows] @ self._centroids.T, axis=1)
+        self._list_of_row[rows] = assignment
+        for row, list_id in zip(rows.tolist(), assignment.tolist()):
+            self._lists[list_id].add(row)
+
+    def search(self, query: np.ndarray, top_k: int = 10, exact: bool = False) -> list[tuple[str, float]]:
+        """
+        Returns up to top_k (id, cosine score) pairs, best first.
+        Uses the IVF buckets when trained, unless exact=True forces a brute-force scan.
+        """
+        query = self._normalize(np.asarray(query).reshape(-1))
+        with self._lock:
+            if not self._rows or top_k <= 0:
+                return []
+            if self._centroids is None or exact:
+                candidates = np.flatnonzero(self._alive[:self._size])
+            else:
+                nprobe = min(self.nprobe, len(self._centroids))
+                closest_lists = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+                candidates = np.fromiter(
+                    (row for list_id in closest_lists for row in self._lists[list_id]), dtype=np.int64
+                )
+                # Too few candidates in the probed buckets: fall back to the exact scan.
+                if len(candidates) < top_k:
+                    candidates = np.flatnonzero(self._alive[:self._size])
+
+            scores = self._vectors[candidates] @ query
+            k = min(top_k, len(candidates))
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            return [(self._ids[candidates[i]], float(scores[i])) for i in best]
+
+    def save(self, path: str):
+        """
+        Saves the live vectors and ids to a .npz file (see npz_path). Centroids are retrained on load.
+        """
+        path = npz_path(path)
+        with self._lock:
+            live_rows = np.flatnonzero(self._alive[:self._size])
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Written through a file object so np.savez keeps the name, then moved into place whole.
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "wb") as f:
+                np.savez(
+                    f,
+                    vectors=self._vectors[live_rows],
+                    ids=np.array([self._ids[row] for row in live_rows], dtype=str),
+                )
+            os.replace(temp_path, path)
+
+    def load(self, path: str):
+        """
+        Adds every vector from a file written by save().
+        """
+        with np.load(npz_path(path), allow_pickle=False) as data:
+            ids = data["ids"].tolist()
+            vectors = data["vectors"]
+        if ids:
+            self.add(ids, vectors)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "vectors": len(self._rows),
+                "dim": self.dim,
+                "mode": "ivf" if self._centroids is not None else "exact",
+                "nlist": len(self._centroids) if self._centroids is not None else 0,
+                "nprobe": self.nprobe,
+            }
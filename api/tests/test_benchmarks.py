@@ -0,0 +1,109 @@
+# api/tests/test_benchmarks.py
+# Tests for the benchmark corpus and the regression gate (the timings themselves are not tested).
+# Run from api/: `python -m pytest tests/test_benchmarks.py`
+import json
+
+from benchmarks import corpus, suite
+from services import text_extraction_service
+
+
+def _results(values: dict, environment: dict = None) -> dict:
+    results = {}
+    for name, value in values.items():
+        if isinstance(value, dict):
+            results[name] = value
+        elif name.startswith("e2e."):
+            results[name] = {"value": value, "unit": "req/s", "better": "higher"}
+        else:
+            results[name] = {"value": value, "unit": "ms", "better": "lower"}
+    return {"schema": suite.SCHEMA_VERSION, "environment": environment or {}, "results": results}
+
+
+def test_corpus_is_deterministic_and_covers_every_case():
+    documents = corpus.build_corpus()
+    assert documents == corpus.build_corpus()
+    assert documents != corpus.build_corpus(seed=corpus.DEFAULT_SEED + 1)
+    assert set(documents) == set(corpus.CASES)
+    sizes = {case: len(texts["resume"]) for case, texts in documents.items()}
+    assert sizes["short"] < sizes["long"] < sizes["adversarial"]
+    assert "__PERSON_0__" in documents["adversarial"]["resume"]
+    assert len(set(corpus.make_resume_variants(20))) == 20
+
+
+def test_generated_pdf_and_docx_extract_back_to_the_text():
+    resume = corpus.build_corpus()["short"]["resume"]
+    assert corpus.make_pdf(resume) == corpus.make_pdf(resume)
+    from_pdf = text_extraction_service.extract_text_from_pdf(corpus.make_pdf(resume, lines_per_page=5))
+    from_docx = text_extraction_service.extract_text_from_docx(corpus.make_docx(resume))
+    # Long lines are wrapped in the PDF, so compare without whitespace.
+    assert "".join(from_pdf.split()) == "".join(resume.split())
+    for line in filter(None, resume.splitlines()):
+        assert line in from_docx
+
+
+def test_measure_reports_per_call_times():
+    calls = []
+    benchmark = suite.Benchmark("noop", lambda: calls.append(1), chars=3)
+    result = suite.measure(benchmark, repeat=3, min_sample_s=0.001)
+    assert result["unit"] == "ms" and result["better"] == "lower"
+    assert result["runs"] == 3 and result["calls_per_run"] > 1
+    assert 0 <= result["min_ms"] == result["value"] <= result["max_ms"]
+    assert len(calls) > 3 * result["calls_per_run"]
+
+
+def test_compare_flags_regressions_in_both_directions():
+    baseline = _results({"match.a": 10.0, "match.b": 10.0, "match.c": 10.0, "match.tiny": 0.01, "e2e.analyze": 100.0})
+    current = _results({"match.a": 13.0, "match.b": 11.0, "match.c": 7.0, "match.tiny": 0.03, "e2e.analyze": 70.0})
+    statuses = {row["name"]: row["status"] for row in suite.compare(baseline, current, threshold=0.2)}
+    assert statuses == {
+        "match.a": "regression",
+        "match.b": "ok",
+        "match.c": "improved",
+        # Tripled, but by less than the noise floor.
+        "match.tiny": "ok",
+        # Throughput going down is the regression.
+        "e2e.analyze": "regression",
+    }
+
+
+def test_compare_fails_benchmarks_that_lost_their_result():
+    baseline = _results({"match.a": 10.0, "match.b": 10.0, "match.c": 10.0,
+                         "match.d": {"skipped": "no model"}, "match.e": {"error": "boom"}})
+    current = _results({"match.a": {"error": "NameError: name 'cosine_similarity' is not defined"},
+                        "match.c": {"skipped": "no model"}, "match.d": {"skipped": "no model"},
+                        "match.e": 1.0, "match.f": 1.0})
+    statuses = {row["name"]: row["status"] for row in suite.compare(baseline, current)}
+    assert statuses == {
+        "match.a": "failed",
+        "match.b": "failed",
+        "match.c": "failed",
+        # Nothing in the baseline to compare against.
+        "match.d": "missing",
+        "match.e": "missing",
+        "match.f": "missing",
+    }
+
+
+def test_compare_command_exits_non_zero_when_a_benchmark_now_errors(tmp_path, capsys):
+    baseline_path, current_path = tmp_path / "baseline.json", tmp_path / "current.json"
+    baseline_path.write_text(json.dumps(_results({"match.a": 10.0, "match.b": 10.0})))
+    current_path.write_text(json.dumps(_results({"match.a": {"error": "NameError"}, "match.b": 10.0})))
+    assert suite.main(["compare", str(baseline_path), str(current_path)]) == 1
+    assert "FAILED: match.a: NameError" in capsys.readouterr().out
+
+
+def test_compare_command_exits_non_zero_on_regression(tmp_path, capsys):
+    environment = {"python": "3.11.7", "models": {"sentence_model": "ready"}, "git_commit": "abc"}
+    baseline_path, current_path = tmp_path / "baseline.json", tmp_path / "current.json"
+    baseline_path.write_text(json.dumps(_results({"match.a": 10.0}, environment)))
+    current_path.write_text(json.dumps(_results({"match.a": 10.5}, {**environment, "git_commit": "def"})))
+    assert suite.main(["compare", str(baseline_path), str(current_path)]) == 0
+    assert "WARNING" not in capsys.readouterr().out
+
+    slower = {**environment, "models": {"sentence_model": "failed", "pii_analyzer": "ready"}}
+    current_path.write_text(json.dumps(_results({"match.a": 20.0}, slower)))
+    assert suite.main(["compare", str(baseline_path), str(current_path)]) == 1
+    output = capsys.readouterr().out
+    assert "models.sentence_model 'ready' -> 'failed'" in output
+    assert "pii_analyzer" not in output
+    assert "1 regression(s)" in output
@@ -0,0 +1,95 @@
+# api/tests/test_downloads.py
+# Tests for /download/: ETags and 304s, ranges, compression, and the outputs sweeper.
+# Run from api/: `python -m pytest tests/test_downloads.py`
+import gzip
+import os
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import downloads
+from services.output_store import OutputStore, choose_encoding
+
+TEXT = "Senior backend engineer with Python and AWS. " * 200
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    store = OutputStore(directory=str(tmp_path))
+    monkeypatch.setattr(downloads, "output_store", store)
+    (tmp_path / "resume.txt").write_text(TEXT, encoding="utf-8")
+    app = FastAPI()
+    app.include_router(downloads.router)
+    return TestClient(app), store
+
+
+def test_revalidation_with_etag_returns_304(client):
+    client, store = client
+    first = client.get("/download/resume.txt", headers={"Accept-Encoding": "identity"})
+    assert first.status_code == 200 and first.text == TEXT
+    repeat = client.get("/download/resume.txt", headers={"Accept-Encoding": "identity", "If-None-Match": first.headers["etag"]})
+    assert repeat.status_code == 304 and repeat.content == b""
+    assert store.stats()["hashes_computed"] == 1
+
+
+def test_gzip_is_served_once_compressed_with_its_own_etag(client):
+    client, store = client
+    response = client.get("/download/resume.txt", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == TEXT
+    identity = client.get("/download/resume.txt", headers={"Accept-Encoding": "identity"})
+    assert response.headers["etag"] != identity.headers["etag"]
+    client.get("/download/resume.txt", headers={"Accept-Encoding": "gzip"})
+    assert store.stats()["compressions"] == 1
+
+
+def test_range_requests_get_partial_content(client):
+    client, _ = client
+    response = client.get("/download/resume.txt", headers={"Range": "bytes=7-13", "Accept-Encoding": "gzip"})
+    assert response.status_code == 206
+    assert response.content == TEXT[7:14].encode()
+    assert "content-encoding" not in response.headers
+
+
+def test_missing_and_outside_files_are_404(client):
+    client, _ = client
+    assert client.get("/download/missing.txt").status_code == 404
+    assert client.get("/download/..%2F..%2Fetc%2Fpasswd").status_code == 404
+
+
+def test_cached_etags_are_dropped_with_their_files_and_bounded(client, tmp_path):
+    client, store = client
+    client.get("/download/resume.txt", headers={"Accept-Encoding": "gzip"})
+    assert store.stats()["etags_cached"] == 1 and store.stats()["compressed_entries"] == 1
+    # Deleted by someone else (e.g. the optimization job sweeper): forgotten on the next request.
+    os.remove(tmp_path / "resume.txt")
+    assert client.get("/download/resume.txt").status_code == 404
+    assert store.stats()["etags_cached"] == 0 and store.stats()["compressed_bytes"] == 0
+
+    store.etag_cache_size = 2
+    for index in range(5):
+        (tmp_path / f"file{index}.txt").write_text("x")
+        client.get(f"/download/file{index}.txt")
+    assert store.stats()["etags_cached"] == 2
+
+
+def test_choose_encoding_respects_quality_values():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, identity") is None
+    assert choose_encoding("*") in ("br", "gzip")
+    assert choose_encoding("") is None
+
+
+def test_sweep_enforces_age_and_quota(tmp_path):
+    store = OutputStore(directory=str(tmp_path), max_bytes=250, max_age_seconds=3600)
+    now = time.time()
+    for index, age in enumerate([7200, 300, 200, 100]):
+        path = tmp_path / f"file{index}.txt"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (now - age, now - age))
+    result = store.sweep()
+    # file0 is too old; file1 is the oldest of the rest and goes to fit the 250-byte quota.
+    assert sorted(os.listdir(tmp_path)) == ["file2.txt", "file3.txt"]
+    assert result == {"removed": 2, "bytes_removed": 200, "bytes_kept": 200}
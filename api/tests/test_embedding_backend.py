@@ -0,0 +1,77 @@
+# api/tests/test_embedding_backend.py
+# Tests for the backend parity check and the crash safety of the ONNX export, without the real model.
+# Run from api/: `python -m pytest tests/test_embedding_backend.py`
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from services import embedding_backend
+
+
+class FixedBackend:
+    """
+    Returns a fixed vector per text, optionally perturbed.
+    """
+
+    def __init__(self, name: str, noise: float = 0.0):
+        self.name = name
+        self.noise = noise
+
+    def encode(self, texts, batch_size=32):
+        vectors = np.array([[len(text), sum(map(ord, text)) % 97, 1.0] for text in texts], dtype=np.float32)
+        vectors[:, 2] += self.noise * np.arange(len(texts))
+        return vectors
+
+
+def test_parity_passes_for_identical_backends():
+    result = embedding_backend.check_parity(FixedBackend("reference"), FixedBackend("onnx"))
+    assert result["passed"] and result["max_abs_difference"] == 0.0
+    assert result["tolerance"] == embedding_backend.PARITY_TOLERANCE["onnx"]
+    assert result["pairs"] == len(embedding_backend.PARITY_PAIRS)
+
+
+def test_parity_fails_beyond_the_backend_tolerance():
+    result = embedding_backend.check_parity(FixedBackend("reference"), FixedBackend("onnx", noise=5.0))
+    assert not result["passed"] and result["max_abs_difference"] > result["tolerance"]
+    loose = embedding_backend.check_parity(FixedBackend("reference"), FixedBackend("onnx", noise=5.0), tolerance=2.0)
+    assert loose["passed"]
+
+
+def test_failed_export_leaves_no_graph_behind(tmp_path, monkeypatch):
+    def crashing_export(model_path, output_path):
+        with open(output_path, "wb") as f:
+            f.write(b"partial")
+        raise RuntimeError("killed mid-export")
+
+    monkeypatch.setattr(embedding_backend, "export_onnx", crashing_export)
+    with pytest.raises(RuntimeError):
+        embedding_backend.ensure_onnx_model(str(tmp_path))
+    assert [name for name in os.listdir(tmp_path / "onnx") if not name.startswith(".")] == []
+
+
+def test_concurrent_callers_export_once(tmp_path, monkeypatch):
+    exports = []
+
+    def slow_export(model_path, output_path):
+        exports.append(output_path)
+        # Long enough for the other threads to reach the lock while this export is running.
+        time.sleep(0.05)
+        with open(output_path, "wb") as f:
+            f.write(b"graph")
+
+    monkeypatch.setattr(embedding_backend, "export_onnx", slow_export)
+    paths = []
+    threads = [
+        threading.Thread(target=lambda: paths.append(embedding_backend.ensure_onnx_model(str(tmp_path))))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(exports) == 1
+    assert set(paths) == {str(tmp_path / "onnx" / "model.onnx")}
+    assert (tmp_path / "onnx" / "model.onnx").read_bytes() == b"graph"
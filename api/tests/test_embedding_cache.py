@@ -0,0 +1,57 @@
+# api/tests/test_embedding_cache.py
+# Tests for the two-tier embedding cache and the restart safety of its on-disk store.
+# Run from api/: `python -m pytest tests/test_embedding_cache.py`
+import numpy as np
+
+from services.embedding_cache import DiskEmbeddingStore, EmbeddingCache, make_cache_key
+
+
+def _vector(value: float) -> np.ndarray:
+    return np.full(4, value, dtype=np.float32)
+
+
+def test_cache_key_ignores_whitespace_but_not_model():
+    assert make_cache_key("a  b\n", "m") == make_cache_key("a b", "m")
+    assert make_cache_key("a b", "m") != make_cache_key("a b", "other")
+
+
+def test_memory_tier_is_bounded_and_disk_tier_survives_restart(tmp_path):
+    cache = EmbeddingCache(max_entries=2, disk_dir=str(tmp_path))
+    for value in range(3):
+        cache.put(str(value), _vector(value))
+    assert cache.stats()["memory_entries"] == 2
+
+    reopened = EmbeddingCache(max_entries=2, disk_dir=str(tmp_path))
+    assert reopened.get("0").tolist() == [0.0] * 4
+    assert reopened.stats()["disk_hits"] == 1
+    assert reopened.get("missing") is None
+
+
+def test_row_written_without_its_index_line_does_not_shift_later_keys(tmp_path):
+    store = DiskEmbeddingStore(str(tmp_path))
+    store.put("a", _vector(1))
+    # A crash after the data write but before the index write leaves an orphaned row.
+    with open(store._data_path, "ab") as f:
+        f.write(_vector(2).astype(np.float16).tobytes())
+
+    DiskEmbeddingStore(str(tmp_path)).put("c", _vector(3))
+    reopened = DiskEmbeddingStore(str(tmp_path))
+    assert reopened.get("a").tolist() == [1.0] * 4
+    assert reopened.get("c").tolist() == [3.0] * 4
+    assert len(reopened) == 2
+
+
+def test_torn_row_and_torn_index_line_are_dropped_on_restart(tmp_path):
+    store = DiskEmbeddingStore(str(tmp_path))
+    store.put("a", _vector(1))
+    with open(store._data_path, "ab") as f:
+        f.write(b"\x00\x01\x02")
+    with open(store._index_path, "a", encoding="utf-8") as f:
+        f.write("1\tb")
+
+    restarted = DiskEmbeddingStore(str(tmp_path))
+    assert restarted.get("b") is None
+    restarted.put("c", _vector(3))
+    reopened = DiskEmbeddingStore(str(tmp_path))
+    assert reopened.get("a").tolist() == [1.0] * 4
+    assert reopened.get("c").tolist() == [3.0] * 4
@@ -0,0 +1,67 @@
+# api/tests/test_experience.py
+# Tests for the experience scanner: stated years, employment date ranges and the education filter.
+# Run from api/: `python -m pytest tests/test_experience.py`
+import datetime
+
+import pytest
+
+from benchmarks import corpus
+from services.experience_service import extract_experience, scan_experience
+
+TODAY = datetime.date(2024, 6, 1)
+
+
+def _roles(text: str) -> list[tuple[str, str, str]]:
+    return [(role.label, role.start, role.end) for role in scan_experience(text, TODAY).roles]
+
+
+def test_stated_years_win_over_date_ranges():
+    summary = scan_experience("Backend engineer with 7+ years of experience.\nAcme 2019 - 2021", TODAY)
+    assert (summary.stated_years, summary.range_months, summary.years) == (7, 24, 7)
+
+
+def test_overlapping_ranges_are_counted_once():
+    summary = scan_experience("Engineer, Acme Jan 2015 - Dec 2018\nConsultant, Initech Jun 2017 - Present", TODAY)
+    assert summary.range_months == 12 * 9 + 6
+    assert summary.roles[1].end == "present"
+
+
+@pytest.mark.parametrize("line", [
+    "Scrum Master, Acme Corp Jan 2016 - Dec 2020",
+    "Software Engineer, MS Office team, Microsoft 2015 - 2019",
+    "Teacher, Lincoln High School 2010 - 2014",
+])
+def test_job_titles_and_employers_that_look_academic_are_jobs(line):
+    assert len(_roles(line)) == 1
+
+
+@pytest.mark.parametrize("line", [
+    "B.Tech, XYZ University 2008 - 2012",
+    "Master of Science in Computer Science, Stanford 2010 - 2012",
+    "M.S. in Data Science 2016 - 2018",
+    "Ph.D. candidate 2012 - 2017",
+])
+def test_degrees_and_institutions_are_not_experience(line):
+    assert _roles(line) == []
+
+
+def test_dates_on_their_own_line_use_the_line_above():
+    text = "B.Tech, XYZ University\n2008 - 2012\n\nSoftware Engineer, Infosys\n2015 - 2019\n"
+    assert _roles(text) == [("Software Engineer, Infosys", "2015-01", "2018-12")]
+    assert extract_experience(text) == 4
+
+
+def test_ranges_under_an_education_heading_are_skipped_until_the_next_heading():
+    text = (
+        "EDUCATION\nStanford\n2008 - 2012\nExchange semester, TU Berlin 2011 - 2012\n\n"
+        "Work Experience:\nEngineer, Acme\n2015 - 2019\n"
+    )
+    assert _roles(text) == [("Engineer, Acme", "2015-01", "2018-12")]
+    # The heading ends where the next one starts, wherever education is placed.
+    assert extract_experience("Experience\nEngineer, Acme 2015 - 2019\nEducation\nStanford 2008 - 2012") == 4
+
+
+def test_pathological_input_yields_no_roles():
+    # Its scan time is tracked by the benchmark suite (match.extract_experience[pathological]).
+    summary = scan_experience(corpus.make_pathological_experience_text(), TODAY)
+    assert summary.roles == [] and summary.years == 0
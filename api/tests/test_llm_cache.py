@@ -0,0 +1,107 @@
+# api/tests/test_llm_cache.py
+# Tests for the LLM result cache: bounds, expiry and coalescing of concurrent identical calls.
+# Run from api/: `python -m pytest tests/test_llm_cache.py`
+import asyncio
+
+import pytest
+
+from services.llm_cache import LLMResultCache, make_llm_cache_key
+
+
+class CountingGenerator:
+    def __init__(self, text: str = "optimized __PERSON_0__", delay_s: float = 0.05, fail: bool = False):
+        self.text = text
+        self.delay_s = delay_s
+        self.fail = fail
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay_s)
+        if self.fail:
+            raise RuntimeError("upstream failed")
+        return self.text
+
+
+def test_key_depends_on_model_config_and_prompt():
+    key = make_llm_cache_key("gemini-2.5-flash", {"temperature": 0.7, "top_k": 40}, "prompt")
+    assert key == make_llm_cache_key("gemini-2.5-flash", {"top_k": 40, "temperature": 0.7}, "prompt")
+    assert key != make_llm_cache_key("gemini-2.5-pro", {"temperature": 0.7, "top_k": 40}, "prompt")
+    assert key != make_llm_cache_key("gemini-2.5-flash", {"temperature": 0.2, "top_k": 40}, "prompt")
+    assert key != make_llm_cache_key("gemini-2.5-flash", {"temperature": 0.7, "top_k": 40}, "prompt!")
+
+
+def test_concurrent_identical_requests_share_one_call():
+    cache = LLMResultCache()
+    generate = CountingGenerator()
+
+    async def burst():
+        return await asyncio.gather(*(cache.get_or_generate("key", generate) for _ in range(10)))
+
+    assert asyncio.run(burst()) == ["optimized __PERSON_0__"] * 10
+    assert generate.calls == 1
+    assert cache.stats()["coalesced"] == 9
+    assert asyncio.run(cache.get_or_generate("key", generate)) == "optimized __PERSON_0__"
+    assert generate.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_failures_reach_every_waiter_and_are_not_cached():
+    cache = LLMResultCache()
+    generate = CountingGenerator(fail=True)
+
+    async def burst():
+        return await asyncio.gather(*(cache.get_or_generate("key", generate) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(burst()))
+    assert generate.calls == 1
+    generate.fail = False
+    assert asyncio.run(cache.get_or_generate("key", generate)) == "optimized __PERSON_0__"
+    assert generate.calls == 2
+
+
+def test_generation_finishes_and_is_cached_when_the_caller_goes_away():
+    cache = LLMResultCache()
+    generate = CountingGenerator(delay_s=0.1)
+
+    async def impatient_then_retry():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(cache.get_or_generate("key", generate), 0.01)
+        return await cache.get_or_generate("key", generate)
+
+    assert asyncio.run(impatient_then_retry()) == "optimized __PERSON_0__"
+    assert generate.calls == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache = LLMResultCache(ttl_seconds=60)
+    now = [1000.0]
+    monkeypatch.setattr("services.llm_cache.time.time", lambda: now[0])
+    cache.put("key", "text")
+    now[0] += 59
+    assert cache.get("key") == "text"
+    now[0] += 2
+    assert cache.get("key") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_size_bounds_evict_least_recently_used():
+    cache = LLMResultCache(max_entries=3, max_chars=10)
+    for key in "abc":
+        cache.put(key, "xx")
+    cache.get("a")
+    cache.put("d", "xx")
+    assert cache.get("b") is None
+    assert cache.get("a") == "xx"
+    cache.put("e", "x" * 8)
+    assert cache.stats()["chars"] <= 10
+    cache.put("huge", "x" * 11)
+    assert cache.get("huge") is None
+
+
+def test_disabled_cache_always_generates():
+    cache = LLMResultCache(max_entries=0)
+    generate = CountingGenerator(delay_s=0)
+    asyncio.run(cache.get_or_generate("key", generate))
+    asyncio.run(cache.get_or_generate("key", generate))
+    assert generate.calls == 2
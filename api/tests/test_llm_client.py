@@ -0,0 +1,139 @@
+# api/tests/test_llm_client.py
+# Tests for the pooled Gemini client against a local stub of the generateContent endpoint.
+# Run from api/: `python -m pytest tests/test_llm_client.py`
+import asyncio
+import random
+import time
+
+import pytest
+
+pytest.importorskip("google.genai")
+
+from google.genai import errors
+
+from benchmarks.stub_gemini import StubGemini
+from services import llm_client
+
+
+def _manager(stub: StubGemini, **kwargs) -> llm_client.LLMClientManager:
+    options = {"backoff_base_s": 0.01, "backoff_max_s": 0.05, "rng": random.Random(3), **kwargs}
+    return llm_client.LLMClientManager(base_url=stub.base_url, **options)
+
+
+async def _generate_many(manager: llm_client.LLMClientManager, count: int) -> list:
+    results = await asyncio.gather(
+        *(manager.generate("prompt", "test-key") for _ in range(count)), return_exceptions=True
+    )
+    await manager.aclose()
+    return results
+
+
+def test_calls_reuse_one_client_and_its_connections():
+    with StubGemini() as stub:
+        manager = _manager(stub)
+
+        async def sequential():
+            texts = [await manager.generate("prompt", "test-key") for _ in range(5)]
+            await manager.aclose()
+            return texts
+
+        assert asyncio.run(sequential()) == ["optimized __PERSON_0__"] * 5
+    assert len(stub.client_ports) == 1
+    assert manager.stats()["clients_created"] == 1
+    assert manager.stats()["succeeded"] == 5
+
+
+def test_transient_errors_are_retried():
+    with StubGemini(statuses=[503, 429]) as stub:
+        manager = _manager(stub)
+        assert asyncio.run(_generate_many(manager, 1)) == ["optimized __PERSON_0__"]
+    assert stub.requests == 3
+    assert manager.stats()["retries"] == 2
+
+
+def test_client_errors_are_not_retried():
+    with StubGemini(statuses=[400]) as stub:
+        manager = _manager(stub)
+        [result] = asyncio.run(_generate_many(manager, 1))
+    assert isinstance(result, errors.ClientError)
+    assert stub.requests == 1
+    assert manager.stats()["failed"] == 1
+
+
+def test_retries_stop_after_max_retries():
+    with StubGemini(statuses=[500] * 10) as stub:
+        manager = _manager(stub, max_retries=2)
+        [result] = asyncio.run(_generate_many(manager, 1))
+    assert isinstance(result, errors.ServerError)
+    assert stub.requests == 3
+
+
+def test_concurrency_is_capped():
+    with StubGemini(delay_s=0.05) as stub:
+        manager = _manager(stub, max_concurrency=2, max_queue=20)
+        results = asyncio.run(_generate_many(manager, 8))
+    assert results == ["optimized __PERSON_0__"] * 8
+    assert stub.peak_active <= 2
+
+
+def test_calls_beyond_the_queue_limit_are_rejected():
+    with StubGemini(delay_s=0.2) as stub:
+        manager = _manager(stub, max_concurrency=1, max_queue=1)
+        results = asyncio.run(_generate_many(manager, 4))
+    assert sum(isinstance(result, llm_client.LLMOverloadedError) for result in results) == 2
+    assert results.count("optimized __PERSON_0__") == 2
+    assert manager.stats()["rejected"] == 2
+
+
+def test_slow_upstream_hits_the_deadline():
+    with StubGemini(delay_s=1.0) as stub:
+        manager = _manager(stub, attempt_timeout_s=0.1, deadline_s=0.35, max_retries=5)
+        start = time.perf_counter()
+        [result] = asyncio.run(_generate_many(manager, 1))
+        elapsed = time.perf_counter() - start
+    assert isinstance(result, llm_client.LLMTimeoutError)
+    assert elapsed < 1.0
+    assert manager.stats()["timeouts"] == 1
+
+
+def test_backoff_is_jittered_and_capped():
+    manager = llm_client.LLMClientManager(backoff_base_s=0.5, backoff_max_s=4.0, rng=random.Random(1))
+    delays = [manager.backoff_delay(attempt) for attempt in range(8) for _ in range(20)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) == len(delays)
+
+
+async def _collect_stream(manager: llm_client.LLMClientManager) -> list:
+    chunks = []
+    try:
+        async for chunk in manager.generate_stream("prompt", "test-key"):
+            chunks.append(chunk)
+    except Exception as e:
+        chunks.append(e)
+    await manager.aclose()
+    return chunks
+
+
+def test_stream_yields_chunks_as_they_arrive():
+    with StubGemini(stream_chunks=["Senior ", "__PERS", "ON_0__ ", "engineer"]) as stub:
+        manager = _manager(stub)
+        assert asyncio.run(_collect_stream(manager)) == ["Senior ", "__PERS", "ON_0__ ", "engineer"]
+    assert manager.stats()["succeeded"] == 1
+    assert manager.stats()["in_flight"] == 0
+
+
+def test_stream_retries_before_the_first_chunk():
+    with StubGemini(statuses=[503], stream_chunks=["ok"]) as stub:
+        manager = _manager(stub)
+        assert asyncio.run(_collect_stream(manager)) == ["ok"]
+    assert manager.stats()["retries"] == 1
+
+
+def test_stream_failure_after_the_first_chunk_is_not_retried():
+    with StubGemini(stream_chunks=["one ", "two ", "three"], fail_stream_after=1) as stub:
+        manager = _manager(stub)
+        chunks = asyncio.run(_collect_stream(manager))
+    assert chunks[0] == "one "
+    assert isinstance(chunks[-1], Exception)
+    assert stub.requests == 1
+    assert manager.stats()["failed"] == 1
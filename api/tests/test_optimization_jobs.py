@@ -0,0 +1,124 @@
+# api/tests/test_optimization_jobs.py
+# Tests for the in-process optimization job queue.
+# Run from api/: `python -m pytest tests/test_optimization_jobs.py`
+import asyncio
+import os
+
+import pytest
+
+from services.optimization_jobs import JobQueueFullError, OptimizationJobManager
+
+
+class Rejected(Exception):
+    status_code = 403
+    detail = "Original match percentage is below the required minimum."
+
+
+async def _wait_until_finished(manager: OptimizationJobManager, job_id: str):
+    while manager.get(job_id).finished_at is None:
+        await asyncio.sleep(0.01)
+    return manager.get(job_id)
+
+
+def test_successful_job_writes_its_result(tmp_path):
+    manager = OptimizationJobManager(outputs_dir=str(tmp_path), workers=1)
+
+    async def run(job):
+        job.stage = "optimizing"
+        await asyncio.sleep(0.01)
+        return "optimized resume"
+
+    async def scenario():
+        job = manager.submit(run)
+        assert job.status == "queued"
+        finished = await _wait_until_finished(manager, job.job_id)
+        await manager.shutdown()
+        return finished
+
+    job = asyncio.run(scenario())
+    assert job.status == "succeeded"
+    assert job.stage is None
+    with open(os.path.join(tmp_path, job.result_file), encoding="utf-8") as f:
+        assert f.read() == "optimized resume"
+
+
+def test_failed_job_keeps_status_code_and_detail(tmp_path):
+    manager = OptimizationJobManager(outputs_dir=str(tmp_path), workers=1)
+
+    async def run(job):
+        raise Rejected()
+
+    async def scenario():
+        job = manager.submit(run)
+        finished = await _wait_until_finished(manager, job.job_id)
+        await manager.shutdown()
+        return finished
+
+    job = asyncio.run(scenario())
+    assert (job.status, job.status_code, job.error) == ("failed", 403, Rejected.detail)
+    assert job.result_file is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_jobs_beyond_the_queue_limit_are_rejected(tmp_path):
+    manager = OptimizationJobManager(outputs_dir=str(tmp_path), workers=1, max_queue=2)
+    release = None
+
+    async def run(job):
+        await release.wait()
+        return "done"
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        jobs = [manager.submit(run)]
+        await asyncio.sleep(0.01)  # The worker takes the first job off the queue.
+        jobs += [manager.submit(run), manager.submit(run)]
+        with pytest.raises(JobQueueFullError):
+            manager.submit(run)
+        release.set()
+        finished = [await _wait_until_finished(manager, job.job_id) for job in jobs]
+        await manager.shutdown()
+        return finished
+
+    assert [job.status for job in asyncio.run(scenario())] == ["succeeded"] * 3
+    assert manager.stats()["rejected"] == 1
+
+
+def test_expired_jobs_and_their_files_are_swept(tmp_path):
+    manager = OptimizationJobManager(outputs_dir=str(tmp_path), workers=1, ttl_seconds=0)
+
+    async def run(job):
+        return "optimized resume"
+
+    async def scenario():
+        job = manager.submit(run)
+        while not os.listdir(tmp_path) or manager._jobs[job.job_id].finished_at is None:
+            await asyncio.sleep(0.01)
+        await manager.shutdown()
+        return job
+
+    job = asyncio.run(scenario())
+    assert manager.get(job.job_id) is None
+    assert manager.sweep() == 1
+    assert os.listdir(tmp_path) == []
+
+
+def test_job_whose_result_file_was_swept_is_expired(tmp_path):
+    manager = OptimizationJobManager(outputs_dir=str(tmp_path), workers=1)
+
+    async def run(job):
+        return "optimized resume"
+
+    async def scenario():
+        job = manager.submit(run)
+        finished = await _wait_until_finished(manager, job.job_id)
+        await manager.shutdown()
+        return finished
+
+    job = asyncio.run(scenario())
+    assert manager.get(job.job_id) is job
+    # The outputs sweeper enforces its own quota and may delete the file before the job's TTL.
+    os.remove(os.path.join(tmp_path, job.result_file))
+    assert manager.get(job.job_id) is None
+    assert manager.stats()["expired"] == 1
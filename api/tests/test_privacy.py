@@ -0,0 +1,193 @@
+# api/tests/test_privacy.py
+# Round-trip property tests and a linear-work check for the mask/unmask engine.
+# They feed synthetic analyzer results, so neither Presidio nor the spaCy model is needed.
+# The timings live in the benchmark suite (privacy.round_trip[...]).
+# Run from api/: `python -m pytest tests/test_privacy.py`
+import random
+from collections import namedtuple
+
+from benchmarks import corpus
+from services import privacy_service
+
+Result = namedtuple("Result", ["start", "end", "entity_type"])
+
+ENTITY_TYPES = ["PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER", "URL", "LOCATION", "US_SSN"]
+# Underscores, capitals and digits make text around placeholders look as much like them as possible.
+ALPHABET = "abcdef ABCDEF_XYZ_0123456789.,@-\n\té"
+
+
+def _random_case(rng: random.Random, max_length: int = 400, max_entities: int = 30):
+    text = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_length)))
+    results = []
+    for _ in range(rng.randint(0, max_entities) if text else 0):
+        start = rng.randrange(len(text))
+        end = rng.randint(start, min(len(text), start + 40))
+        results.append(Result(start, end, rng.choice(ENTITY_TYPES)))
+    return text, results
+
+
+def _covered(spans) -> set[int]:
+    return {i for start, end, *_ in spans for i in range(start, end)}
+
+
+def _mask(text: str, results: list) -> tuple[str, dict]:
+    return privacy_service.mask_spans(text, privacy_service.resolve_overlaps(results))
+
+
+def test_round_trip_restores_original_text():
+    rng = random.Random(17)
+    for _ in range(500):
+        text, results = _random_case(rng)
+        masked_text, pii_map = _mask(text, results)
+        assert privacy_service.unmask_text(masked_text, pii_map) == text
+
+
+def test_resolved_spans_are_sorted_disjoint_and_cover_every_entity():
+    rng = random.Random(23)
+    for _ in range(500):
+        text, results = _random_case(rng)
+        spans = privacy_service.resolve_overlaps(results)
+        for (_, end, _), (next_start, _, _) in zip(spans, spans[1:]):
+            assert end <= next_start
+        assert _covered(spans) == _covered(results)
+
+
+def test_masked_text_contains_no_entity_text():
+    rng = random.Random(29)
+    for _ in range(200):
+        text, results = _random_case(rng)
+        masked_text, pii_map = _mask(text, results)
+        assert len(pii_map) == len(privacy_service.resolve_overlaps(results))
+        for placeholder, original in pii_map.items():
+            assert masked_text.count(placeholder) == 1
+            assert privacy_service.PLACEHOLDER_PATTERN.fullmatch(placeholder)
+
+
+def test_contained_entity_is_dropped():
+    text = "Contact jane.doe@example.com today"
+    results = [Result(8, 28, "EMAIL_ADDRESS"), Result(17, 28, "URL")]
+    masked_text, pii_map = _mask(text, results)
+    assert masked_text == "Contact __EMAIL_ADDRESS_0__ today"
+    assert pii_map == {"__EMAIL_ADDRESS_0__": "jane.doe@example.com"}
+
+
+def test_partial_overlap_is_merged_with_type_of_longest_entity():
+    text = "Jane Doe Smith"
+    results = [Result(0, 8, "PERSON"), Result(5, 14, "LOCATION")]
+    masked_text, pii_map = _mask(text, results)
+    assert masked_text == "__LOCATION_0__"
+    assert pii_map == {"__LOCATION_0__": "Jane Doe Smith"}
+
+
+def test_unmask_keeps_unknown_placeholders_and_surrounding_text():
+    pii_map = {"__PERSON_0__": "Jane", "__IN_PAN_12__": "ABCDE1234F"}
+    masked_text = "Hi __PERSON_0__, PAN __IN_PAN_12__, ref __PERSON_7__ and __not_a_placeholder__X__PERSON_0__"
+    assert privacy_service.unmask_text(masked_text, pii_map) == (
+        "Hi Jane, PAN ABCDE1234F, ref __PERSON_7__ and __not_a_placeholder__XJane"
+    )
+
+
+def _random_chunks(rng: random.Random, text: str) -> list[str]:
+    cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 12))))
+    return [text[start:end] for start, end in zip([0, *cuts], [*cuts, len(text)])]
+
+
+def test_streaming_unmask_matches_whole_text_unmask_for_any_chunking():
+    rng = random.Random(31)
+    for _ in range(2000):
+        text, results = _random_case(rng, max_length=120, max_entities=8)
+        masked_text, pii_map = _mask(text, results)
+        unmasker = privacy_service.StreamingUnmasker(pii_map)
+        emitted = ""
+        for chunk in _random_chunks(rng, masked_text):
+            emitted += unmasker.feed(chunk)
+            # Whatever has been emitted is final: never a half-restored placeholder.
+            assert text.startswith(emitted)
+        assert emitted + unmasker.flush() == text
+
+
+def test_streaming_unmask_never_cuts_inside_a_placeholder_followed_by_placeholder_characters():
+    rng = random.Random(37)
+    pii_map = {"__PERSON_0__": "Jane", "__EMAIL_ADDRESS_1__": "jane@example.com"}
+    pieces = [*pii_map, "_", "__", "A", "0", "X_1", " "]
+    cases = ["Hi __PERSON_0__" + "A" * 370, "__PERSON_0__" + "_A0" * 150 + "__EMAIL_ADDRESS_1__"]
+    cases += ["".join(rng.choice(pieces) for _ in range(rng.randint(0, 300))) for _ in range(500)]
+    for masked_text in cases:
+        expected = privacy_service.unmask_text(masked_text, pii_map)
+        unmasker = privacy_service.StreamingUnmasker(pii_map)
+        emitted = ""
+        for chunk in _random_chunks(rng, masked_text):
+            emitted += unmasker.feed(chunk)
+            assert expected.startswith(emitted)
+            assert len(unmasker._pending) <= 2 * privacy_service.MAX_PLACEHOLDER_LENGTH
+        assert emitted + unmasker.flush() == expected
+    unmasker = privacy_service.StreamingUnmasker(pii_map)
+    assert unmasker.feed("Hi __PERSON_0__" + "A" * 370) == "Hi "
+    assert unmasker.flush() == "Jane" + "A" * 370
+
+
+def test_streaming_unmask_restores_placeholder_split_across_chunks():
+    unmasker = privacy_service.StreamingUnmasker({"__PERSON_0__": "Jane"})
+    assert unmasker.feed("Hi _") == "Hi "
+    assert unmasker.feed("_PER") == ""
+    assert unmasker.feed("SON_0_") == ""
+    assert unmasker.feed("_, welcome") == "Jane, welcome"
+    assert unmasker.flush() == ""
+
+
+def test_streaming_unmask_holds_back_a_bounded_tail():
+    unmasker = privacy_service.StreamingUnmasker({"__PERSON_0__": "Jane"})
+    for _ in range(100):
+        unmasker.feed("__" + "A" * 97)
+        assert len(unmasker._pending) <= privacy_service.MAX_PLACEHOLDER_LENGTH
+
+
+def _quadratic_mask(text: str, results: list) -> tuple[str, dict]:
+    # The previous implementation, kept as the reference for the parity test.
+    filtered = [
+        res_i for res_i in results
+        if not any(res_i is not res_j and res_j.start <= res_i.start and res_j.end >= res_i.end for res_j in results)
+    ]
+    pii_map = {}
+    masked_text = ""
+    last_end = 0
+    for i, result in enumerate(sorted(filtered, key=lambda r: r.start)):
+        placeholder = privacy_service._create_placeholder(result.entity_type, i)
+        pii_map[placeholder] = text[result.start:result.end]
+        masked_text += text[last_end:result.start] + placeholder
+        last_end = result.end
+    return masked_text + text[last_end:], pii_map
+
+
+class CountingResult:
+    """
+    An analyzer result that counts every read of its fields.
+    """
+
+    reads = 0
+
+    def __init__(self, result):
+        self._result = result
+
+    def __getattr__(self, name):
+        CountingResult.reads += 1
+        return getattr(self._result, name)
+
+
+def _field_reads(entity_count: int) -> int:
+    text, results = corpus.make_pii_document(entity_count)
+    CountingResult.reads = 0
+    _mask(text, [CountingResult(result) for result in results])
+    return CountingResult.reads
+
+
+def test_matches_previous_implementation_when_entities_only_nest():
+    text, results = corpus.make_pii_document(300)
+    assert _mask(text, results) == _quadratic_mask(text, results)
+
+
+def test_masking_reads_each_result_a_constant_number_of_times():
+    # A pairwise containment check would read every result once per other result (256x here, not 16x).
+    small, large = _field_reads(1000), _field_reads(16000)
+    assert small <= 10 * 1250
+    assert large <= 16 * small + 16
@@ -0,0 +1,93 @@
+# api/tests/test_privacy_profiles.py
+# Parity tests for privacy profiles and batch masking against the full Presidio analyzer.
+# They need presidio-analyzer, and the en_core_web_sm spaCy model for the analyzer runs; they are skipped otherwise.
+# Run from api/: `python -m pytest tests/test_privacy_profiles.py`
+import pytest
+
+from services import privacy_service
+
+presidio_analyzer = pytest.importorskip("presidio_analyzer")
+spacy = pytest.importorskip("spacy")
+requires_model = pytest.mark.skipif(
+    not spacy.util.is_package("en_core_web_sm"), reason="spaCy model en_core_web_sm is not installed"
+)
+
+# Default entity types the resume profile leaves unmasked on purpose: resumes do not contain them.
+UNMASKED_BY_RESUME_PROFILE = {"CRYPTO", "IBAN_CODE", "MEDICAL_LICENSE"}
+
+SAMPLE_RESUMES = [
+    """John Doe
+123-456-7890 | john.doe.email@example.com | San Francisco, CA | linkedin.com/in/johndoe
+
+Summary:
+A highly motivated software engineer. My name is John and I live in California.
+
+Experience:
+Lead Developer at Innovate Corp, Jan 2019 - Present.
+
+Education:
+B.S. in Computer Science | State University, Anytown, CA
+Graduated: May 2023
+""",
+    """Priya Sharma — Data Scientist
+Bengaluru, India · +91 98765 43210 · priya.sharma@mail.com · https://github.com/priyas
+Worked with Rahul Mehta on fraud models at a fintech in Mumbai from 2017 to 2021.
+""",
+    """MARIA GARCIA
+Madrid, Spain | maria.garcia@example.org | (555) 010-2000
+Senior Backend Engineer with 8 years of experience. References: Tom Baker, Berlin.
+Server at 192.168.1.20, portfolio at https://mariagarcia.dev
+""",
+]
+
+
+def test_resume_profile_masks_every_default_entity_type_except_the_listed_ones():
+    registry = presidio_analyzer.RecognizerRegistry(supported_languages=["en"])
+    registry.load_predefined_recognizers(languages=["en"])
+    default_entities = set(registry.get_supported_entities(languages=["en"]))
+    profile_entities = set(privacy_service.PRIVACY_PROFILES["resume"]["entities"])
+    assert default_entities - profile_entities == UNMASKED_BY_RESUME_PROFILE
+
+
+@pytest.fixture(scope="module")
+def analyzers():
+    return {
+        "full": privacy_service.build_analyzer("full"),
+        "resume": privacy_service.build_analyzer("resume"),
+    }
+
+
+def _expected_resume_masking(full_analyzer, text: str):
+    # The unrestricted analyzer's output, less only the types the profile drops on purpose.
+    results = [
+        result for result in full_analyzer.analyze(text=text, language="en")
+        if result.entity_type not in UNMASKED_BY_RESUME_PROFILE
+    ]
+    return privacy_service.mask_spans(text, privacy_service.resolve_overlaps(results))
+
+
+@requires_model
+@pytest.mark.parametrize("text", SAMPLE_RESUMES)
+def test_resume_profile_matches_full_analyzer(analyzers, text):
+    masked = privacy_service.mask_text(text, analyzer=analyzers["resume"], profile_name="resume")
+    assert masked == _expected_resume_masking(analyzers["full"], text)
+
+
+@requires_model
+def test_resume_profile_trims_pipeline_and_recognizers(analyzers):
+    nlp = analyzers["resume"].nlp_engine.nlp["en"]
+    assert "ner" in nlp.pipe_names
+    assert "parser" not in nlp.pipe_names
+    assert len(analyzers["resume"].registry.recognizers) < len(analyzers["full"].registry.recognizers)
+
+
+@requires_model
+@pytest.mark.parametrize("n_process", [1, 2])
+def test_batch_masking_matches_single_text_masking(analyzers, n_process):
+    texts = SAMPLE_RESUMES * 3
+    batch = privacy_service.mask_texts(
+        texts, batch_size=4, n_process=n_process, analyzer=analyzers["resume"], profile_name="resume"
+    )
+    assert batch == [
+        privacy_service.mask_text(text, analyzer=analyzers["resume"], profile_name="resume") for text in texts
+    ]
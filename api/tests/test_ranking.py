@@ -0,0 +1,85 @@
+# api/tests/test_ranking.py
+# Tests for batched chunk scoring of long resumes in /rank/, with a deterministic stand-in encoder.
+# Run from api/: `python -m pytest tests/test_ranking.py`
+import zlib
+
+import numpy as np
+import pytest
+
+from services import match_service
+from services.embedding_cache import EmbeddingCache
+
+
+class BagOfWordsModel:
+    """
+    Hashes words into a small vector; records every encode call.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        self.calls.append(list(texts))
+        vectors = np.full((len(texts), 32), 0.01, dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % 32] += 1
+        return vectors
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = BagOfWordsModel()
+    monkeypatch.setattr(match_service, "get_sentence_model", lambda: model)
+    monkeypatch.setattr(match_service, "embedding_cache", EmbeddingCache())
+    return model
+
+
+def _profile(jd_text: str) -> match_service.JDProfile:
+    return match_service.JDProfile(
+        jd_text=jd_text, embedding=None, experience=0, roles=set(), preprocessed_text="",
+        keyword_scores=[], chunks=match_service.chunking_service.chunk_document(jd_text), skills=None,
+    )
+
+
+RESUMES = [
+    "Summary\n" + "Python developer building APIs. " * 80 + "\nSkills\nPython, Django, AWS, Docker",
+    "Experience\n" + "Data engineer running Spark and Airflow pipelines. " * 120,
+    "",
+]
+JD = "Requirements\nStrong Python and AWS experience. Docker and Kubernetes. " * 5
+
+
+def test_batch_chunked_scores_match_one_resume_at_a_time(model):
+    profile = _profile(JD)
+    expected = [match_service.calculate_chunked_similarity(text, profile) for text in RESUMES]
+    match_service.embedding_cache.clear()
+    model.calls.clear()
+
+    results = match_service.calculate_batch_chunked_similarity(RESUMES, profile)
+
+    assert len(model.calls) == 1
+    for result, reference in zip(results, expected):
+        assert result["score"] == pytest.approx(reference["score"], abs=1e-6)
+        assert result["section_scores"] == pytest.approx(reference["section_scores"], abs=0.01)
+    assert results[2] == {"score": 0.0, "section_scores": {}}
+
+
+def test_batch_chunked_scores_fall_back_without_a_model(monkeypatch):
+    monkeypatch.setattr(match_service, "get_sentence_model", lambda: None)
+    assert match_service.calculate_batch_chunked_similarity(RESUMES[:2], _profile(JD)) == [
+        {"score": 0.0, "section_scores": {}}
+    ] * 2
+
+
+def test_similarity_texts_are_what_the_embed_stage_encodes(model):
+    profile = _profile(JD)
+    resume = RESUMES[1]
+    match_service.encode_texts([text for _, text in profile.chunks])
+    match_service.encode_texts(match_service.similarity_texts(resume, profile))
+    model.calls.clear()
+
+    match_service.calculate_resume_similarity(resume, profile)
+
+    assert model.calls == []
+    assert match_service.similarity_texts("Python developer", _profile("Python")) == ["Python developer"]
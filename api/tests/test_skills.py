@@ -0,0 +1,48 @@
+# api/tests/test_skills.py
+# Tests for the skills ontology: alias extraction, ambiguous single-letter names and the coverage report.
+# Run from api/: `python -m pytest tests/test_skills.py`
+import math
+
+import pytest
+
+from services import skills_service
+
+
+@pytest.mark.parametrize("text, skills", [
+    ("Reported to the C-suite; graded C in chemistry; used Hive for queries", ["apache hive"]),
+    ("C/C++ on Linux", ["c", "c++", "linux"]),
+    ("Python, C, Rust", ["c", "python", "rust"]),
+    ("Embedded C and the C language", ["c"]),
+    ("HDFS and MapReduce, HiveQL", ["apache hive", "hadoop"]),
+    ("React Native apps and JavaScript, not Java", ["java", "javascript", "react native"]),
+])
+def test_extract_skills(text, skills):
+    assert skills_service.extract_skills(text) == skills
+
+
+def test_jd_vector_weights_repeats_logarithmically():
+    ontology = skills_service.get_skill_ontology()
+    vector = skills_service.build_jd_skill_vector("Python and Docker. Python, Kubernetes. Git.")
+    weights = {ontology.names[skill_id]: value for skill_id, value in zip(vector.indices, vector.data)}
+    assert weights == pytest.approx({"python": 1 + math.log(2), "docker": 1.0, "kubernetes": 1.0, "git": 0.75})
+
+
+def test_coverage_report_orders_missing_skills_by_weight():
+    jd_vector = skills_service.build_jd_skill_vector("Python and Docker. Python, Kubernetes. Git.")
+    report = skills_service.compare_skills("Python, Docker, React", jd_vector)
+    assert report == {
+        "matched": ["docker", "python"],
+        "missing": ["kubernetes", "git"],
+        "extra": ["react"],
+        "coverage": round((2 + math.log(2)) / (3.75 + math.log(2)) * 100, 2),
+    }
+    assert skills_service.compare_skills("Python", skills_service.build_jd_skill_vector("no skills here"))["coverage"] is None
+
+
+def test_skill_matrix_reports_match_single_resume_reports():
+    jd_vector = skills_service.build_jd_skill_vector("Python, SQL, AWS and C/C++")
+    resumes = ["AWS and Python", "", "C, C++ and SQL", "Graded C"]
+    matrix = skills_service.build_skill_matrix(resumes)
+    assert skills_service.compare_skill_matrix(matrix, jd_vector) == [
+        skills_service.compare_skills(text, jd_vector) for text in resumes
+    ]
@@ -0,0 +1,81 @@
+# api/tests/test_term_statistics.py
+# Tests for the hashed document-frequency table: IDF values, document registration, persistence
+# and the keyword ranking it drives. The regex tokenizer keeps these independent of NLTK data.
+# Run from api/: `python -m pytest tests/test_term_statistics.py`
+import math
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from services import match_service, tokenization_service
+from services.term_statistics import TermStatistics, extract_terms, hash_term
+
+CORPUS = [
+    "Python developer building Django APIs.",
+    "Python data engineer running Spark.",
+    "Frontend developer writing React.",
+]
+
+
+@pytest.fixture(autouse=True)
+def regex_tokenizer(monkeypatch):
+    monkeypatch.setattr(tokenization_service, "TOKENIZER", "regex")
+    monkeypatch.setattr(tokenization_service, "get_stopwords", lambda: frozenset(ENGLISH_STOP_WORDS))
+
+
+def _idf(model: TermStatistics, term: str) -> float:
+    return float(model.idf(np.array([hash_term(term, model.n_features)]))[0])
+
+
+def test_extract_terms_drops_stop_words_and_adds_bigrams():
+    assert extract_terms(["the", "senior", "python", "and", "rust", "developer", "x"]) == [
+        "senior", "python", "rust", "developer", "senior python", "python rust", "rust developer",
+    ]
+
+
+def test_idf_follows_document_frequency():
+    model = TermStatistics()
+    assert _idf(model, "python") == 1.0
+    assert model.add_documents(CORPUS) == 3
+    assert _idf(model, "python") == pytest.approx(math.log(4 / 3) + 1)
+    assert _idf(model, "react") == pytest.approx(math.log(4 / 2) + 1)
+    assert _idf(model, "python developer") == pytest.approx(math.log(4 / 2) + 1)
+    assert _idf(model, "kubernetes") == pytest.approx(math.log(4) + 1)
+
+
+def test_documents_are_counted_once():
+    model = TermStatistics()
+    model.add_documents(CORPUS)
+    # Same tokens after cleaning: not a new document.
+    assert model.add_documents(["PYTHON developer, building Django APIs!", "", CORPUS[2]]) == 0
+    assert model.stats() == {"documents": 3, "buckets": model.n_features, "buckets_used": 23, "persistent": False}
+
+
+def test_weights_are_normalized_and_favour_rare_terms():
+    model = TermStatistics()
+    model.add_documents(CORPUS)
+    weights = model.weigh(["python", "kubernetes", "python", "kubernetes"])
+    assert math.sqrt(sum(weight ** 2 for weight in weights.values())) == pytest.approx(1.0)
+    assert weights["kubernetes"] > weights["python"]
+    assert model.weigh(["the", "and"]) == {}
+
+
+def test_table_persists_and_keeps_its_bucket_count(tmp_path):
+    model = TermStatistics(str(tmp_path), n_features=1024)
+    model.add_documents(CORPUS[:2])
+    reopened = TermStatistics(str(tmp_path), n_features=4096)
+    assert reopened.n_features == 1024 and reopened.n_documents == 2
+    assert _idf(reopened, "python") == pytest.approx(math.log(3 / 3) + 1)
+    assert reopened.add_documents(CORPUS) == 1
+    assert reopened.stats()["persistent"]
+
+
+def test_keyword_ranking_ranks_corpus_wide_terms_lower(monkeypatch):
+    model = TermStatistics()
+    model.add_documents(CORPUS)
+    monkeypatch.setattr(match_service, "term_stats", model)
+    ranked = [term for term, _ in match_service.get_jd_keyword_scores("Python and Kubernetes, Python and Kubernetes")]
+    # Same term frequency, but most JDs in the corpus mention python.
+    assert ranked[0] in ("kubernetes", "python kubernetes")
+    assert ranked.index("kubernetes") < ranked.index("python")
@@ -0,0 +1,64 @@
+# api/tests/test_text_extraction.py
+# Tests for PDF extraction: page budgets, per-page timings, the parallel path and its per-worker readers.
+# Run from api/: `python -m pytest tests/test_text_extraction.py`
+from multiprocessing import shared_memory
+
+import pytest
+
+from benchmarks import corpus
+from services import text_extraction_service
+
+TEXT = "\n".join(f"Line {number} of the resume, Python and AWS." for number in range(120))
+
+
+@pytest.fixture(scope="module")
+def pdf_bytes():
+    return corpus.make_pdf(TEXT, lines_per_page=5)
+
+
+def test_timings_report_every_page_and_the_budgets(pdf_bytes):
+    result = text_extraction_service.extract_pdf_with_timings(pdf_bytes)
+    assert result["page_count"] == 24 and not result["truncated"]
+    assert [page["page"] for page in result["pages"]] == list(range(1, 25))
+    assert sum(page["chars"] for page in result["pages"]) + 24 == len(result["text"])
+
+    cut = text_extraction_service.extract_pdf_with_timings(pdf_bytes, max_pages=3)
+    assert len(cut["pages"]) == 3 and cut["truncated"]
+    short = text_extraction_service.extract_pdf_with_timings(pdf_bytes, max_chars=100)
+    assert len(short["text"]) == 100 + len(short["pages"]) and short["truncated"]
+
+
+def test_extract_text_from_pdf_records_page_stats(pdf_bytes):
+    before = text_extraction_service.pdf_stats()
+    text = text_extraction_service.extract_text_from_pdf(pdf_bytes)
+    after = text_extraction_service.pdf_stats()
+    assert text == text_extraction_service.extract_pdf_with_timings(pdf_bytes)["text"]
+    assert after["documents"] == before["documents"] + 1
+    assert after["pages"] == before["pages"] + 24
+    assert after["truncated"] == before["truncated"]
+
+
+def test_parallel_extraction_matches_serial(pdf_bytes):
+    serial = [page["text"] for page in text_extraction_service.iter_pdf_pages(pdf_bytes, parallel=False)]
+    try:
+        parallel = [page["text"] for page in text_extraction_service.iter_pdf_pages(pdf_bytes, parallel=True)]
+        budgeted = list(text_extraction_service.iter_pdf_pages(pdf_bytes, max_chars=150, parallel=True))
+    finally:
+        text_extraction_service.shutdown_pdf_pool()
+    assert parallel == serial
+    assert sum(len(page["text"]) for page in budgeted) == 150
+
+
+def test_worker_opens_each_document_once(pdf_bytes, monkeypatch):
+    monkeypatch.setattr(text_extraction_service, "_worker_readers", type(text_extraction_service._worker_readers)())
+    shm = shared_memory.SharedMemory(create=True, size=len(pdf_bytes))
+    shm.buf[:len(pdf_bytes)] = pdf_bytes
+    try:
+        first = text_extraction_service._extract_pdf_page_range("doc", shm.name, len(pdf_bytes), 0, 2)
+    finally:
+        shm.close()
+        shm.unlink()
+    # The shared block is gone, so the second range can only come from the reader opened for the first.
+    second = text_extraction_service._extract_pdf_page_range("doc", "unused", len(pdf_bytes), 2, 4)
+    assert [page[0] for page in first + second] == [0, 1, 2, 3]
+    assert list(text_extraction_service._worker_readers) == ["doc"]
@@ -0,0 +1,80 @@
+# api/tests/test_uploads.py
+# Tests for upload size limits: the request body middleware and the per-file read.
+# Run from api/: `python -m pytest tests/test_uploads.py`
+import asyncio
+
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from utils import file_operations
+
+LIMIT = 4096
+
+
+@pytest.fixture
+def client():
+    handled = []
+    app = FastAPI()
+    app.add_middleware(file_operations.RequestSizeLimitMiddleware, max_bytes=LIMIT)
+
+    @app.post("/upload/")
+    async def upload(file: UploadFile = File(...)):
+        handled.append(file.filename)
+        return {"size": len(await file_operations.read_upload(file, max_bytes=LIMIT))}
+
+    return TestClient(app), handled
+
+
+def test_small_upload_passes_through(client):
+    client, handled = client
+    response = client.post("/upload/", files={"file": ("a.txt", b"x" * 100)})
+    assert response.status_code == 200 and response.json() == {"size": 100}
+    assert handled == ["a.txt"]
+
+
+def test_declared_oversized_body_is_refused_before_the_handler(client):
+    client, handled = client
+    response = client.post("/upload/", files={"file": ("a.txt", b"x" * (LIMIT * 2))})
+    assert response.status_code == 413
+    assert str(LIMIT) in response.json()["detail"]
+    assert handled == []
+
+
+def test_chunked_oversized_body_is_refused_before_the_handler(client):
+    client, handled = client
+    boundary = "b0undary"
+    parts = [
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.txt\"\r\n\r\n".encode(),
+        *[b"x" * 1024] * 8,
+        f"\r\n--{boundary}--\r\n".encode(),
+    ]
+    response = client.post(
+        "/upload/", content=iter(parts), headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    )
+    assert response.status_code == 413
+    assert handled == []
+
+
+def test_middleware_stops_reading_once_the_limit_is_crossed():
+    chunks = [{"type": "http.request", "body": b"x" * 1000, "more_body": True} for _ in range(100)]
+    pulled, sent, app_saw = [], [], []
+
+    async def receive():
+        pulled.append(1)
+        return chunks[len(pulled) - 1]
+
+    async def send(message):
+        sent.append(message)
+
+    async def app(scope, receive, send):
+        while (message := await receive())["type"] == "http.request":
+            pass
+        app_saw.append(message["type"])
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    middleware = file_operations.RequestSizeLimitMiddleware(app, max_bytes=LIMIT)
+    asyncio.run(middleware({"type": "http", "headers": []}, receive, send))
+    assert len(pulled) == LIMIT // 1000 + 1
+    assert app_saw == ["http.disconnect"]
+    assert [message.get("status") for message in sent if message["type"] == "http.response.start"] == [413]
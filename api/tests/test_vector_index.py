@@ -0,0 +1,87 @@
+# api/tests/test_vector_index.py
+# Tests for the job vector index: updates, deletes and compaction, persistence, and IVF recall.
+# Run from api/: `python -m pytest tests/test_vector_index.py`
+import json
+
+import numpy as np
+import pytest
+
+from services import job_search_service
+from services.vector_index import VectorIndex, npz_path
+
+
+def _clustered(n: int, dim: int = 32, clusters: int = 40, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return centers[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))
+
+
+def test_add_replace_and_exact_search():
+    index = VectorIndex()
+    index.add(["a", "b", "c"], np.eye(3))
+    assert index.search([1, 0.1, 0], top_k=2)[0][0] == "a"
+    index.add(["a"], [[0, 0, 1]])
+    assert len(index) == 3
+    assert [item_id for item_id, _ in index.search([0, 0, 1], top_k=2)] in (["a", "c"], ["c", "a"])
+    with pytest.raises(ValueError):
+        index.add(["d"], [[1, 0]])
+
+
+def test_delete_compacts_once_tombstones_dominate():
+    index = VectorIndex()
+    ids = [str(i) for i in range(10)]
+    index.add(ids, _clustered(10, dim=4))
+    assert index.delete(ids[:4] + ["missing"]) == 4
+    assert index._size == 10
+    index.delete(ids[4:6])
+    # 4 live rows out of 10 stored: the tombstones are compacted away.
+    assert index._size == 4 and len(index) == 4
+    assert {item_id for item_id, _ in index.search(np.ones(4), top_k=10)} == set(ids[6:])
+
+
+def test_ivf_recall_against_exact_search_survives_updates():
+    vectors = _clustered(3000)
+    index = VectorIndex(nprobe=8, ivf_min_size=1000)
+    index.add([str(i) for i in range(3000)], vectors)
+    assert index.stats()["mode"] == "ivf"
+    index.delete([str(i) for i in range(0, 3000, 3)])
+
+    queries = _clustered(50, seed=1)
+    hits = total = 0
+    for query in queries:
+        exact = {item_id for item_id, _ in index.search(query, top_k=10, exact=True)}
+        approximate = {item_id for item_id, _ in index.search(query, top_k=10)}
+        hits += len(exact & approximate)
+        total += len(exact)
+        assert not {str(i) for i in range(0, 3000, 3)} & approximate
+    assert hits / total >= 0.9
+
+
+def test_save_and_load_round_trip_without_npz_suffix(tmp_path):
+    index = VectorIndex()
+    index.add(["job-1", "job-2", "jöb-3"], _clustered(3, dim=8))
+    index.delete(["job-2"])
+    index.save(str(tmp_path / "jobs"))
+    assert (tmp_path / "jobs.npz").exists()
+
+    restored = VectorIndex()
+    restored.load(str(tmp_path / "jobs"))
+    assert sorted(item_id for item_id, _ in restored.search(np.ones(8), top_k=5)) == ["job-1", "jöb-3"]
+    query = _clustered(1, dim=8, seed=5)[0]
+    assert restored.search(query, top_k=2) == pytest.approx(index.search(query, top_k=2))
+    with np.load(npz_path(str(tmp_path / "jobs")), allow_pickle=False) as data:
+        assert data["ids"].dtype.kind == "U"
+
+
+def test_job_index_reloads_from_a_path_without_suffix(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_search_service, "job_index", VectorIndex())
+    monkeypatch.setattr(job_search_service, "_jobs", {"job-1": {"title": "Engineer", "experience": 3, "roles": []}})
+    job_search_service.job_index.add(["job-1"], np.ones((1, 4)))
+    path = str(tmp_path / "jobs")
+    job_search_service.save_index(path)
+    assert json.loads((tmp_path / "jobs.meta.json").read_text())["job-1"]["title"] == "Engineer"
+
+    monkeypatch.setattr(job_search_service, "job_index", VectorIndex())
+    monkeypatch.setattr(job_search_service, "_jobs", {})
+    job_search_service.load_index(path)
+    assert len(job_search_service.job_index) == 1 and "job-1" in job_search_service._jobs
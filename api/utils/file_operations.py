@@ -1,18 +1,140 @@
-
+import json
 import os
 import shutil
+import uuid
 from fastapi import UploadFile
 
 
 UPLOAD_DIR = "uploaded_files"
+# Generated files (e.g. optimization job results), served by routers/downloads.py.
+OUTPUTS_DIR = os.getenv("OUTPUTS_DIR", "outputs")
+
+# Uploads are read into memory in chunks of this size and rejected as soon as they exceed MAX_UPLOAD_BYTES.
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+# Limit on a whole request body, enforced while it streams in. /rank/ and /jobs/ take several files,
+# so it is larger than the per-file limit.
+MAX_REQUEST_BYTES = int(os.getenv("MAX_REQUEST_BYTES", str(5 * MAX_UPLOAD_BYTES)))
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+
+    def __init__(self, filename: str, max_bytes: int):
+        self.filename = filename
+        self.max_bytes = max_bytes
+        super().__init__(f"File {filename} exceeds the maximum upload size of {max_bytes} bytes.")
+
+
+class RequestSizeLimitMiddleware:
+    """
+    ASGI middleware that answers 413 once a request body is larger than max_bytes.
+
+    A declared Content-Length over the limit is refused before any of the body is read. Otherwise the
+    body is counted as it arrives; when the limit is crossed the 413 is sent, the app is told the client
+    disconnected, and anything the app still tries to send is dropped. Starlette therefore never parses
+    or spools more than max_bytes of a multipart body.
+    """
+
+    def __init__(self, app, max_bytes: int = MAX_REQUEST_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(send)
+            return
+
+        received = 0
+        rejected = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes and not response_started:
+                    rejected = True
+                    await self._reject(send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if rejected:
+                return
+            response_started = True
+            await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)
+
+    async def _reject(self, send):
+        body = json.dumps({"detail": f"Request body exceeds the maximum size of {self.max_bytes} bytes."}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
 
 def ensure_upload_dir_exists():
     """Ensures the UPLOAD_DIR exists."""
     os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+async def read_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> bytes:
+    """
+    Reads an uploaded file into memory without touching disk.
+
+    Args:
+        file (UploadFile): The uploaded file object from FastAPI.
+        max_bytes (int): Maximum accepted size in bytes.
+
+    Returns:
+        bytes: The file content.
+
+    Raises:
+        UploadTooLargeError: If the file is larger than max_bytes.
+
+    By the time a handler runs, Starlette has already parsed the multipart body and spooled each file,
+    so this check only bounds what is copied into memory; UploadFile.size is the size Starlette measured.
+    RequestSizeLimitMiddleware is what stops an oversized body while it is still being received.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLargeError(file.filename, max_bytes)
+
+    buffer = bytearray()
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        buffer.extend(chunk)
+        if len(buffer) > max_bytes:
+            raise UploadTooLargeError(file.filename, max_bytes)
+    return bytes(buffer)
+
+def decode_text(data: bytes) -> str:
+    """
+    Decodes plain-text upload bytes in one pass: UTF-8 (with or without BOM), falling back to latin-1.
+    latin-1 maps every byte, so decoding never fails.
+    """
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
 async def save_uploaded_file(file: UploadFile) -> str:
     """
     Saves an uploaded file to the UPLOAD_DIR.
+    Prefer read_upload for request handling; this is only for callers that need a file on disk.
 
     Args:
         file (UploadFile): The uploaded file object from FastAPI.
@@ -21,15 +143,15 @@ async def save_uploaded_file(file: UploadFile) -> str:
         str: The full path to the saved file.
     """
     ensure_upload_dir_exists() 
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
+    # A unique prefix keeps concurrent uploads with the same client filename from colliding,
+    # and basename() keeps the client from choosing a path outside UPLOAD_DIR.
+    file_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4().hex}_{os.path.basename(file.filename or 'upload')}")
     try:
         with open(file_path, "wb") as buffer:
-            # Use await file.read() for smaller files, or shutil.copyfileobj for larger ones
-            # For simplicity and robustness with potentially large files, copyfileobj is often preferred.
             shutil.copyfileobj(file.file, buffer)
         return file_path
     except Exception as e:
         # Clean up if saving fails
         if os.path.exists(file_path):
             os.remove(file_path)
-        raise e # Re-raise the exception after cleanup
\ No newline at end of file
+        raise e # Re-raise the exception after cleanup
@@ -0,0 +1,107 @@
+# api/utils/phrase_matcher.py
+import re
+from collections import deque
+
+# Words are runs of letters/digits plus the symbols used in tech names ("c++", "c#"), with inner
+# dots kept ("node.js", "asp.net"). Everything else (spaces, hyphens, slashes, punctuation)
+# separates words, so "back-end" and "back end" match the same phrase.
+_WORD_PATTERN = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+
+
+def split_words(text: str) -> list[str]:
+    """
+    Lowercases text and splits it into the words phrases are matched on.
+    """
+    return _WORD_PATTERN.findall(text.lower())
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over words: finds every occurrence of thousands of phrases in one
+    linear pass over a document. Matching on whole words gives word boundaries for free,
+    so "java" never matches inside "javascript".
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        # Per state: (phrase length in words, value) for every phrase ending exactly at that state,
+        # and (after build) also for every phrase ending at a suffix of it.
+        self._terminal = [[]]
+        self._outputs = [[]]
+        self._phrases = 0
+        self._built = False
+
+    def add(self, phrase: str, value):
+        """
+        Adds a phrase that reports value when found. Call build() after the last add().
+        """
+        words = split_words(phrase)
+        if not words:
+            return
+        state = 0
+        for word in words:
+            next_state = self._goto[state].get(word)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][word] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append([])
+            state = next_state
+        self._terminal[state].append((len(words), value))
+        self._phrases += 1
+        self._built = False
+
+    def build(self):
+        """
+        Computes failure links breadth first and merges each state's outputs with its fallback's.
+        """
+        self._outputs = [list(terminal) for terminal in self._terminal]
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for word, next_state in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(word, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+                queue.append(next_state)
+        self._built = True
+
+    def find_all(self, text: str) -> list[tuple[int, int, object]]:
+        """
+        Returns (start word, end word, value) for every phrase occurrence, overlaps included.
+        """
+        if not self._built:
+            self.build()
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        matches = []
+        state = 0
+        for position, word in enumerate(split_words(text)):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for length, value in outputs[state]:
+                matches.append((position - length + 1, position + 1, value))
+        return matches
+
+    def __len__(self) -> int:
+        return self._phrases
+
+
+def select_longest(matches: list[tuple[int, int, object]]) -> list[tuple[int, int, object]]:
+    """
+    Keeps the leftmost-longest non-overlapping matches, so "senior software engineer" yields
+    one "software engineer" rather than also "engineer".
+    """
+    selected = []
+    last_end = 0
+    for start, end, value in sorted(matches, key=lambda match: (match[0], match[0] - match[1])):
+        if start >= last_end:
+            selected.append((start, end, value))
+            last_end = end
+    return selected